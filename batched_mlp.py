@@ -0,0 +1,197 @@
+"""
+Пакетний MLP-регресор на NumPy: навчає P моделей з одним прихованим шаром
+одночасно, зберігаючи ваги як стеки тензорів (P×d×h, P×h×1).
+Кожна ітерація — кілька великих batched matmul замість P окремих fit'ів sklearn.
+Відтворює поведінку MLPRegressor (relu, Adam, L2-регуляризація alpha, міні-батчі
+по 200 рядків, ініціалізація Glorot і зупинка за tol/n_iter_no_change), включно
+з потоком випадкових чисел кожної моделі (ініціалізація, потім перемішування),
+тож результати збігаються з sklearn з точністю до округлення float.
+Різні ширини прихованого шару вирівнюються до максимальної: зайві нейрони
+мають нульові ваги і нульові градієнти. Маски ознак — це занулені рядки W1.
+"""
+
+import numpy as np                             # numpy — batched matmul і Adam
+from sklearn.utils import shuffle              # Те саме перемішування, що й у MLPRegressor
+from folds import fold_arrays                  # Фолди TimeSeriesSplit як вигляди без копіювання
+from profiling import timer                     # Таймери model.fit, model.predict, model.metrics
+
+BETA_1, BETA_2, EPSILON = 0.9, 0.999, 1e-8     # Параметри Adam (як у MLPRegressor)
+
+def _per_model(value, n_models, dtype):
+    """Скаляр або послідовність довжини P → вектор форми (P, 1, 1)."""
+    arr = np.asarray(value, dtype=dtype)
+    if arr.ndim == 0:
+        arr = np.full(n_models, arr, dtype=dtype)
+    return arr.reshape(n_models, 1, 1)
+
+class BatchedMLPRegressor:
+    """
+    P регресорів з одним прихованим шаром (relu), що навчаються разом.
+    hidden       – ширини прихованого шару для кожної моделі (довжина P)
+    masks        – бінарні маски ознак (P×d) або None (усі ознаки)
+    lr, alpha    – швидкість навчання і L2 (скаляр або по одному на модель)
+    max_iter, batch_size, tol, n_iter_no_change, random_state — як у MLPRegressor
+    """
+
+    def __init__(self, hidden, masks=None, lr=0.001, alpha=0.0001, max_iter=200,
+                 batch_size=200, tol=1e-4, n_iter_no_change=10, random_state=0):
+        self.hidden = [int(h) for h in hidden]
+        self.masks = masks
+        self.lr = lr
+        self.alpha = alpha
+        self.max_iter = max_iter
+        self.batch_size = batch_size
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.random_state = random_state
+
+    def _initialize(self, d, dtype):
+        """
+        Ініціалізація Glorot окремо для кожної моделі (як у sklearn з тим самим seed).
+        Повертає генератори моделей — далі вони дають перемішування батчів.
+        """
+        P, H = len(self.hidden), max(self.hidden)
+        masks = (np.ones((P, d), dtype=bool) if self.masks is None
+                 else np.asarray(self.masks, dtype=bool).reshape(P, d))
+        self.W1 = np.zeros((P, d, H), dtype=dtype)
+        self.b1 = np.zeros((P, 1, H), dtype=dtype)
+        self.W2 = np.zeros((P, H, 1), dtype=dtype)
+        self.b2 = np.zeros((P, 1, 1), dtype=dtype)
+        streams = []
+        for p, h in enumerate(self.hidden):
+            rs = np.random.RandomState(self.random_state)
+            streams.append(rs)
+            rows = np.flatnonzero(masks[p])    # Активні ознаки моделі p
+            bound = np.sqrt(6.0 / (len(rows) + h))
+            self.W1[p, rows, :h] = rs.uniform(-bound, bound, (len(rows), h))
+            self.b1[p, 0, :h] = rs.uniform(-bound, bound, h)
+            bound = np.sqrt(6.0 / (h + 1))
+            self.W2[p, :h, 0] = rs.uniform(-bound, bound, h)
+            self.b2[p, 0, 0] = rs.uniform(-bound, bound)
+        # Маски градієнтів: неактивні ознаки і «зайві» нейрони не навчаються
+        unit = (np.arange(H)[None, :] < np.asarray(self.hidden)[:, None]).astype(dtype)  # (P, H)
+        self._g_W1 = masks[:, :, None].astype(dtype) * unit[:, None, :]
+        self._g_b1 = unit[:, None, :]
+        self._g_W2 = unit[:, :, None]
+        return streams
+
+    def fit(self, X, y):
+        """
+        Навчає всі P моделей на (X, y) міні-батчами Adam.
+        Моделі, що зупинились, вилучаються з робочих тензорів, тож далі
+        обчислення йдуть лише для активних.
+        """
+        X = np.asarray(X)
+        dtype = X.dtype if X.dtype in (np.float32, np.float64) else np.float64
+        X = X.astype(dtype, copy=False)
+        y = np.asarray(y, dtype=dtype).reshape(-1, 1)
+        n, d = X.shape
+        P = len(self.hidden)
+        streams = self._initialize(d, dtype)
+        self.n_iter_ = np.zeros(P, dtype=int)
+        self.loss_ = np.full(P, np.inf)
+
+        ids = np.arange(P)                     # Які моделі лежать у робочих тензорах
+        params = [self.W1.copy(), self.b1.copy(), self.W2.copy(), self.b2.copy()]
+        gmasks = [self._g_W1, self._g_b1, self._g_W2, None]
+        ms = [np.zeros_like(p) for p in params]
+        vs = [np.zeros_like(p) for p in params]
+        lr = _per_model(self.lr, P, dtype)
+        alpha = _per_model(self.alpha, P, dtype)
+        best_loss = np.full(P, np.inf)
+        no_improve = np.zeros(P, dtype=int)
+        idx = np.tile(np.arange(n), (P, 1))    # Порядок рядків кожної моделі
+        batch = min(self.batch_size, n)
+        H = self.W1.shape[2]
+        bufs = {}                              # Буфери під розмір батча: без алокацій у циклі
+        t = 0
+        for _ in range(self.max_iter):
+            W1, b1, W2, b2 = params
+            W2T = W2.transpose(0, 2, 1)        # Вигляд (k, 1, H) на ті самі ваги
+            k = len(ids)
+            for j in range(k):                 # Перемішування — власним потоком моделі, як у sklearn
+                idx[j] = shuffle(idx[j], random_state=streams[ids[j]])
+            acc = np.zeros(k)
+            l2 = (W1 ** 2).sum(axis=(1, 2)) + (W2 ** 2).sum(axis=(1, 2))
+            for start in range(0, n, batch):
+                bi = idx[:, start:start + batch]
+                nb = bi.shape[1]
+                if (k, nb) not in bufs:
+                    bufs[(k, nb)] = (np.empty((k, nb, H), dtype), np.empty((k, nb, H), dtype),
+                                     np.empty((k, nb, H), bool), np.ones((k, 1, nb), dtype))
+                Z, D1, pos, ones = bufs[(k, nb)]
+                Xb, yb = X[bi], y[bi]                      # (k, nb, d), (k, nb, 1)
+                np.matmul(Xb, W1, out=Z)                   # Прихований шар: (k, nb, H)
+                Z += b1
+                np.greater(Z, 0, out=pos)
+                np.maximum(Z, 0, out=Z)                    # Z тепер — активації relu
+                delta2 = np.matmul(Z, W2) + b2 - yb        # Похідна квадратичної втрати (k, nb, 1)
+                acc += ((delta2[..., 0] ** 2).mean(axis=1) / 2 + 0.5 * alpha[:, 0, 0] * l2 / nb) * nb
+                np.matmul(delta2, W2T, out=D1)
+                D1 *= pos
+                grads = [
+                    (np.matmul(Xb.transpose(0, 2, 1), D1) + alpha * W1) / nb,
+                    np.matmul(ones, D1) / nb,              # Сума по рядках батча через BLAS
+                    (np.matmul(Z.transpose(0, 2, 1), delta2) + alpha * W2) / nb,
+                    delta2.mean(axis=1, keepdims=True),
+                ]
+                t += 1
+                lr_t = lr * np.sqrt(1 - BETA_2 ** t) / (1 - BETA_1 ** t)
+                for p, g, m, v, gm in zip(params, grads, ms, vs, gmasks):
+                    if gm is not None:
+                        g *= gm
+                    m *= BETA_1
+                    m += (1 - BETA_1) * g
+                    v *= BETA_2
+                    v += (1 - BETA_2) * g * g
+                    p -= lr_t * m / (np.sqrt(v) + EPSILON)
+                l2 = (W1 ** 2).sum(axis=(1, 2)) + (W2 ** 2).sum(axis=(1, 2))
+
+            loss = acc / n
+            self.loss_[ids] = loss
+            self.n_iter_[ids] += 1
+            # Зупинка як у sklearn: втрата не покращилась більше ніж на tol n_iter_no_change+1 епох
+            no_improve = np.where(loss > best_loss - self.tol, no_improve + 1, 0)
+            best_loss = np.minimum(best_loss, loss)
+            keep = no_improve <= self.n_iter_no_change
+            if keep.all():
+                continue
+            for full, work in zip((self.W1, self.b1, self.W2, self.b2), params):
+                full[ids[~keep]] = work[~keep]  # Зупинені моделі фіксуємо у підсумкових вагах
+            if not keep.any():
+                break
+            ids, idx = ids[keep], idx[keep]
+            params, ms, vs = ([a[keep] for a in arrs] for arrs in (params, ms, vs))
+            gmasks = [gm[keep] if gm is not None else None for gm in gmasks]
+            lr, alpha = lr[keep], alpha[keep]
+            best_loss, no_improve = best_loss[keep], no_improve[keep]
+        else:
+            for full, work in zip((self.W1, self.b1, self.W2, self.b2), params):
+                full[ids] = work               # Досягли max_iter: фіксуємо ваги активних моделей
+        return self
+
+    def predict(self, X):
+        """Прогноз усіх моделей: масив форми (P, n)."""
+        X = np.asarray(X, dtype=self.W1.dtype)
+        A = np.maximum(np.matmul(X, self.W1) + self.b1, 0)
+        return (np.matmul(A, self.W2) + self.b2)[..., 0]
+
+def batched_fold_scores(X, y, fold, n_splits=3, hidden=(32,), lr=0.001, alpha=0.0001,
+                        masks=None, max_iter=200, random_state=0, fidelity=1.0, subsample="recent"):
+    """
+    Навчає пакет моделей на одному фолді TimeSeriesSplit (на частці fidelity рядків train).
+    Повертає список (MAE, RMSE) для кожної моделі пакета.
+    """
+    X_tr, y_tr, X_val, y_val = fold_arrays(X, y, fold, n_splits, # Потрібне розбиття train/val
+                                           fidelity=fidelity, subsample=subsample)
+    model = BatchedMLPRegressor(hidden, masks=masks, lr=lr, alpha=alpha,
+                                max_iter=max_iter, random_state=random_state)
+    with timer("model.fit"):
+        model.fit(X_tr, y_tr)
+    with timer("model.predict"):
+        pred = model.predict(X_val)
+    with timer("model.metrics"):
+        err = pred - np.asarray(y_val)[None, :]                  # (P, n_val)
+        maes = np.abs(err).mean(axis=1)
+        rmses = np.sqrt((err ** 2).mean(axis=1))
+    return [(float(m), float(r)) for m, r in zip(maes, rmses)]
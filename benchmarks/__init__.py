@@ -0,0 +1 @@
+"""Бенчмарки продуктивності (запуск з кореня репозиторію: python -m benchmarks.<назва>)."""
@@ -0,0 +1,70 @@
+"""
+Порівняння двох JSON-звітів benchmarks.run (наприклад, двох комітів).
+Метрика вважається регресією, якщо вона погіршилась більше ніж на поріг
+(відносно базового звіту). Код виходу 1, якщо є хоча б одна регресія.
+Запуск: python -m benchmarks.compare base.json new.json [--threshold 0.1]
+"""
+
+import argparse, json, sys                     # argparse — CLI, json — звіти, sys — код виходу
+
+# Назва метрики → напрямок: +1 — більше краще, -1 — менше краще
+METRICS = {
+    "fits_per_s": +1,
+    "wall_per_gen_s": -1,
+    "wall_s": -1,
+    "best_mae": -1,
+    "peak_rss_mb": -1,
+    "csv_s": -1,
+    "csv_rows_per_s": +1,
+    "cache_reopen_s": -1,
+}
+
+def _flatten(report):
+    """Звіт → {"s1.ga.params.fits_per_s": значення, ...} лише для відомих метрик."""
+    flat = {}
+    def walk(node, path):
+        for k, v in node.items():
+            if isinstance(v, dict):
+                walk(v, path + (k,))
+            elif k in METRICS and isinstance(v, (int, float)):
+                flat[".".join(path + (k,))] = (float(v), METRICS[k])
+    walk(report["results"], ())
+    return flat
+
+def compare(base, new, threshold=0.1, min_delta=0.005):
+    """
+    Повертає список рядків (метрика, база, нове, зміна, регресія?) для спільних метрик.
+    min_delta – зміни часу (метрики *_s) менші за цю кількість секунд вважаються шумом.
+    """
+    a, b = _flatten(base), _flatten(new)
+    rows = []
+    for name in sorted(a.keys() & b.keys()):
+        (old, sign), (cur, _) = a[name], b[name]
+        change = (cur - old) / abs(old) if old else 0.0
+        noise = name.endswith("_s") and abs(cur - old) < min_delta
+        rows.append((name, old, cur, change, sign * change < -threshold and not noise))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Порівняння звітів бенчмарків")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="допустиме погіршення (частка, 0.1 = 10%%)")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="мінімальна зміна часу в секундах, що не вважається шумом")
+    a = parser.parse_args(argv)
+    with open(a.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(a.new, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{base['meta'].get('commit')} → {new['meta'].get('commit')}, поріг {a.threshold:.0%}")
+    rows = compare(base, new, a.threshold, a.min_delta)
+    for name, old, cur, change, bad in rows:
+        print(f"{'❌' if bad else '  '} {name:40s} {old:12.4f} → {cur:12.4f}  {change:+7.1%}")
+    regressions = sum(r[4] for r in rows)
+    print(f"Регресій: {regressions} з {len(rows)}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Мікробенчмарк підготовки даних фолдів: скільки пам'яті виділяється на одне
+навчання до і після плану фолдів (folds.py). Навчання моделі не виконується —
+вимірюється лише розбиття train/val і вибір ознак.
+Запуск: python -m benchmarks.fold_alloc [датасет] [n_splits]
+"""
+
+import sys, time, tracemalloc                  # tracemalloc — облік виділеної пам'яті
+import numpy as np                             # numpy — для роботи з масивами
+from sklearn.model_selection import TimeSeriesSplit  # Старий спосіб розбиття
+from datasets import load_dataset              # Датасети s1–s4
+from folds import fold_arrays                  # Новий спосіб: вигляди без копіювання
+
+def split_indexed(X, y, fold, n_splits, cols_idx):
+    """Як було: копія X[:, cols], новий TimeSeriesSplit і fancy-індексація."""
+    Xs = X[:, cols_idx] if cols_idx is not None else X
+    tr, val = list(TimeSeriesSplit(n_splits=n_splits).split(Xs))[fold]
+    return Xs[tr], y[tr], Xs[val], y[val]
+
+def split_planned(X, y, fold, n_splits, cols_idx):
+    """Як стало: план фолдів і вигляди."""
+    return fold_arrays(X, y, fold, n_splits, cols_idx)
+
+def measure(split, X, y, n_splits, cols_idx, repeat=20):
+    """Пікова і сумарна пам'ять (байти) та час на одне розбиття."""
+    peak_total, alloc_total = 0, 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for k in range(n_splits):
+            tracemalloc.start()
+            parts = split(X, y, k, n_splits, cols_idx)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_total += peak
+            alloc_total += current
+            del parts
+    n = repeat * n_splits
+    return peak_total / n, alloc_total / n, (time.perf_counter() - start) / n
+
+def main(dataset="s1", n_splits=3):
+    X, y, cols = load_dataset(dataset)
+    d = X.shape[1]
+    cases = {"усі ознаки": None,
+             "зріз ознак": np.arange(0, d, 2),                        # Рівномірний крок → вигляд
+             "довільна маска": np.array([0, 1] + list(range(3, d)))}  # Копіюються лише рядки фолду
+    print(f"Датасет {dataset}: X {X.shape}, {X.nbytes / 1e6:.2f} МБ, n_splits={n_splits}")
+    for name, cols_idx in cases.items():
+        for label, split in (("indexed", split_indexed), ("planned", split_planned)):
+            peak, kept, sec = measure(split, X, y, n_splits, cols_idx)
+            print(f"  {name:15s} {label:8s} пік {peak / 1e3:9.1f} КБ  утримується {kept / 1e3:9.1f} КБ  {sec * 1e6:8.1f} мкс")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "s1",
+         int(sys.argv[2]) if len(sys.argv) > 2 else 3)
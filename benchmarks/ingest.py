@@ -0,0 +1,45 @@
+"""
+Мікробенчмарк читання CSV: пікова пам'ять і швидкість (рядків/с) повного
+читання у DataFrame з копією у float32 (як було) і блокового читання
+у передвиділений масив (datasets._read_csv, як стало).
+Запуск: python -m benchmarks.ingest [датасет] [рядків у блоці]
+"""
+
+import sys, time, tracemalloc                  # tracemalloc — облік виділеної пам'яті
+import numpy as np                             # numpy — для роботи з масивами
+import pandas as pd                            # pandas — старий спосіб читання
+import datasets                                # Блокове читання CSV
+from static.mappings import DATASET_PATHS      # Шляхи до датасетів
+
+def read_full(path, chunk_rows):
+    """Як було: увесь CSV у DataFrame, потім копія у float32."""
+    df = pd.read_csv(path)
+    X = np.ascontiguousarray(df[df.columns[:-1]].values, dtype=np.float32)
+    y = np.ascontiguousarray(df[df.columns[-1]].values, dtype=np.float32)
+    return X, y
+
+def read_chunked(path, chunk_rows):
+    """Як стало: блоки з явним dtype одразу у передвиділений масив."""
+    return datasets._read_csv(path, chunk_rows=chunk_rows)[:2]
+
+def measure(read, path, chunk_rows):
+    """Пікова пам'ять (байти), розмір результату (байти) і рядків за секунду."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = read(path, chunk_rows)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, X.nbytes + y.nbytes, X.shape[0] / seconds
+
+def main(dataset="s1", chunk_rows=datasets.CHUNK_ROWS):
+    path = DATASET_PATHS[dataset]
+    print(f"Датасет {dataset}: {path}, рядків у блоці {chunk_rows}")
+    for label, read in (("full", read_full), ("chunked", read_chunked)):
+        peak, final, rate = measure(read, path, chunk_rows)
+        print(f"  {label:8s} пік {peak / 1e6:8.2f} МБ  масиви {final / 1e6:8.2f} МБ  "
+              f"({peak / final:4.1f}×)  {rate:12,.0f} рядків/с")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "s1",
+         int(sys.argv[2]) if len(sys.argv) > 2 else datasets.CHUNK_ROWS)
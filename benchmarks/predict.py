@@ -0,0 +1,33 @@
+"""
+Мікробенчмарк пакетного прогнозу: MLPRegressor.predict (sklearn) проти
+registry.RegisteredModel.predict (блоки рядків, матричні множення NumPy у буфери).
+Запуск: python -m benchmarks.predict [рядків] [ширини шарів через кому]
+"""
+
+import sys, time                               # time — тривалість прогнозу
+import numpy as np                             # numpy — синтетичні дані
+from eval_core import make_model               # Модель як у етапах GA
+from registry import RegisteredModel           # Прогноз з реєстру
+
+def main(rows=1_000_000, hidden=(64, 32), n_features=6, repeats=3):
+    rs = np.random.RandomState(0)
+    X = rs.rand(2000, n_features).astype(np.float32)
+    y = X @ rs.rand(n_features) * 100
+    model = make_model(hidden, max_iter=50).fit(X, y)
+    served = RegisteredModel([np.asarray(W, np.float32) for W in model.coefs_],
+                             [np.asarray(b, np.float32) for b in model.intercepts_],
+                             {"activations": ["relu"] * len(hidden), "features": [str(i) for i in range(n_features)]})
+    batch = rs.rand(rows, n_features).astype(np.float32)
+    print(f"Прогноз {rows} рядків, шари {hidden}: max |Δ| = {np.abs(served.predict(X) - model.predict(X)).max():.2e}")
+    for label, predict in (("sklearn", model.predict), ("registry", served.predict)):
+        best = min(_time(predict, batch) for _ in range(repeats))
+        print(f"  {label:9s} {best * 1e3:9.1f} мс  {rows / best:14,.0f} рядків/с")
+
+def _time(predict, X):
+    start = time.perf_counter()
+    predict(X)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         tuple(int(h) for h in sys.argv[2].split(",")) if len(sys.argv) > 2 else (64, 32))
@@ -0,0 +1,181 @@
+"""
+Набір бенчмарків GA без GUI: для кожного датасету (s1–s4) вимірює
+- load_dataset: розбір CSV і відкриття бінарного кешу
+- один виклик evaluate_* кожного режиму (fits/s)
+- повний запуск GA кожного режиму з фіксованими seed (fits/s, час покоління, найкраща MAE)
+- піковий RSS процесу (кожен датасет — в окремому процесі, щоб пік не накопичувався)
+Результат записується у JSON; два файли порівнює benchmarks.compare.
+Запуск: python -m benchmarks.run [--datasets s1 s2] [--gens 3] [--pop 8] [--output файл.json]
+"""
+
+import argparse, importlib, json, os, platform, resource, subprocess, sys, time
+import warnings                                # ConvergenceWarning при малому max_iter не потрібні у звіті
+from concurrent.futures import ProcessPoolExecutor   # Окремий процес на датасет
+from multiprocessing import get_context        # spawn — чистий процес без успадкованої пам'яті
+import numpy as np                             # numpy — маски і час поколінь
+from static.mappings import DATASET_PATHS      # Перелік датасетів
+
+# Режим → (модуль, функція GA, функція разової оцінки, аргументи оцінки без X, y)
+MODES = {
+    "features": ("ga_load_features", "ga_load_feature_selection", "evaluate_load_features", "all_features"),
+    "params": ("ga_model_params", "ga_model_param_synthesis", "evaluate_params", (32, 0.001, 0.0001)),
+    "structure": ("ga_network_structure", "ga_network_structure_synthesis", "evaluate_structure",
+                  ((32, 16), ("relu", "tanh"))),
+    "opt": ("ga_multiobjective_opt", "ga_multiobjective_optimization", "evaluate_architecture", (2, 32)),
+}
+
+class _CountingEvaluator:
+    """Обгортка оцінювача, що рахує навчені моделі (fits)."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.fits = 0
+
+    def map(self, fn, X, y, tasks, cancel=None):
+        for args, _ in tasks:
+            if fn.__name__ == "_all_folds":    # Задача «особина»: кілька фолдів
+                self.fits += len(args[2])
+            elif args and isinstance(args[0], list):  # Пакетна задача: уся популяція на фолді
+                self.fits += len(args[0])
+            else:
+                self.fits += 1
+        return self.inner.map(fn, X, y, tasks, cancel=cancel)
+
+    def close(self):
+        self.inner.close()
+
+def _peak_rss_mb():
+    """Піковий RSS поточного процесу в МБ (ru_maxrss: КБ у Linux, байти у macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+def _best_mae(result):
+    """Найкраща MAE з результату GA (словник або Парето-фронт)."""
+    if isinstance(result, dict):
+        return float(result["mae"])
+    return float(min(c["mae"] for c in result)) if result else None
+
+def bench_load(key):
+    """
+    Час load_dataset: блокове читання CSV (рядків/с), перша побудова кешу
+    і повторне відкриття memmap.
+    """
+    import datasets                            # Імпорт тут: _LOADED очищається між вимірюваннями
+    t = time.perf_counter()
+    X, _, _ = datasets.load_dataset(key, use_cache=False)
+    csv_s = time.perf_counter() - t
+    rows_per_s = X.shape[0] / max(csv_s, 1e-9)
+    name = (key, datasets.DATASET_TARGETS.get(key), None, False) # Ключ _LOADED для типового вибору колонок
+    datasets._LOADED.pop(name, None)
+    t = time.perf_counter()
+    datasets.load_dataset(key)                 # Кеш валідний або перебудовується
+    first_s = time.perf_counter() - t
+    datasets._LOADED.pop(name, None)
+    t = time.perf_counter()
+    X, y, cols = datasets.load_dataset(key)
+    reopen_s = time.perf_counter() - t
+    return {"rows": int(X.shape[0]), "features": int(X.shape[1]),
+            "csv_s": csv_s, "csv_rows_per_s": rows_per_s, "cache_first_s": first_s, "cache_reopen_s": reopen_s}, (X, y, cols)
+
+def bench_dataset(key, gens=3, pop=8, max_iter=100, cv_splits=3, seed=0, backend="serial", jobs=None,
+                  repeat=3):
+    """Усі вимірювання для одного датасету; повертає словник метрик."""
+    warnings.filterwarnings("ignore")
+    from evaluators import make_evaluator
+    load, (X, y, cols) = bench_load(key)
+    out = {"load": load, "evaluate": {}, "ga": {}}
+    for mode, (module, ga_name, eval_name, eval_args) in MODES.items():
+        try:
+            mod = importlib.import_module(module)
+        except ImportError as e:
+            out["evaluate"][mode] = out["ga"][mode] = {"skipped": str(e)}
+            continue
+
+        if eval_name:                          # Разова оцінка: cv_splits навчань, краща з repeat спроб
+            args = (np.ones(X.shape[1], dtype=int),) if eval_args == "all_features" else eval_args
+            sec = np.inf
+            for _ in range(repeat):
+                t = time.perf_counter()
+                getattr(mod, eval_name)(X, y, *args, n_splits=cv_splits, max_iter=max_iter)
+                sec = min(sec, time.perf_counter() - t)
+            out["evaluate"][mode] = {"wall_s": sec, "fits": cv_splits, "fits_per_s": cv_splits / sec}
+
+        evaluator = _CountingEvaluator(make_evaluator(backend, jobs))
+        marks = []                             # Час завершення кожного покоління
+        def progress(gen, mae, rmse, extra):
+            if len(marks) <= gen:
+                marks.append(time.perf_counter())
+        kwargs = dict(pop_size=pop, n_gen=gens, max_iter=max_iter, cv_splits=cv_splits,
+                      progress_cb=progress, evaluator=evaluator, seed=seed)
+        t = time.perf_counter()
+        if mode == "features":
+            result = getattr(mod, ga_name)(X, y, cols, **kwargs)
+        else:
+            result = getattr(mod, ga_name)(X, y, **kwargs)
+        wall = time.perf_counter() - t
+        evaluator.close()
+        per_gen = np.diff([t] + marks).tolist() if marks else [wall / gens] * gens
+        out["ga"][mode] = {"wall_s": wall, "fits": evaluator.fits,
+                           "fits_per_s": evaluator.fits / wall if wall else 0.0,
+                           "wall_per_gen_s": float(np.mean(per_gen)), "gen_s": per_gen,
+                           "best_mae": _best_mae(result)}
+    out["peak_rss_mb"] = _peak_rss_mb()
+    return out
+
+def _meta(config):
+    """Опис середовища, щоб порівнювати лише сумісні запуски."""
+    import sklearn
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "sklearn": sklearn.__version__, "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "config": config}
+
+def run(datasets=None, output=None, isolate=True, **config):
+    """Запускає бенчмарки для datasets і (за потреби) записує JSON у output."""
+    datasets = datasets or sorted(DATASET_PATHS)
+    results = {}
+    for key in datasets:
+        print(f"⏱ {key}…", flush=True)
+        if isolate:                            # Новий процес: власний піковий RSS
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+                results[key] = ex.submit(bench_dataset, key, **config).result()
+        else:
+            results[key] = bench_dataset(key, **config)
+        for mode, r in results[key]["ga"].items():
+            if "skipped" not in r:
+                print(f"   {mode:9s} {r['fits_per_s']:7.2f} fits/s  {r['wall_per_gen_s']:7.2f} с/покоління  "
+                      f"MAE {r['best_mae']:.4f}", flush=True)
+        print(f"   пік RSS {results[key]['peak_rss_mb']:.0f} МБ", flush=True)
+    report = {"meta": _meta(config), "results": results}
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"💾 {output}")
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки GA (без GUI)")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(DATASET_PATHS))
+    parser.add_argument("--gens", type=int, default=3)
+    parser.add_argument("--pop", type=int, default=8)
+    parser.add_argument("--max-iter", type=int, default=100)
+    parser.add_argument("--cv-splits", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default="serial")
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument("--repeat", type=int, default=3, help="спроб разової оцінки (береться краща)")
+    parser.add_argument("--no-isolate", action="store_true", help="усі датасети в одному процесі")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "latest.json"))
+    a = parser.parse_args(argv)
+    run(a.datasets, a.output, isolate=not a.no_isolate, gens=a.gens, pop=a.pop,
+        max_iter=a.max_iter, cv_splits=a.cv_splits, seed=a.seed, backend=a.backend, jobs=a.jobs,
+        repeat=a.repeat)
+
+if __name__ == "__main__":
+    main()
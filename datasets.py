@@ -4,31 +4,281 @@
 - X: матриця ознак (numpy array)
 - y: цільовий вектор (numpy array, навантаження)
 - cols: список назв ознак
+
+CSV розбирається лише один раз: результат зберігається у бінарному кеші
+(X.npy, y.npy + заголовок JSON з назвами колонок і хешем вихідного файлу).
+Далі масиви відкриваються через np.memmap без копіювання, тож паралельні
+оцінювачі ділять одну фізичну копію даних. Кеш перебудовується автоматично,
+якщо CSV змінився.
+
+CSV читається блоками по CHUNK_ROWS рядків з явним типом float32 і пишеться
+одразу у передвиділений масив (або у memmap файлу кешу), тож пікова пам'ять —
+підсумковий масив плюс один блок. Ціль і ознаки вибираються за назвами колонок
+(за замовчуванням ціль — з DATASET_TARGETS, ознаки — решта колонок).
+
+derived=True додає похідні ознаки (лаги, ковзні вікна, циклічні кодування —
+feature_engine.py за налаштуваннями DATASET_FEATURES); вони рахуються один раз
+і зберігаються окремим кешем, прив'язаним до хешу CSV і налаштувань.
 """
 
+import hashlib, json, os, time          # hashlib — хеш CSV, json — заголовок кешу, os — файли, time — швидкість читання
 import pandas as pd                     # pandas — для зручного читання CSV у DataFrame
 import numpy as np                      # numpy — для роботи з масивами
-from static.mappings import DATASET_PATHS  # Імпортуємо словник з шляхами до датасетів
+from static.mappings import DATASET_PATHS, DATASET_TARGETS, DATASET_CACHE_DIR  # Шляхи, колонки цілі, бінарний кеш
+from static.mappings import DATASET_FEATURES  # Налаштування похідних ознак датасетів
+from feature_engine import FeatureEngine      # Лаги, ковзні вікна, циклічні кодування
+from profiling import timed             # Таймери етапів (data.load, data.ingest)
+
+CACHE_FORMAT = 2                        # Версія формату бінарного кешу (2 — ціль за назвою, статистика читання)
+CHUNK_ROWS = 1 << 16                    # Рядків CSV в одному блоці читання
+
+_LOADED = {}                            # (ключ, ціль, ознаки, похідні) → (стан CSV, X, y, cols, заголовок)
+
+def _file_state(path):
+    """Розмір і час зміни файлу — швидка перевірка актуальності кешу."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def _scan(path):
+    """sha256 вмісту файлу і верхня межа кількості рядків даних (один прохід блоками)."""
+    h = hashlib.sha256()
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+            lines += block.count(b"\n")
+            last = block[-1:]
+    lines += last != b"\n"             # Останній рядок без переводу рядка
+    return h.hexdigest(), max(lines - 1, 0) # Без рядка заголовка
+
+def _file_hash(path):
+    """sha256 вмісту файлу (читається блоками)."""
+    return _scan(path)[0]
+
+def _select_columns(path, target=None, features=None):
+    """
+    Назви ознак і цілі з заголовка CSV.
+    target   – назва колонки цілі (None — остання колонка)
+    features – назви колонок ознак (None — усі, крім цілі)
+    """
+    header = list(pd.read_csv(path, nrows=0).columns) # Лише рядок заголовка
+    if len(header) < 2:                 # Якщо у файлі менше ніж 2 колонки
+        raise ValueError(f"❌ У файлі {path} замало колонок для X і y")
+    target = header[-1] if target is None else target
+    features = [c for c in header if c != target] if features is None else list(features)
+    missing = [c for c in [target] + features if c not in header]
+    if missing:
+        raise ValueError(f"❌ У файлі {path} немає колонок: {', '.join(missing)}")
+    if not features or target in features:
+        raise ValueError(f"❌ Ознаки мають бути непорожні і не містити ціль {target}")
+    return features, target
+
+def _cache_paths(path, target=None, features=None):
+    """Шляхи до файлів кешу для CSV і вибору колонок: (X.npy, y.npy, header.json)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if target is not None or features is not None: # Нетиповий вибір колонок — окремий кеш
+        choice = json.dumps([target, None if features is None else list(features)])
+        stem += "." + hashlib.sha1(choice.encode("utf-8")).hexdigest()[:10]
+    base = os.path.join(DATASET_CACHE_DIR, stem)
+    return base + ".X.npy", base + ".y.npy", base + ".json"
+
+def _write_header(h_path, header):
+    """Атомарно записує заголовок кешу (обрив запису не лишає обрізаного JSON)."""
+    tmp = f"{h_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, h_path)
+
+@timed("data.ingest")
+def _ingest(path, features, target, X, y, chunk_rows=CHUNK_ROWS):
+    """
+    Читає CSV блоками з явним типом float32 у передвиділені X і y
+    (колонка за колонкою, без проміжної копії блоку). Повертає кількість рядків.
+    """
+    usecols = features + [target]
+    reader = pd.read_csv(path, usecols=usecols, dtype=dict.fromkeys(usecols, np.float32),
+                         chunksize=chunk_rows)
+    n = 0
+    with reader:
+        for chunk in reader:
+            m = len(chunk)
+            if n + m > len(X):
+                raise ValueError(f"❌ У файлі {path} більше рядків, ніж під час підрахунку")
+            for j, c in enumerate(features):
+                X[n:n + m, j] = chunk[c].to_numpy()
+            y[n:n + m] = chunk[target].to_numpy()
+            n += m
+    return n
+
+def _ingest_stats(rows, seconds, chunk_rows):
+    """Статистика читання CSV: рядки, секунди, рядків за секунду."""
+    return {"rows": int(rows), "seconds": seconds, "rows_per_s": rows / max(seconds, 1e-9),
+            "chunk_rows": chunk_rows}
 
-def load_dataset(key):
+def _read_csv(path, target=None, features=None, chunk_rows=CHUNK_ROWS, stats=None):
+    """
+    Читає CSV у пам'ять і ділить на ознаки та ціль (див. _select_columns).
+    stats – словник, у який записується статистика читання (рядки, rows_per_s)
+    """
+    features, target = _select_columns(path, target, features)
+    t = time.perf_counter()
+    rows = _scan(path)[1]               # Верхня межа: порожні рядки pandas пропускає
+    X = np.empty((rows, len(features)), dtype=np.float32)
+    y = np.empty(rows, dtype=np.float32)
+    n = _ingest(path, features, target, X, y, chunk_rows)
+    if stats is not None:
+        stats.update(_ingest_stats(n, time.perf_counter() - t, chunk_rows))
+    return X[:n], y[:n], features       # Зрізи — вигляди, зайві рядки не копіюються
+
+def build_dataset_cache(path, target=None, features=None, chunk_rows=CHUNK_ROWS):
+    """
+    Читає CSV блоками одразу у memmap файлів кешу і записує заголовок
+    (атомарно: спершу масиви, потім заголовок).
+    """
+    cols, target_col = _select_columns(path, target, features)
+    x_path, y_path, h_path = _cache_paths(path, target, features)
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+    suffix = f".{os.getpid()}.tmp"
+    t = time.perf_counter()
+    sha, rows = _scan(path)
+    X = np.lib.format.open_memmap(x_path + suffix, mode="w+", dtype=np.float32, shape=(rows, len(cols)))
+    y = np.lib.format.open_memmap(y_path + suffix, mode="w+", dtype=np.float32, shape=(rows,))
+    n = _ingest(path, cols, target_col, X, y, chunk_rows)
+    X.flush()
+    y.flush()
+    if n < rows:                        # Порожні рядки у CSV: переписуємо без хвоста (з диска, не з пам'яті)
+        for target_path, arr in ((x_path, X), (y_path, y)):
+            with open(target_path + suffix + ".trim", "wb") as f:
+                np.save(f, arr[:n])
+    del X, y                            # Закриваємо memmap перед перейменуванням
+    for target_path in (x_path, y_path):
+        if n < rows:
+            os.replace(target_path + suffix + ".trim", target_path + suffix)
+        os.replace(target_path + suffix, target_path)
+    header = {"format": CACHE_FORMAT, "source": path, "columns": cols, "target": target_col,
+              "rows": int(n), "sha256": sha, "state": _file_state(path),
+              "ingest": _ingest_stats(n, time.perf_counter() - t, chunk_rows)}
+    _write_header(h_path, header)
+    return header
+
+def _derived_paths(path, target, features, spec):
+    """Шляхи до кешу похідних ознак: (X.npy, y.npy, header.json) з хешем налаштувань рушія."""
+    base = _cache_paths(path, target, features)[2][:-len(".json")]
+    base += ".feat" + hashlib.sha1(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    return base + ".X.npy", base + ".y.npy", base + ".json"
+
+def build_derived_cache(path, target, features, engine, X, y, base_header):
+    """Рахує похідні ознаки всього ряду і записує їх у кеш (атомарно, заголовок — останнім)."""
+    x_path, y_path, h_path = _derived_paths(path, target, features, engine.spec())
+    suffix = f".{os.getpid()}.tmp"
+    t = time.perf_counter()
+    Xd, yd = engine.transform(X, y)
+    seconds = time.perf_counter() - t
+    for target_path, arr in ((x_path, Xd), (y_path, yd)):
+        with open(target_path + suffix, "wb") as f:
+            np.save(f, arr)
+        os.replace(target_path + suffix, target_path)
+    header = {"format": CACHE_FORMAT, "source": path, "columns": engine.columns, "target": base_header["target"],
+              "rows": int(len(yd)), "base_sha256": base_header["sha256"], "spec": engine.spec(),
+              "derive": {"rows": int(len(yd)), "seconds": seconds, "rows_per_s": len(yd) / max(seconds, 1e-9)},
+              "ingest": base_header["ingest"]}
+    _write_header(h_path, header)
+    return header
+
+def _valid_derived(path, target, features, spec, base_header):
+    """Заголовок кешу похідних ознак, якщо він зібраний з поточного CSV і тих самих налаштувань."""
+    x_path, y_path, h_path = _derived_paths(path, target, features, spec)
+    try:
+        with open(h_path, encoding="utf-8") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (header.get("format") != CACHE_FORMAT or header.get("base_sha256") != base_header["sha256"]
+            or header.get("spec") != spec or not (os.path.exists(x_path) and os.path.exists(y_path))):
+        return None
+    return header
+
+def feature_engine(key, target=None, features=None):
+    """Рушій похідних ознак датасету (None — для датасету їх не налаштовано)."""
+    spec = DATASET_FEATURES.get(key)
+    if not spec:
+        return None
+    _, _, cols = load_dataset(key, target=target, features=features)
+    return FeatureEngine.from_spec(cols, dataset_info(key, target, features)["target"], spec)
+
+def _valid_header(path, target=None, features=None):
+    """Повертає заголовок кешу, якщо він відповідає поточному CSV, інакше None."""
+    x_path, y_path, h_path = _cache_paths(path, target, features)
+    try:
+        with open(h_path, encoding="utf-8") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if header.get("format") != CACHE_FORMAT or not (os.path.exists(x_path) and os.path.exists(y_path)):
+        return None
+    state = _file_state(path)
+    if header.get("state") == state:    # Файл не чіпали — хеш не перераховуємо
+        return header
+    if header.get("sha256") != _file_hash(path):
+        return None                     # Вміст змінився — кеш застарів
+    header["state"] = state             # Змінився лише час модифікації — оновлюємо заголовок
+    _write_header(h_path, header)
+    return header
+
+@timed("data.load")
+def load_dataset(key, use_cache=True, target=None, features=None, derived=False):
     """
     Завантажує датасет за ключем (s1, s2, s3, s4).
-    Очікується, що остання колонка у CSV — це навантаження (y),
-    решта колонок — ознаки (X).
+    За замовчуванням ціль (y) — колонка навантаження з DATASET_TARGETS
+    (якщо її не задано — остання колонка CSV), решта колонок — ознаки (X).
+    target, features – назви колонок цілі й ознак (None — як за замовчуванням)
+    use_cache=True – масиви відкриваються з бінарного кешу через np.memmap
+    (лише для читання); use_cache=False – CSV розбирається щоразу (блоками у пам'ять).
+    derived=True – до ознак додаються похідні з DATASET_FEATURES (перші рядки без
+    повної історії лагів і вікон відкидаються)
     """
     path = DATASET_PATHS.get(key)       # Отримуємо шлях до файлу за ключем
     if not path:                        # Якщо ключ некоректний
         raise ValueError(f"❌ Невідомий датасет: {key}")
+    target = target or DATASET_TARGETS.get(key)
+    spec = DATASET_FEATURES.get(key) if derived else None
+    if not use_cache:
+        X, y, cols = _read_csv(path, target, features)
+        if spec:
+            engine = FeatureEngine.from_spec(cols, target or _select_columns(path, target, features)[1], spec)
+            (X, y), cols = engine.transform(X, y), engine.columns
+        return X, y, cols
 
-    # Читаємо CSV у DataFrame
-    df = pd.read_csv(path)
-
-    if df.shape[1] < 2:                 # Якщо у файлі менше ніж 2 колонки
-        raise ValueError(f"❌ У файлі {path} замало колонок для X і y")
-
-    # Остання колонка = ціль (навантаження), решта — ознаки
-    cols = list(df.columns[:-1])        # Список назв ознак (усі колонки крім останньої)
-    X = df[cols].values.astype(np.float32)          # Матриця ознак у форматі numpy.float32
-    y = df[df.columns[-1]].values.astype(np.float32) # Вектор цілі (остання колонка)
+    state = _file_state(path)
+    name = (key, target, None if features is None else tuple(features), bool(spec))
+    hit = _LOADED.get(name)
+    if hit is not None and hit[0] == state:
+        return hit[1:4]                 # Ті самі об'єкти: пули процесів не перезапускаються
 
+    if spec:                            # Похідні ознаки — з власного кешу поверх базового
+        X, y, cols = load_dataset(key, True, target, features)
+        base = _LOADED[name[:3] + (False,)][4]
+        engine = FeatureEngine.from_spec(cols, base["target"], spec)
+        header = (_valid_derived(path, target, features, engine.spec(), base)
+                  or build_derived_cache(path, target, features, engine, X, y, base))
+        x_path, y_path, _ = _derived_paths(path, target, features, engine.spec())
+        header["state"] = base["state"]
+    else:
+        header = _valid_header(path, target, features) or build_dataset_cache(path, target, features)
+        x_path, y_path, _ = _cache_paths(path, target, features)
+    X = np.load(x_path, mmap_mode="r")  # Нуль-копійне відкриття (спільні сторінки ОС)
+    y = np.load(y_path, mmap_mode="r")
+    cols = list(header["columns"])
+    _LOADED[name] = (header["state"], X, y, cols, header)
     return X, y, cols                   # Повертаємо ознаки, ціль і список назв ознак
+
+def dataset_info(key, target=None, features=None, derived=False):
+    """
+    Заголовок кешу датасету: колонки, ціль, кількість рядків і статистика
+    останньої побудови кешу ("ingest": rows, seconds, rows_per_s, chunk_rows;
+    для derived=True — також "derive": швидкість генерації похідних ознак).
+    """
+    load_dataset(key, target=target, features=features, derived=derived)
+    target = target or DATASET_TARGETS.get(key)
+    spec = DATASET_FEATURES.get(key) if derived else None
+    return _LOADED[(key, target, None if features is None else tuple(features), bool(spec))][4]
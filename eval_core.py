@@ -0,0 +1,322 @@
+"""
+Спільне ядро оцінювання моделей для всіх етапів GA (ознаки, параметри, структура, Парето):
+одна модель — один фолд TimeSeriesSplit — кортеж метрик FOLD_FIELDS.
+- make_model: MLPRegressor для однакової активації всіх шарів, LayeredMLPRegressor —
+  для різних активацій у різних шарах (sklearn такого не підтримує)
+- fit_fold: навчання на train-вигляді фолду, MAE/RMSE на val, час навчання і затримка прогнозу
+- aggregate_folds, count_params — зведення фолдів і розмір моделі
+- WeightStore, transplant — теплий старт: нащадок починає з ваг навченого батька
+- LayeredMLPRegressor.partial_fit — донавчання на нових рядках (онлайн-режим, online.py)
+  (рядки нових ознак і нові нейрони ініціалізуються випадково, зайві відкидаються)
+Функції верхнього рівня й кортежі чисел: задачі серіалізуються у пул процесів,
+а результати — у кеш пристосованості без перетворень.
+"""
+
+import threading, time                         # threading — блокування сховища ваг, time — час навчання і затримка прогнозу
+from collections import OrderedDict            # OrderedDict — основа LRU сховища ваг
+import numpy as np                             # numpy — прямий/зворотний прохід LayeredMLPRegressor
+from sklearn.neural_network import MLPRegressor  # MLPRegressor — багатошаровий персептрон для регресії
+from sklearn.metrics import mean_absolute_error  # mean_absolute_error — метрика MAE
+from sklearn.utils import shuffle              # Те саме перемішування, що й у MLPRegressor
+from folds import fold_arrays                  # Фолди TimeSeriesSplit як вигляди без копіювання
+from profiling import timer                     # Таймери model.fit, model.predict, model.metrics
+
+ACTIVATIONS = ("relu", "tanh", "logistic")     # Активації прихованих шарів
+FOLD_FIELDS = ("mae", "rmse", "fit_s", "latency_ms")  # Метрики фолду: похибки, час навчання (с), мс на 1000 рядків прогнозу
+BETA_1, BETA_2, EPSILON = 0.9, 0.999, 1e-8     # Параметри Adam (як у MLPRegressor)
+WARM_STORE_SIZE = 512                          # Максимум моделей (особина × фолд) у сховищі ваг
+DEFAULT_LR, DEFAULT_ALPHA = 0.001, 0.0001      # lr/alpha етапів structure і opt (якщо не передано з params)
+
+def hyper_tag(lr, alpha):
+    """Суфікс етапу для ключів кешу: оцінки з іншими lr/alpha не змішуються ("" — типові)."""
+    return "" if (lr, alpha) == (DEFAULT_LR, DEFAULT_ALPHA) else f"/lr{lr:g}a{alpha:g}"
+
+def _activate(name, Z):
+    """Активація на місці (як ACTIVATIONS у sklearn)."""
+    if name == "relu":
+        np.maximum(Z, 0, out=Z)
+    elif name == "tanh":
+        np.tanh(Z, out=Z)
+    elif name == "logistic":
+        np.negative(Z, out=Z)
+        np.exp(Z, out=Z)
+        Z += 1
+        np.reciprocal(Z, out=Z)
+    return Z
+
+def _derivative(name, A, delta):
+    """Множить delta на похідну активації, виражену через вихід шару A (як DERIVATIVES у sklearn)."""
+    if name == "relu":
+        delta[A == 0] = 0
+    elif name == "tanh":
+        delta *= 1 - A ** 2
+    elif name == "logistic":
+        delta *= A * (1 - A)
+
+class LayeredMLPRegressor:
+    """
+    MLP-регресор з окремою активацією для кожного прихованого шару.
+    Навчання повторює MLPRegressor (Adam, L2 alpha, міні-батчі по 200 рядків,
+    ініціалізація Glorot, зупинка за tol/n_iter_no_change, той самий потік
+    випадкових чисел), тож з однаковими активаціями результат збігається
+    зі sklearn з точністю до округлення float.
+    hidden      – ширини прихованих шарів
+    activations – активація кожного прихованого шару (довжина як у hidden)
+    init        – початкові ваги (coefs, intercepts) замість ініціалізації Glorot (теплий старт)
+    """
+
+    def __init__(self, hidden, activations, lr=0.001, alpha=0.0001, max_iter=200,
+                 batch_size=200, tol=1e-4, n_iter_no_change=10, random_state=0, init=None):
+        self.hidden = [int(h) for h in hidden]
+        self.activations = list(activations)
+        if len(self.activations) != len(self.hidden) or any(a not in ACTIVATIONS for a in self.activations):
+            raise ValueError(f"❌ Некоректні активації шарів: {self.activations}")
+        self.lr = lr
+        self.alpha = alpha
+        self.max_iter = max_iter
+        self.batch_size = batch_size
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.random_state = random_state
+        self.init = init
+
+    def _forward(self, X):
+        """Активації всіх шарів: [X, h1, …, вихід]."""
+        acts = [X]
+        for i, (W, b) in enumerate(zip(self.coefs_, self.intercepts_)):
+            Z = acts[-1] @ W
+            Z += b
+            if i < len(self.hidden):           # Вихідний шар — тотожний
+                _activate(self.activations[i], Z)
+            acts.append(Z)
+        return acts
+
+    def _start(self, d, dtype):
+        """Початкові ваги (init або Glorot), стан Adam і генератор перемішування."""
+        self._rs = np.random.RandomState(self.random_state)
+        units = [d] + self.hidden + [1]
+        if self.init is not None:              # Теплий старт: копії переданих ваг
+            self.coefs_ = [np.array(W, dtype=dtype) for W in self.init[0]]
+            self.intercepts_ = [np.array(b, dtype=dtype) for b in self.init[1]]
+        else:
+            self.coefs_, self.intercepts_ = _glorot(units, self.activations, self._rs, dtype)
+        params = self.coefs_ + self.intercepts_
+        self._adam = ([np.zeros_like(p) for p in params], [np.zeros_like(p) for p in params])
+        self._t = 0                            # Кроків Adam (поправка зсуву моментів)
+        self.n_iter_ = 0
+
+    def _epoch(self, X, y, idx):
+        """Одна епоха міні-батчів Adam у порядку idx; повертає суму втрат батчів."""
+        params = self.coefs_ + self.intercepts_
+        ms, vs = self._adam
+        batch = min(self.batch_size, len(idx))
+        last = len(self.coefs_) - 1
+        acc = 0.0
+        for start in range(0, len(idx), batch):
+            bi = idx[start:start + batch]
+            nb = len(bi)
+            acts = self._forward(X[bi])
+            delta = acts[-1] - y[bi]
+            l2 = sum(float(np.dot(W.ravel(), W.ravel())) for W in self.coefs_)
+            acc += ((delta ** 2).mean() / 2 + 0.5 * self.alpha * l2 / nb) * nb
+            g_coefs, g_bias = [None] * (last + 1), [None] * (last + 1)
+            for i in range(last, -1, -1):      # Зворотне поширення від виходу до входу
+                g_coefs[i] = (acts[i].T @ delta + self.alpha * self.coefs_[i]) / nb
+                g_bias[i] = delta.mean(axis=0)
+                if i:
+                    delta = delta @ self.coefs_[i].T
+                    _derivative(self.activations[i - 1], acts[i], delta)
+            self._t += 1
+            lr_t = self.lr * np.sqrt(1 - BETA_2 ** self._t) / (1 - BETA_1 ** self._t)
+            for p, g, m, v in zip(params, g_coefs + g_bias, ms, vs):
+                m *= BETA_1
+                m += (1 - BETA_1) * g
+                v *= BETA_2
+                v += (1 - BETA_2) * g * g
+                p -= lr_t * m / (np.sqrt(v) + EPSILON)
+        return acc
+
+    @staticmethod
+    def _arrays(X, y, dtype=None):
+        X = np.asarray(X)
+        dtype = dtype or (X.dtype if X.dtype in (np.float32, np.float64) else np.float64)
+        return X.astype(dtype, copy=False), np.asarray(y, dtype=dtype).reshape(-1, 1)
+
+    def fit(self, X, y):
+        """Навчає мережу на (X, y) міні-батчами Adam."""
+        X, y = self._arrays(X, y)
+        n, d = X.shape
+        self._start(d, X.dtype)
+        idx = np.arange(n)
+        best_loss, no_improve = np.inf, 0
+        for _ in range(self.max_iter):
+            idx = shuffle(idx, random_state=self._rs)
+            acc = self._epoch(X, y, idx)
+            self.n_iter_ += 1
+            self.loss_ = acc / n
+            # Зупинка як у sklearn: втрата не покращилась більше ніж на tol n_iter_no_change+1 епох
+            no_improve = no_improve + 1 if self.loss_ > best_loss - self.tol else 0
+            best_loss = min(best_loss, self.loss_)
+            if no_improve > self.n_iter_no_change:
+                break
+        return self
+
+    def partial_fit(self, X, y, epochs=1):
+        """
+        Донавчання на нових рядках (X, y): epochs епох міні-батчів Adam лише по них.
+        Перший виклик без fit стартує з init (ваги з реєстру) або Glorot; стан Adam
+        і лічильник кроків зберігаються між викликами, тож ціна виклику — O(рядків X).
+        """
+        dtype = self.coefs_[0].dtype if hasattr(self, "coefs_") else None
+        X, y = self._arrays(X, y, dtype)
+        if not hasattr(self, "coefs_"):
+            self._start(X.shape[1], X.dtype)
+        idx = np.arange(len(X))
+        for _ in range(epochs):
+            idx = shuffle(idx, random_state=self._rs)
+            self.loss_ = self._epoch(X, y, idx) / max(len(X), 1)
+            self.n_iter_ += 1
+        return self
+
+    def predict(self, X):
+        """Прогноз: масив форми (n,)."""
+        return self._forward(np.asarray(X, dtype=self.coefs_[0].dtype))[-1].ravel()
+
+def _glorot(units, activations, rs, dtype):
+    """Ініціалізація Glorot для шарів units (коефіцієнт 2 для logistic, як у sklearn)."""
+    coefs, intercepts = [], []
+    for i in range(len(units) - 1):
+        act = activations[min(i, len(activations) - 1)]
+        bound = np.sqrt((2.0 if act == "logistic" else 6.0) / (units[i] + units[i + 1]))
+        coefs.append(rs.uniform(-bound, bound, (units[i], units[i + 1])).astype(dtype, copy=False))
+        intercepts.append(rs.uniform(-bound, bound, units[i + 1]).astype(dtype, copy=False))
+    return coefs, intercepts
+
+def transplant(weights, cols, hidden, activations, random_state=0, dtype=np.float64):
+    """
+    Ваги батька → початкові ваги нащадка.
+    weights – (ознаки батька, coefs, intercepts), як їх повертає fit_fold(return_weights=True)
+    cols    – індекси ознак нащадка; hidden, activations — його шари
+    Рядки спільних ознак і перші min(ширина) нейронів кожного шару беруться від батька,
+    нові ознаки й нейрони — з ініціалізації Glorot. Інша глибина — None (холодний старт).
+    """
+    parent_cols, coefs, intercepts = weights
+    if len(coefs) != len(hidden) + 1:
+        return None
+    units = [len(cols)] + [int(h) for h in hidden] + [1]
+    new_coefs, new_intercepts = _glorot(units, activations, np.random.RandomState(random_state), dtype)
+    row_of = {c: r for r, c in enumerate(parent_cols)}
+    for i, (W, b) in enumerate(zip(coefs, intercepts)):
+        m = min(W.shape[1], units[i + 1])      # Спільні нейрони (стовпці) шару
+        if i == 0:                             # Вхідний шар: рядки — ознаки
+            pairs = [(r, row_of[c]) for r, c in enumerate(cols) if c in row_of]
+            if pairs:
+                dst, src = map(list, zip(*pairs))
+                new_coefs[0][dst, :m] = W[src, :m]
+        else:
+            n = min(W.shape[0], units[i])
+            new_coefs[i][:n, :m] = W[:n, :m]
+        new_intercepts[i][:m] = b[:m]
+    return new_coefs, new_intercepts
+
+class WeightStore:
+    """
+    Обмежене LRU-сховище ваг навчених моделей: ключ (ключ особини, фолд) →
+    (ознаки, coefs, intercepts). Живе у процесі GA; ваги батька передаються
+    задачі разом з аргументами, тож теплий старт працює і в пулі процесів.
+    """
+
+    def __init__(self, maxsize=WARM_STORE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Ваги або None."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Зберігає ваги і витісняє найстаріші понад maxsize."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def dump(self):
+        """Вміст для контрольної точки (від найстаріших до найновіших)."""
+        with self._lock:
+            return list(self._data.items())
+
+    def load(self, items):
+        """Відновлює вміст, збережений dump()."""
+        for key, value in items:
+            self.put(key, value)
+
+def make_model(hidden, activations="relu", lr=DEFAULT_LR, alpha=DEFAULT_ALPHA, max_iter=200, random_state=0):
+    """
+    Модель з прихованими шарами hidden.
+    activations – одна назва для всіх шарів або послідовність по шару; однакові
+                  активації дають MLPRegressor, різні — LayeredMLPRegressor
+    """
+    hidden = tuple(int(h) for h in hidden)
+    acts = [activations] * len(hidden) if isinstance(activations, str) else list(activations)
+    if len(set(acts)) == 1:
+        return MLPRegressor(hidden_layer_sizes=hidden, activation=acts[0],
+                            learning_rate_init=lr, alpha=alpha,
+                            max_iter=max_iter, random_state=random_state)
+    return LayeredMLPRegressor(hidden, acts, lr=lr, alpha=alpha, max_iter=max_iter,
+                               random_state=random_state)
+
+def fit_fold(X, y, fold, n_splits=3, hidden=(32,), activations="relu", lr=DEFAULT_LR, alpha=DEFAULT_ALPHA,
+             max_iter=200, random_state=0, cols_idx=None, init=None, return_weights=False,
+             fidelity=1.0, subsample="recent"):
+    """
+    Навчає модель на фолді TimeSeriesSplit і повертає (MAE, RMSE, fit_s, latency_ms).
+    cols_idx       – індекси вибраних ознак (None — усі ознаки)
+    init           – ваги батька для теплого старту (див. transplant); за іншої глибини ігноруються
+    return_weights – повернути пару (метрики, (ознаки, coefs, intercepts)) для WeightStore
+    fidelity       – частка рядків train (folds.train_slice, subsample — "recent"/"stride")
+    """
+    X_tr, y_tr, X_val, y_val = fold_arrays(X, y, fold, n_splits, cols_idx, fidelity, subsample)
+    cols = tuple(range(X.shape[1])) if cols_idx is None else tuple(int(c) for c in cols_idx)
+    acts = [activations] * len(hidden) if isinstance(activations, str) else list(activations)
+    start = (transplant(init, cols, hidden, acts, random_state, X_tr.dtype)
+             if init is not None else None)
+    if start is not None:                      # Теплий старт: навчання продовжується з ваг батька
+        model = LayeredMLPRegressor(hidden, acts, lr=lr, alpha=alpha, max_iter=max_iter,
+                                    random_state=random_state, init=start)
+    else:
+        model = make_model(hidden, acts, lr=lr, alpha=alpha, max_iter=max_iter,
+                           random_state=random_state)
+    with timer("model.fit"):
+        t = time.perf_counter()
+        model.fit(X_tr, y_tr)                  # Навчаємо модель на train
+        fit_s = time.perf_counter() - t
+    with timer("model.predict"):
+        t = time.perf_counter()
+        pred = model.predict(X_val)            # Прогнозуємо на val
+        latency_ms = (time.perf_counter() - t) * 1e6 / max(len(X_val), 1)  # мс на 1000 рядків
+    with timer("model.metrics"):
+        scores = (mean_absolute_error(y_val, pred),  # MAE
+                  np.sqrt(np.mean((y_val - pred) ** 2)),  # RMSE
+                  fit_s, latency_ms)
+    if return_weights:
+        return scores, (cols, list(model.coefs_), list(model.intercepts_))
+    return scores
+
+def aggregate_folds(scores):
+    """Середнє кожної метрики за фолдами (у порядку FOLD_FIELDS)."""
+    return tuple(np.mean(col) for col in zip(*scores))
+
+def count_params(n_features, hidden):
+    """Кількість ваг і зсувів MLP з прихованими шарами hidden і одним виходом."""
+    units = [n_features] + [int(h) for h in hidden] + [1]
+    return sum((a + 1) * b for a, b in zip(units[:-1], units[1:]))
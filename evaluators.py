@@ -0,0 +1,335 @@
+"""
+Бекенди оцінювання популяції GA:
+- serial  — послідовно у поточному процесі (поведінка за замовчуванням)
+- process — concurrent.futures.ProcessPoolExecutor
+- loky    — joblib/loky (стійкіший до падінь воркерів, cloudpickle для функцій)
+X і y передаються воркерам один раз (через initializer), а не з кожною задачею;
+масиви np.memmap (бінарний кеш datasets.py) передаються лише як дескриптор файлу,
+і воркери відкривають ту саму фізичну копію даних.
+Кожна задача — одна пара (особина, фолд) або одна особина з усіма фолдами;
+результати агрегуються у тому ж порядку, що й у послідовному режимі,
+тому для фіксованого seed вони збігаються біт-у-біт.
+Якщо таймери profiling увімкнені, час, виміряний у воркері, повертається
+разом з результатом задачі і додається до реєстру головного процесу.
+"""
+
+import mmap, os                                # os — кількість ядер, mmap — перевірка memmap-масивів
+import numpy as np                             # numpy — memmap-дескриптори датасету
+from concurrent.futures import ProcessPoolExecutor, wait  # Стандартний пул процесів
+from fitness_cache import make_key             # Ключі кешу пристосованості
+from run_control import Cancelled, is_cancelled  # Кооперативне скасування між задачами
+import profiling                               # Таймери етапів (зокрема з воркерів)
+
+BACKENDS = ("serial", "process", "loky")       # Доступні бекенди
+
+_WORKER_DATA = {}                              # У воркері: датасет, отриманий при старті
+
+def _share(arr):
+    """Готує масив до передачі воркеру: memmap — дескриптором файлу, решта — як є."""
+    # Лише масив, що відображає файл цілком (зрізи memmap мають хибний offset)
+    if isinstance(arr, np.memmap) and arr.filename and isinstance(arr.base, mmap.mmap):
+        return ("memmap", arr.filename, arr.dtype.str, arr.shape, arr.offset,
+                "F" if arr.flags.f_contiguous and not arr.flags.c_contiguous else "C")
+    return arr
+
+def _attach(obj):
+    """Відновлює масив у воркері (відкриває memmap за дескриптором)."""
+    if isinstance(obj, tuple) and obj and obj[0] == "memmap":
+        _, filename, dtype, shape, offset, order = obj
+        return np.memmap(filename, dtype=dtype, mode="r", shape=shape, offset=offset, order=order)
+    return obj
+
+def _init_worker(X, y):
+    """Ініціалізація воркера: зберігаємо X, y і обмежуємо BLAS одним потоком."""
+    try:
+        from threadpoolctl import threadpool_limits  # Іде разом зі scikit-learn
+        threadpool_limits(limits=1)            # Без переповнення ядер: паралелізм — на рівні процесів
+    except ImportError:
+        pass
+    _WORKER_DATA["X"], _WORKER_DATA["y"] = _attach(X), _attach(y)
+
+def _run_task(fn, args, kwargs, timed=False):
+    """
+    Виконує задачу у воркері на збереженому датасеті.
+    timed=True — повертає пару (результат, таймери задачі у форматі profiling.stats()).
+    """
+    if not timed:
+        return fn(_WORKER_DATA["X"], _WORKER_DATA["y"], *args, **kwargs)
+    if not profiling.is_enabled():
+        profiling.enable()
+    before = profiling.mark()
+    result = fn(_WORKER_DATA["X"], _WORKER_DATA["y"], *args, **kwargs)
+    return result, profiling.since(before)
+
+def _all_folds(X, y, fold_fn, genotype, folds, n_splits, kwargs):
+    """Оцінює одну особину на кількох фолдах (задача рівня «особина»)."""
+    return [fold_fn(X, y, *genotype, fold=k, n_splits=n_splits, **kwargs)
+            for k in folds]
+
+class SerialEvaluator:
+    """Послідовне оцінювання у поточному процесі."""
+    backend = "serial"
+    n_jobs = 1
+
+    def map(self, fn, X, y, tasks, cancel=None):
+        """
+        tasks — список (args, kwargs); повертає результати у тому ж порядку.
+        cancel — CancelToken: перевіряється перед кожною задачею (піднімає Cancelled).
+        """
+        out = []
+        for args, kwargs in tasks:
+            if is_cancelled(cancel):
+                raise Cancelled()
+            out.append(fn(X, y, *args, **kwargs))
+        return out
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PoolEvaluator(SerialEvaluator):
+    """
+    Паралельне оцінювання у пулі процесів.
+    Пул створюється ліниво і перевикористовується, доки не зміниться датасет
+    (X/y надсилаються воркерам лише при створенні пулу).
+    """
+
+    def __init__(self, backend="process", n_jobs=None):
+        self.backend = backend
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self._executor = None
+        self._data = None                      # (X, y), для яких створено поточний пул
+
+    def _executor_for(self, X, y):
+        """Повертає пул, прив'язаний до (X, y); за потреби пересоздає його."""
+        if self._data is None or self._data[0] is not X or self._data[1] is not y:
+            self.close()
+            if self.backend == "loky":
+                from joblib.externals.loky import ProcessPoolExecutor as LokyExecutor
+                self._executor = LokyExecutor(max_workers=self.n_jobs,
+                                              initializer=_init_worker, initargs=(_share(X), _share(y)))
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.n_jobs,
+                                                     initializer=_init_worker, initargs=(_share(X), _share(y)))
+            self._data = (X, y)
+        return self._executor
+
+    def map(self, fn, X, y, tasks, cancel=None):
+        """
+        Розсилає задачі у пул; результати повертаються у порядку tasks.
+        При скасуванні задачі, що ще не почались, знімаються з черги.
+        """
+        if not tasks:
+            return []
+        ex = self._executor_for(X, y)
+        timed = profiling.is_enabled()         # Таймери воркерів повертаються разом з результатами
+        futures = [ex.submit(_run_task, fn, args, kwargs, timed) for args, kwargs in tasks]
+        if cancel is not None:
+            pending = set(futures)
+            while pending:                     # Чекаємо короткими інтервалами, щоб реагувати на скасування
+                _, pending = wait(pending, timeout=0.1)
+                if cancel.cancelled:
+                    for f in futures:
+                        f.cancel()
+                    raise Cancelled()
+        if not timed:
+            return [f.result() for f in futures]
+        out = []
+        for f in futures:
+            result, timings = f.result()
+            profiling.TIMERS.merge(timings)
+            out.append(result)
+        return out
+
+    def close(self):
+        """Зупиняє пул (воркери завершуються)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor, self._data = None, None
+
+def make_evaluator(backend="serial", n_jobs=None):
+    """Створює оцінювач за назвою бекенду (serial/process/loky)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ Невідомий бекенд оцінювання: {backend}")
+    if backend == "serial" or n_jobs == 1:
+        return SerialEvaluator()
+    return PoolEvaluator(backend, n_jobs)
+
+RACING_ETA = 3                                 # Частка 1/eta кандидатів проходить у повну оцінку
+RACING_ITER_FRAC = 0.25                        # Частка max_iter на першому (відбірковому) фолді
+WARM_ITER_FRAC = 0.3                           # Частка max_iter для нащадка з теплим стартом
+
+def _fold_scores(evaluator, fold_fn, X, y, genotypes, folds, n_splits, kw, granularity, batch_fn=None,
+                 cancel=None):
+    """Оцінює кожен генотип на фолдах folds; повертає списки метрик фолдів."""
+    if batch_fn is not None:                   # Задача на кожен фолд: уся популяція одним пакетом
+        if not genotypes:
+            return []
+        tasks = [((genotypes,), dict(kw, fold=k, n_splits=n_splits)) for k in folds]
+        per_fold = evaluator.map(batch_fn, X, y, tasks, cancel=cancel)
+        return [list(scores) for scores in zip(*per_fold)]
+    if granularity == "fold":                  # Задача на кожну пару (особина, фолд)
+        tasks = [(g, dict(kw, fold=k, n_splits=n_splits)) for g in genotypes for k in folds]
+        flat = evaluator.map(fold_fn, X, y, tasks, cancel=cancel)
+        return [flat[i * len(folds):(i + 1) * len(folds)] for i in range(len(genotypes))]
+    tasks = [((fold_fn, g, folds, n_splits, kw), {}) for g in genotypes] # Задача на кожну особину
+    return evaluator.map(_all_folds, X, y, tasks, cancel=cancel)
+
+def _warm_fold_scores(evaluator, fold_fn, X, y, items, folds, n_splits, kw, weights, parent_keys,
+                      cancel=None):
+    """
+    Оцінювання з теплим стартом: задача (особина, фолд) отримує ваги батька з weights
+    (якщо вони є) і коротший max_iter; ваги навчених моделей зберігаються у weights.
+    items — пари (ключ, генотип). Повертає (метрики фолдів, ітерації) кожної особини.
+    """
+    warm_iter = max(1, int(kw["max_iter"] * WARM_ITER_FRAC))
+    tasks = []
+    for key, g in items:
+        for k in folds:
+            task_kw = dict(kw, fold=k, n_splits=n_splits, return_weights=True)
+            init = weights.get((parent_keys[key], k)) if key in parent_keys else None
+            if init is not None:
+                task_kw.update(init=init, max_iter=min(kw["max_iter"], warm_iter))
+            tasks.append((g, task_kw))
+    flat = evaluator.map(fold_fn, X, y, tasks, cancel=cancel)
+    scores, iters = [], []
+    for i, (key, _) in enumerate(items):
+        per_fold = []
+        for j, k in enumerate(folds):
+            res = flat[i * len(folds) + j]
+            if res is None:                    # Модель не навчалась (наприклад, порожня маска)
+                per_fold.append(None)
+                continue
+            per_fold.append(res[0])
+            weights.put((key, k), res[1])
+        scores.append(per_fold)
+        iters.append(sum(kw_["max_iter"] for _, kw_ in tasks[i * len(folds):(i + 1) * len(folds)]))
+    return scores, iters
+
+@profiling.timed("ga.evaluate")
+def evaluate_population(fold_fn, aggregate, X, y, genotypes, n_splits=3, max_iter=200,
+                        evaluator=None, cache=None, stage=None, fingerprint=None,
+                        granularity="fold", random_state=0,
+                        racing=False, return_budget=False, batch_fn=None, cancel=None,
+                        parents=None, weights=None, fidelity=1.0, subsample="recent"):
+    """
+    Оцінює всю популяцію: дублікати й записи з кешу не перенавчаються,
+    решта розсилається оцінювачу.
+    fold_fn       – fold_fn(X, y, *genotype, fold=, n_splits=, max_iter=, random_state=) → метрики фолду
+    aggregate     – aggregate([метрики фолдів]) → кортеж пристосованості
+    genotypes     – список кортежів аргументів fold_fn (генотипи особин)
+    granularity   – "fold" (задача = особина×фолд) або "individual" (задача = особина)
+    racing        – послідовне відсіювання (successive halving): усі кандидати
+                    навчаються на першому фолді з max_iter·RACING_ITER_FRAC, і лише
+                    найкраща 1/RACING_ETA частина отримує всі фолди з повним max_iter;
+                    відсіяним ставиться консервативна оцінка, не краща за найгіршу повну
+    return_budget – повернути також витрачений бюджет кожної особини
+                    ({"fits", "iters", "pruned", "fidelity"}; iters — сума max_iter її навчань)
+    batch_fn      – batch_fn(X, y, genotypes, fold=, n_splits=, max_iter=, random_state=) →
+                    метрики фолду для кожного генотипу; якщо задано, популяція навчається
+                    пакетом (BatchedMLPRegressor), а задачею оцінювача є фолд
+    cancel        – run_control.CancelToken: перевіряється між задачами; при скасуванні
+                    піднімається run_control.Cancelled (оцінки покоління не повертаються)
+    parents       – генотипи батьків (паралельно genotypes; None — без батька)
+    weights       – eval_core.WeightStore: теплий старт (без batch_fn). fold_fn приймає
+                    init= і return_weights=; нащадок, ваги батька якого є у сховищі,
+                    стартує з них і навчається max_iter·WARM_ITER_FRAC ітерацій
+    fidelity      – частка рядків train кожного фолду (0 < fidelity ≤ 1, folds.train_slice;
+                    subsample — "recent" або "stride"); fold_fn і batch_fn приймають
+                    fidelity= і subsample=. Оцінки різної точності кешуються окремо,
+                    а точність записується у бюджет кожної особини
+    Повертає список кортежів пристосованості у порядку genotypes
+    (або пару (результати, бюджети) при return_budget=True).
+    """
+    evaluator = evaluator or SerialEvaluator()
+    keys = [make_key(stage, fingerprint, g, max_iter, n_splits, random_state) for g in genotypes]
+    if fidelity < 1:                           # Оцінки неповної точності не змішуються з повними у кеші
+        fid_stage = f"{stage}@{subsample}{fidelity:g}"
+        cache_keys = {k: make_key(fid_stage, fingerprint, g, max_iter, n_splits, random_state)
+                      for k, g in zip(keys, genotypes)}
+    else:
+        cache_keys = {k: k for k in keys}
+    results = {}                               # Ключ → пристосованість
+    budget = {}                                # Ключ → витрачений бюджет
+    pending, seen = [], set()                  # Унікальні генотипи, яких немає в кеші
+    for key, g in zip(keys, genotypes):
+        if key in seen:
+            continue
+        seen.add(key)
+        budget[key] = {"fits": 0, "iters": 0, "pruned": False, "fidelity": fidelity}
+        cached = cache.get(cache_keys[key]) if cache is not None else None
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending.append((key, g))
+
+    kw = {"max_iter": max_iter, "random_state": random_state}
+    if fidelity < 1:
+        kw.update(fidelity=fidelity, subsample=subsample)
+    warm = weights is not None and batch_fn is None
+    parent_keys = {}                           # Ключ нащадка → ключ батька (теплий старт)
+    if warm and parents is not None:
+        for key, parent in zip(keys, parents):
+            if parent is not None:
+                parent_keys.setdefault(key, make_key(stage, fingerprint, parent, max_iter, n_splits, random_state))
+    pruned = []                                # (ключ, кортеж з першого фолду) відсіяних
+    if racing and len(pending) > 1:
+        short_kw = dict(kw, max_iter=max(1, int(max_iter * RACING_ITER_FRAC)))
+        if warm:
+            first, iters = _warm_fold_scores(evaluator, fold_fn, X, y, pending, [0], n_splits,
+                                             short_kw, weights, parent_keys, cancel)
+        else:
+            first = _fold_scores(evaluator, fold_fn, X, y, [g for _, g in pending], [0],
+                                 n_splits, short_kw, granularity, batch_fn, cancel)
+            iters = [short_kw["max_iter"]] * len(pending)
+        partial = [aggregate(sc) for sc in first]
+        for (key, _), it in zip(pending, iters):
+            budget[key]["fits"] += 1
+            budget[key]["iters"] += it
+        order = sorted(range(len(pending)), key=lambda i: partial[i][0])  # За MAE першого фолду
+        n_keep = max(1, -(-len(pending) // RACING_ETA))                    # ceil(n / eta)
+        pruned = [(pending[i][0], partial[i]) for i in order[n_keep:]]
+        pending = [pending[i] for i in sorted(order[:n_keep])]             # Порядок популяції зберігається
+
+    if warm:
+        per_ind, iters = _warm_fold_scores(evaluator, fold_fn, X, y, pending, range(n_splits), n_splits,
+                                           kw, weights, parent_keys, cancel)
+    else:
+        per_ind = _fold_scores(evaluator, fold_fn, X, y, [g for _, g in pending], range(n_splits),
+                               n_splits, kw, granularity, batch_fn, cancel)
+        iters = [n_splits * max_iter] * len(pending)
+    for (key, _), scores, it in zip(pending, per_ind, iters):
+        value = aggregate(scores)
+        results[key] = cache.put(cache_keys[key], value) if cache is not None else value
+        budget[key]["fits"] += n_splits
+        budget[key]["iters"] += it
+
+    if pruned:                                 # Консервативна оцінка: не краща за найгіршу повну
+        worst = [max(vals) for vals in zip(*results.values())]
+        for key, part in pruned:
+            results[key] = tuple(max(p, w) for p, w in zip(part, worst))
+            budget[key]["pruned"] = True       # У кеш не пишемо: це оцінка неповної точності
+
+    values = [results[key] for key in keys]
+    if return_budget:
+        spent, reported = [], set()
+        for key in keys:                       # Дублікат у популяції нічого не витрачає
+            spent.append(budget[key] if key not in reported else dict(budget[key], fits=0, iters=0))
+            reported.add(key)
+        return values, spent
+    return values
+
+def accumulate_budget(total, spent):
+    """Додає бюджети особин покоління (spent) до сумарного бюджету запуску total."""
+    total = total or {"fits": 0, "iters": 0, "pruned": 0, "per_candidate": []}
+    for b in spent:
+        total["fits"] += b["fits"]
+        total["iters"] += b["iters"]
+        total["pruned"] += int(b["pruned"])
+    total["per_candidate"].append([b["iters"] for b in spent])  # Ітерації кожної особини покоління
+    return total
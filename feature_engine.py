@@ -0,0 +1,105 @@
+"""
+Генерація ознак навантаження: лаги цілі, ковзні середнє і стандартне відхилення,
+циклічні кодування календарних колонок (sin/cos години, дня тижня, місяця).
+- усе рахується векторно: лаги — зрізами, ковзні вікна — різницями кумулятивних сум
+  (цілі і її квадрата) за O(рядків) незалежно від ширини вікна
+- ковзні статистики рахуються за попередніми w значеннями (без поточного), тож ознаки
+  рядка t не містять його цілі; перші history рядків (немає повної історії) відкидаються
+- update дописує нові рядки за O(нових рядків): зберігається лише хвіст цілі довжиною history
+Налаштування датасетів — static.mappings.DATASET_FEATURES, кеш похідних колонок —
+datasets.load_dataset(..., derived=True).
+"""
+
+import numpy as np                             # numpy — зрізи, кумулятивні суми, sin/cos
+from static.mappings import CYCLIC_PERIODS     # Період календарних колонок (hour — 24, dow — 7, month — 12)
+
+class FeatureEngine:
+    """
+    Похідні ознаки для ряду з базовими ознаками cols і ціллю target.
+    lags    – зсуви цілі (рядків назад)
+    windows – ширини ковзних вікон (середнє і стандартне відхилення цілі)
+    cyclic  – календарні колонки з CYCLIC_PERIODS для sin/cos-кодування (відсутні в cols — пропускаються)
+    """
+
+    def __init__(self, cols, target="load", lags=(), windows=(), cyclic=()):
+        self.base_cols = list(cols)
+        self.target = target
+        self.lags = sorted({int(k) for k in lags if int(k) > 0})
+        self.windows = sorted({int(w) for w in windows if int(w) > 1})
+        self.cyclic = [c for c in cyclic if c in self.base_cols and c in CYCLIC_PERIODS]
+        self.history = max(self.lags + self.windows, default=0) # Рядків історії для першого повного рядка
+        self.columns = (self.base_cols
+                        + [f"{target}_lag{k}" for k in self.lags]
+                        + [f"{target}_{stat}{w}" for w in self.windows for stat in ("mean", "std")]
+                        + [f"{c}_{f}" for c in self.cyclic for f in ("sin", "cos")])
+        self._tail = np.empty(0, dtype=np.float64) # Останні history значень цілі (для update)
+        self._center = None                    # Зсув цілі перед кумулятивними сумами (точність дисперсії)
+
+    @classmethod
+    def from_spec(cls, cols, target, spec):
+        """Рушій за налаштуваннями {"lags", "windows", "cyclic"} (DATASET_FEATURES)."""
+        return cls(cols, target, spec.get("lags", ()), spec.get("windows", ()), spec.get("cyclic", ()))
+
+    def spec(self):
+        """Налаштування рушія (для ключа кешу похідних колонок)."""
+        return {"target": self.target, "lags": self.lags, "windows": self.windows, "cyclic": self.cyclic}
+
+    def prime(self, y):
+        """Запам'ятовує хвіст ряду y як історію для update (без перерахунку ознак)."""
+        y = np.asarray(y, dtype=np.float64)
+        if self._center is None:
+            self._center = float(y.mean()) if len(y) else 0.0
+        self._tail = y[len(y) - self.history:].copy() if self.history else y[:0].copy()
+        return self
+
+    def transform(self, X, y):
+        """
+        Ознаки всього ряду: (X з похідними колонками float32, y) без перших history рядків.
+        Хвіст ряду запам'ятовується для наступних update.
+        """
+        y = np.asarray(y, dtype=np.float64)
+        self._center = float(y.mean()) if len(y) else 0.0
+        self._tail = y[:0]
+        return self.update(X, y)
+
+    def update(self, X_new, y_new):
+        """
+        Ознаки нових рядків ряду (продовження попередніх transform/update) за O(нових рядків):
+        (X_new з похідними колонками, y_new) лише для рядків з повною історією.
+        """
+        X_new = np.asarray(X_new)
+        y_new = np.asarray(y_new, dtype=np.float64)
+        if self._center is None:
+            self._center = float(y_new.mean()) if len(y_new) else 0.0
+        ext = np.concatenate([self._tail, y_new]) # Історія + нові значення
+        h, L = self.history, len(ext)
+        first = max(h, len(self._tail))        # Перший рядок ext, для якого рахуємо ознаки
+        m = max(L - first, 0)
+        out = np.empty((m, len(self.columns)), dtype=np.float32)
+        rows = slice(len(y_new) - m, len(y_new)) # Ті самі рядки у X_new / y_new
+        j = len(self.base_cols)
+        out[:, :j] = X_new[rows]
+        for k in self.lags:                    # Лаг k: ціль k рядків тому
+            out[:, j] = ext[first - k:L - k]
+            j += 1
+        if self.windows:                       # Ковзні вікна різницями кумулятивних сум
+            c = np.empty(L + 1)
+            c2 = np.empty(L + 1)
+            c[0] = c2[0] = 0.0
+            centered = ext - self._center
+            np.cumsum(centered, out=c[1:])
+            np.cumsum(centered * centered, out=c2[1:])
+            for w in self.windows:             # Вікно [t-w, t): попередні w значень
+                s = c[first:L] - c[first - w:L - w]
+                s2 = c2[first:L] - c2[first - w:L - w]
+                mean = s / w
+                out[:, j] = mean + self._center
+                out[:, j + 1] = np.sqrt(np.maximum(s2 / w - mean * mean, 0.0))
+                j += 2
+        for col in self.cyclic:                # Циклічні кодування: сусідні години/дні поруч
+            phase = X_new[rows, self.base_cols.index(col)].astype(np.float64) * (2 * np.pi / CYCLIC_PERIODS[col])
+            out[:, j] = np.sin(phase)
+            out[:, j + 1] = np.cos(phase)
+            j += 2
+        self._tail = ext[L - h:].copy() if h else ext[:0]
+        return out, y_new[rows].astype(np.float32)
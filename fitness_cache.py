@@ -0,0 +1,125 @@
+"""
+Кеш значень пристосованості (fitness) особин генетичних алгоритмів.
+Ключ: (етап, відбиток датасету, генотип, max_iter, cv_splits, seed).
+Рівні кешу:
+- пам'ять — LRU з обмеженою кількістю записів
+- диск (необов'язково) — JSON-файли, щоб повторні сесії не перенавчали ті самі MLP
+"""
+
+import hashlib, json, os, threading            # hashlib — відбитки, json — дисковий формат, threading — блокування
+from collections import OrderedDict            # OrderedDict — основа LRU
+import numpy as np                             # numpy — для роботи з масивами
+
+def dataset_fingerprint(X, y):
+    """Відбиток (sha1) датасету: форма, тип і вміст X та y."""
+    h = hashlib.sha1()
+    for arr in (X, y):
+        a = np.ascontiguousarray(arr)          # Без копії, якщо масив уже неперервний
+        h.update(f"{a.dtype}|{a.shape}".encode())  # Тип і форма входять у відбиток
+        h.update(memoryview(a).cast("B"))      # Байти масиву без проміжної копії
+    return h.hexdigest()
+
+def _plain(v):
+    """Перетворює numpy-скаляри на звичайні типи Python (для ключа і JSON)."""
+    return v.item() if hasattr(v, "item") else v
+
+def _flat(genotype):
+    """Розгортає генотип у плаский кортеж (масиви-маски — поелементно)."""
+    out = []
+    for g in genotype:
+        if isinstance(g, np.ndarray):
+            out.extend(g.ravel().tolist())
+        else:
+            out.append(_plain(g))
+    return tuple(out)
+
+def make_key(stage, fingerprint, genotype, max_iter, cv_splits, seed=0):
+    """Формує ключ кешу; генотип (маска або кортеж параметрів) стає пласким кортежем."""
+    return (stage, fingerprint, _flat(genotype),
+            int(max_iter), int(cv_splits), int(seed))
+
+class FitnessCache:
+    """
+    LRU-кеш пристосованості з необов'язковим дисковим рівнем.
+    maxsize   – максимальна кількість записів у пам'яті
+    cache_dir – папка для дискового рівня (None — лише пам'ять)
+    """
+
+    def __init__(self, maxsize=4096, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._data = OrderedDict()             # Ключ → кортеж значень (порядок = давність використання)
+        self._lock = threading.Lock()          # GA може працювати у фоновому потоці GUI
+        self.hits = 0                          # Влучання у пам'ять
+        self.disk_hits = 0                     # Влучання на диску
+        self.misses = 0                        # Промахи (модель навчалась)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        """Шлях до файлу запису на диску (двосимвольні підпапки за sha1 ключа)."""
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest[2:] + ".json")
+
+    def _remember(self, key, value):
+        """Додає запис у пам'ять і витісняє найстаріші понад maxsize."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key):
+        """Повертає збережене значення або None."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+        if self.cache_dir:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    rec = json.load(f)
+            except (OSError, ValueError):
+                rec = None
+            if rec is not None and json.dumps(rec["key"]) == json.dumps(key):  # Захист від колізій sha1
+                value = tuple(rec["value"])
+                with self._lock:
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Зберігає значення (кортеж чисел) у пам'ять і, за наявності, на диск."""
+        value = tuple(float(v) for v in value)
+        with self._lock:
+            self._remember(key, value)
+        if self.cache_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value}, f)
+            os.replace(tmp, path)              # Атомарний запис: не залишаємо пошкоджених файлів
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Повертає значення з кешу або обчислює compute() і зберігає результат."""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    @property
+    def hit_rate(self):
+        """Частка запитів, обслужених без навчання моделі."""
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def stats(self):
+        """Статистика кешу для логів."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits,
+                "misses": self.misses, "size": len(self._data),
+                "hit_rate": self.hit_rate}
@@ -0,0 +1,90 @@
+"""
+План фолдів TimeSeriesSplit для оцінювання моделей.
+Фолди TimeSeriesSplit — це неперервні префікси (train) і наступні за ними
+блоки (val), тому межі обчислюються один раз на (кількість рядків, n_splits),
+а train/val видаються зрізами-виглядами на X і y без копіювання.
+Підмножина ознак із рівномірним кроком індексів теж береться виглядом;
+довільна маска копіює лише рядки потрібного фолду, а не всю матрицю.
+Багатоточнісна (multi-fidelity) оцінка навчає модель лише на частці рядків
+train — недавньому неперервному вікні або рівномірній у часі вибірці —
+теж без копіювання; val не змінюється.
+"""
+
+from functools import lru_cache                # lru_cache — план обчислюється один раз
+import numpy as np                             # numpy — для роботи з масивами
+from profiling import timed                    # Таймер fold.slice
+
+SUBSAMPLES = ("recent", "stride")              # Недавнє вікно train або кожен k-й рядок train
+FIDELITY_LEVELS = (0.25, 0.5, 1.0)             # Типовий розклад частки рядків train за поколіннями
+FIDELITY_MIN_ROWS = 64                         # Менше рядків train не береться за будь-якої точності
+
+@lru_cache(maxsize=128)
+def fold_plan(n_samples, n_splits=3):
+    """
+    Межі фолдів, як у TimeSeriesSplit(n_splits): кортеж пар (train, val) зрізів.
+    train — префікс [0, s), val — блок [s, s + test_size).
+    """
+    n_folds = n_splits + 1
+    if n_folds > n_samples:
+        raise ValueError(f"❌ Замало рядків ({n_samples}) для {n_splits} фолдів")
+    test_size = n_samples // n_folds
+    starts = range(n_samples - n_splits * test_size, n_samples, test_size)
+    return tuple((slice(0, s), slice(s, s + test_size)) for s in starts)
+
+def train_slice(tr, fidelity=1.0, subsample="recent"):
+    """
+    Частина train-префікса [0, s) для оцінки з точністю fidelity (частка рядків, 0 < fidelity ≤ 1):
+    recent — останні рядки перед val (неперервне вікно), stride — кожен k-й рядок (рівномірно в часі).
+    """
+    if not 0 < fidelity <= 1:
+        raise ValueError(f"❌ Точність оцінки має бути в (0, 1], отримано {fidelity}")
+    if subsample not in SUBSAMPLES:
+        raise ValueError(f"❌ Невідомий спосіб вибірки: {subsample} (доступні: {', '.join(SUBSAMPLES)})")
+    n = tr.stop
+    rows = min(n, max(FIDELITY_MIN_ROWS, int(np.ceil(n * fidelity))))
+    if rows >= n:
+        return tr
+    if subsample == "recent":
+        return slice(n - rows, n)
+    step = n // rows                           # Крок вибірки; відлік від кінця, щоб останній рядок перед val був у вибірці
+    return slice(n - 1 - step * (rows - 1), n, step)
+
+def fidelity_schedule(gen, n_gen, levels=FIDELITY_LEVELS):
+    """
+    Точність покоління gen з n_gen: рівні levels (за зростанням) ділять покоління порівну,
+    тож останнім поколінням дістається остання (зазвичай повна) точність.
+    """
+    levels = tuple(levels)
+    return float(levels[min(len(levels) - 1, gen * len(levels) // max(n_gen, 1))])
+
+def _column_slice(cols_idx):
+    """Індекси з рівномірним кроком → зріз (вигляд без копії), інакше None."""
+    cols_idx = np.asarray(cols_idx)
+    if len(cols_idx) == 0:
+        return None
+    if len(cols_idx) == 1:
+        return slice(int(cols_idx[0]), int(cols_idx[0]) + 1)
+    step = np.diff(cols_idx)
+    if step[0] > 0 and (step == step[0]).all():
+        return slice(int(cols_idx[0]), int(cols_idx[-1]) + 1, int(step[0]))
+    return None
+
+@timed("fold.slice")
+def fold_arrays(X, y, fold, n_splits=3, cols_idx=None, fidelity=1.0, subsample="recent"):
+    """
+    Дані фолду: (X_train, y_train, X_val, y_val).
+    cols_idx  – індекси вибраних ознак (None — усі ознаки)
+    fidelity  – частка рядків train (див. train_slice); val завжди повний
+    subsample – "recent" або "stride"
+    Без cols_idx і для індексів із рівномірним кроком усі чотири масиви — вигляди на X, y.
+    """
+    tr, val = fold_plan(len(X), n_splits)[fold]
+    if fidelity < 1:                           # Багатоточнісна оцінка: частина train
+        tr = train_slice(tr, fidelity, subsample)
+    if cols_idx is not None:
+        cols = _column_slice(cols_idx)
+        if cols is None:                       # Довільна маска: копіюємо лише рядки фолду
+            return (np.take(X[tr], cols_idx, axis=1), y[tr],
+                    np.take(X[val], cols_idx, axis=1), y[val])
+        X = X[:, cols]
+    return X[tr], y[tr], X[val], y[val]
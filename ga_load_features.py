@@ -1,46 +1,252 @@
-import numpy as np, random                           # numpy для роботи з масивами, random для випадкових виборів
-from sklearn.neural_network import MLPRegressor      # MLPRegressor — багатошаровий персептрон для регресії
-from sklearn.model_selection import TimeSeriesSplit  # TimeSeriesSplit — крос-валідація для часових рядів
-from sklearn.metrics import mean_absolute_error      # mean_absolute_error — метрика MAE
+import time                                         # time — тривалість покоління для подій прогресу
+import numpy as np                                   # numpy для роботи з масивами
+from eval_core import fit_fold, WeightStore          # Спільне ядро: навчання на фолді, сховище ваг (теплий старт)
+from fitness_cache import dataset_fingerprint      # Відбиток датасету для ключів кешу
+from evaluators import evaluate_population, accumulate_budget # Оцінювання популяції (кеш + паралельні бекенди)
+from batched_mlp import batched_fold_scores          # Пакетне навчання популяції на NumPy
+from surrogate import SurrogateScreen, SURROGATE_FACTOR # Сурогатне відсіювання нащадків (RF/GP + EI)
+from folds import fidelity_schedule                  # Частка рядків train за поколіннями (multi-fidelity)
+from progress import publish                         # Події прогресу (шина progress.ProgressBus)
+from profiling import timer, mark, lap               # Таймери етапів і їхній приріст за покоління
+from run_control import (Cancelled, is_cancelled,    # Скасування і контрольні точки
+                         save_checkpoint, load_checkpoint, clear_checkpoint,
+                         seed_root, seed_id, stream, INIT, BREED) # Потоки випадковості GA від одного seed
 
-def evaluate_load_features(X, y, mask, n_splits=3, max_iter=200):
-    """Оцінка підмножини ознак навантаження енергосистеми."""
-    cols_idx = np.where(mask == 1)[0]                # Індекси ознак, які вибрані (mask == 1)
+CROSSOVERS = ("point", "uniform")                    # k-точковий або рівномірний кросовер масок
+TOURNAMENT_SIZE = 2                                  # Особин у турнірі відбору батьків
+DEFAULT_SEED = 123                                   # Фіксований seed етапу (seed=None)
+
+def evaluate_load_features_fold(X, y, mask, fold, n_splits=3, max_iter=200, random_state=0,
+                                init=None, return_weights=False, fidelity=1.0, subsample="recent"):
+    """Оцінка підмножини ознак на одному фолді TimeSeriesSplit: метрики eval_core.FOLD_FIELDS."""
+    cols_idx = np.flatnonzero(mask)                  # Індекси ознак, які вибрані (mask == 1)
     if len(cols_idx) == 0:                           # Якщо жодної ознаки не вибрано
+        return None                                  # Модель не навчаємо (див. aggregate_load_features)
+
+    # Мережа з одним прихованим шаром на 32 нейрони лише на вибраних ознаках
+    return fit_fold(X, y, fold, n_splits, hidden=(32,),
+                    max_iter=max_iter, random_state=random_state, cols_idx=cols_idx,
+                    init=init, return_weights=return_weights, # Теплий старт з ваг батька (якщо передано)
+                    fidelity=fidelity, subsample=subsample)     # Частка рядків train (багатоточнісна оцінка)
+
+def aggregate_load_features(scores):
+    """Зводить метрики фолдів у (MAE, RMSE, std MAE)."""
+    if any(s is None for s in scores):               # Порожня маска
         return 1e9, 1e9, 1e9                         # Повертаємо дуже великі похибки (щоб відсіяти)
+    maes, rmses = [s[0] for s in scores], [s[1] for s in scores]
+    return np.mean(maes), np.mean(rmses), np.std(maes) # Середні MAE, RMSE і стандартне відхилення MAE
+
+def evaluate_load_features_batch(X, y, genotypes, fold, n_splits=3, max_iter=200, random_state=0,
+                                 fidelity=1.0, subsample="recent"):
+    """Пакетна оцінка масок ознак на одному фолді: усі моделі навчаються разом."""
+    masks = [np.asarray(g[0]) for g in genotypes]    # Генотип — (маска,)
+    live = [i for i, m in enumerate(masks) if m.any()] # Порожні маски не навчаємо
+    scores = [None] * len(masks)
+    if live:
+        fitted = batched_fold_scores(X, y, fold, n_splits=n_splits,
+                                     hidden=[32] * len(live), # Та сама мережа на 32 нейрони
+                                     masks=[masks[i] for i in live],
+                                     max_iter=max_iter, random_state=random_state,
+                                     fidelity=fidelity, subsample=subsample)
+        for i, sc in zip(live, fitted):
+            scores[i] = sc
+    return scores
+
+def evaluate_load_features(X, y, mask, n_splits=3, max_iter=200, random_state=0):
+    """Оцінка підмножини ознак навантаження енергосистеми."""
+    return aggregate_load_features([
+        evaluate_load_features_fold(X, y, mask, k, n_splits=n_splits,
+                                    max_iter=max_iter, random_state=random_state)
+        for k in range(n_splits)                     # Для кожного розбиття train/val
+    ])
+
+def encode_mask(genotype):
+    """Кодування маски ознак для сурогату: бітовий вектор."""
+    return np.asarray(genotype, dtype=float)
 
-    Xs = X[:, cols_idx]                              # Вибираємо лише потрібні ознаки
-    tscv = TimeSeriesSplit(n_splits=n_splits)        # Крос-валідація для часових рядів
-    maes, rmses = [], []                             # Списки для збереження похибок
+_POPCOUNT = np.array([bin(b).count("1") for b in range(256)], dtype=np.uint8) # Кількість одиничних бітів байта
+_HIGH_BITS = np.array([(0xFF00 >> k) & 0xFF for k in range(9)], dtype=np.uint8) # Байт з k старшими одиницями
 
-    for tr, val in tscv.split(Xs):                   # Для кожного розбиття train/val
-        model = MLPRegressor(hidden_layer_sizes=(32,), # Мережа з одним прихованим шаром на 32 нейрони
-                             max_iter=max_iter,
-                             random_state=0)
-        model.fit(Xs[tr], y[tr])                     # Навчаємо модель на train
-        pred = model.predict(Xs[val])                # Прогнозуємо на val
-        maes.append(mean_absolute_error(y[val], pred))   # Обчислюємо MAE
-        rmses.append(np.sqrt(np.mean((y[val] - pred) ** 2))) # Обчислюємо RMSE
+def pack_masks(masks):
+    """Матриця масок (особина × ознака) → упакована бітова матриця uint8 (np.packbits, 8 ознак у байті)."""
+    return np.packbits(np.asarray(masks, dtype=bool), axis=1)
 
-    return np.mean(maes), np.mean(rmses), np.std(maes) # Повертаємо середні MAE, RMSE і стандартне відхилення MAE
+def unpack_masks(packed, n_features):
+    """Упакована матриця → маски 0/1 (int8) по n_features ознак."""
+    return np.unpackbits(packed, axis=1, count=n_features).view(np.int8)
+
+def mask_hashes(packed):
+    """
+    64-бітні хеші рядків упакованої матриці масок: FNV-1a словами по 8 байтів
+    (цикл лише за словами — уся популяція разом).
+    """
+    words = np.zeros((len(packed), -(-packed.shape[1] // 8) * 8), dtype=np.uint8)
+    words[:, :packed.shape[1]] = packed
+    h = np.full(len(packed), 0xcbf29ce484222325, dtype=np.uint64)
+    for w in words.view(np.uint64).T:
+        h = (h ^ w) * np.uint64(0x100000001b3)
+    return h
+
+def _tournament(maes, n, size, rng):
+    """n переможців турнірів по size випадкових особин (менша MAE; за рівних — перша)."""
+    idx = rng.integers(len(maes), size=(max(size, 1), n))
+    win = idx[0]
+    for rival in idx[1:]:                            # Цикл лише за учасниками турніру
+        win = np.where(maes[rival] < maes[win], rival, win)
+    return win
+
+def _prefix_bits(cuts, n_bytes):
+    """Упаковані маски «біти j < cut» для кожного рядка (старший біт байта — перша ознака, як у np.packbits)."""
+    ones = cuts.astype(np.int32)[:, None] - np.arange(0, 8 * n_bytes, 8, dtype=np.int32) # Одиниць від початку байта
+    return _HIGH_BITS[np.clip(ones, 0, 8)]
+
+def _crossover(p1, p2, n_features, crossover, points, rng):
+    """
+    Кросовер пар упакованих масок: "uniform" — кожен біт від випадкового батька,
+    "point" — points точок розрізу (ділянки між розрізами — по черзі від p1 і p2).
+    """
+    n, n_bytes = p1.shape
+    if crossover == "uniform":
+        take = rng.integers(0, 256, size=(n, n_bytes), dtype=np.uint8)
+    else:                                            # XOR префіксів: біт j — непарна кількість розрізів після j
+        cuts = rng.integers(1, max(n_features, 2), size=(points, n))
+        take = np.zeros((n, n_bytes), dtype=np.uint8)
+        for c in cuts:
+            take ^= _prefix_bits(c, n_bytes)
+        if points % 2 == 0:                          # Від p1 — біти з парною кількістю розрізів перед ними
+            take = ~take
+    return (p1 & take) | (p2 & ~take)
+
+def _flip_bits(rng, n, n_features, rate):
+    """Упакована маска мутацій: кожен біт — з імовірністю rate (16-бітні частини сирих чисел генератора)."""
+    raw = rng.bit_generator.random_raw(-(-n * n_features // 4)).view("<u2")[:n * n_features]
+    return np.packbits(raw.reshape(n, n_features) < min(round(rate * 65536), 65535), axis=1)
+
+def breed_masks(pop, maes, n_children, n_features, rng, mutation_rate,
+                tournament=TOURNAMENT_SIZE, crossover="point", points=1):
+    """
+    Нащадки покоління кількома операціями над упакованою бітовою матрицею.
+    pop  – упакована матриця масок (pack_masks), maes — MAE її особин
+    Кандидатів генерується вдвічі більше: маски, що повторюють одна одну або особин pop
+    (збіг mask_hashes), ідуть у кінець і потрапляють у популяцію, лише якщо унікальних не вистачає.
+    Повертає (упаковані маски нащадків, індекси першого батька, індекси другого батька) у pop.
+    """
+    m = 2 * n_children
+    win = _tournament(maes, 2 * m, tournament, rng)  # Пари батьків
+    i1, i2 = win[:m], win[m:]
+    children = _crossover(pop[i1], pop[i2], n_features, crossover, points, rng)
+    children ^= _flip_bits(rng, m, n_features, mutation_rate) # Інвертуємо біти у місцях мутації
+    first = np.unique(mask_hashes(np.vstack([pop, children])), return_index=True)[1] - len(pop)
+    fresh = np.zeros(m, dtype=bool)
+    fresh[first[first >= 0]] = True                  # Перша поява маски, якої немає серед оцінених особин
+    order = np.concatenate([np.flatnonzero(fresh), np.flatnonzero(~fresh)])[:n_children]
+    return children[order], i1[order], i2[order]
 
 def ga_load_feature_selection(X, y, cols,
                               pop_size=8, n_gen=5, mutation_rate=0.2,
                               max_iter=200, cv_splits=3,
-                              progress_cb=None):
-    """Генетичний алгоритм для відбору інформативних ознак навантаження."""
-    rng = np.random.RandomState(123)                 # Генератор випадкових чисел для відтворюваності
+                              progress_cb=None, cache=None, evaluator=None,
+                              racing=False, trainer="sklearn", events=None,
+                              cancel=None, checkpoint=None, resume=True, warm_start=False,
+                              surrogate=None, surrogate_factor=SURROGATE_FACTOR,
+                              fidelity=None, subsample="recent", seed=None, migration=None,
+                              tournament=TOURNAMENT_SIZE, crossover="point", crossover_points=1):
+    """
+    Генетичний алгоритм для відбору інформативних ознак навантаження.
+    cache     – FitnessCache для повторного використання оцінок (None — без кешу)
+    evaluator – бекенд оцінювання з evaluators.make_evaluator (None — послідовно)
+    racing    – відсіювання слабких кандидатів після першого фолду (successive halving);
+                витрачений бюджет повертається у полі "budget"
+    trainer   – "sklearn" (MLPRegressor на кожну особину) або "batched"
+                (уся популяція навчається разом у BatchedMLPRegressor)
+    events    – шина подій progress.ProgressBus (або bind(...)): події candidate і generation
+    cancel    – run_control.CancelToken: перевіряється між оцінюваннями; після скасування
+                повертається найкраще рішення останнього повного покоління
+    checkpoint – шлях до контрольної точки (записується після кожного покоління і видаляється,
+                 коли запуск завершився без скасування); n_gen входить у її параметри
+    resume    – продовжити з checkpoint, якщо файл існує (популяція, найкраще)
+    warm_start – нащадок починає з ваг найближчого батька (нові ознаки — випадкові рядки)
+                 і навчається коротше; лише для trainer="sklearn"
+    surrogate – "rf" або "gp": нащадків генерується у surrogate_factor разів більше, а на
+                реальне навчання йдуть найкращі за expected improvement сурогату
+                (кодування — бітовий вектор маски); статистика відсіювання і навчань — у полі "surrogate"
+    fidelity  – рівні частки рядків train за поколіннями (наприклад, folds.FIDELITY_LEVELS;
+                None — завжди всі рядки); найкраще рішення наприкінці переоцінюється на всіх рядках.
+                subsample — "recent" (недавнє вікно train) або "stride" (кожен k-й рядок);
+                точність оцінки записується у поле "fidelity"
+    seed      – seed GA: ціле число, np.random.SeedSequence або np.random.Generator
+                (None — фіксований seed етапу); острови islands.py — різні seed.
+                Кожне покоління бере власний потік run_control.stream(корінь, BREED, gen)
+    migration – острівна модель (islands.py): migration(gen, генотипи від найкращого) → іммігранти,
+                які замінюють останніх нащадків нової популяції (еліта лишається)
+    tournament – особин у турнірі відбору батьків (1 — випадковий вибір)
+    crossover – "point" (crossover_points точок розрізу) або "uniform" (кожен біт — від випадкового батька).
+                Популяція — упакована бітова матриця (pack_masks), нащадки покоління будуються
+                breed_masks одним набором операцій над нею; дублікати масок відкидаються за хешем
+    """
+    if crossover not in CROSSOVERS:
+        raise ValueError(f"❌ Невідомий кросовер: {crossover} (доступні: {', '.join(CROSSOVERS)})")
+    root = seed_root(seed, DEFAULT_SEED)             # Корінь випадковості запуску (відтворюваність)
+    fp = dataset_fingerprint(X, y) if cache is not None or checkpoint else None # Відбиток датасету (кеш і контрольні точки)
     n_features = X.shape[1]                          # Кількість ознак у датасеті
-    pop = rng.randint(0, 2, size=(pop_size, n_features)) # Початкова популяція: випадкові бінарні маски
+    pop = pack_masks(stream(root, INIT).integers(0, 2, size=(pop_size, n_features), dtype=bool)) # Початкова популяція: випадкові маски
+    parents = [None] * pop_size                      # Батько кожної особини (для теплого старту)
+    weights = WeightStore() if warm_start else None  # Ваги навчених моделей за (особина, фолд)
+    screen = SurrogateScreen(surrogate, surrogate_factor) if surrogate else None # Сурогат (None — без відсіювання)
     best = None                                      # Найкраще рішення (буде оновлюватись)
+    budget = None                                    # Сумарний бюджет навчань за запуск
+    config = {"stage": "features", "n_gen": n_gen, "fingerprint": fp, "cols": list(cols), "pop_size": pop_size,
+              "mutation_rate": mutation_rate, "max_iter": max_iter, "cv_splits": cv_splits,
+              "racing": racing, "trainer": trainer,
+              "warm_start": warm_start, "surrogate": surrogate,
+              "surrogate_factor": surrogate_factor,
+              "fidelity": None if fidelity is None else tuple(fidelity),
+              "subsample": subsample,                # З якими параметрами сумісна контрольна точка
+              "tournament": tournament, "crossover": crossover, "crossover_points": crossover_points,
+              "seed": seed_id(root)}
+    start, state = 0, None                           # Перше покоління запуску і відновлений стан
+    if checkpoint and resume:
+        state = load_checkpoint(checkpoint, config)
+    if state is not None:                            # Продовжуємо перерваний запуск з того ж місця
+        start, pop, budget = state["gen"], state["pop"], state["budget"]
+        best, parents = state["best"], state["parents"]
+        if weights is not None:
+            weights.load(state["weights"])
+        if screen is not None:
+            screen.load(state["screen"])
 
-    for gen in range(n_gen):                         # Для кожного покоління
+    laps = mark()                                    # Знімок таймерів (приріст — у подію generation)
+    for gen in range(start, n_gen):                  # Для кожного покоління
+        if is_cancelled(cancel):                     # Скасовано між поколіннями
+            break
+        t_gen = time.perf_counter()                  # Початок покоління (для події generation)
+        fid = fidelity_schedule(gen, n_gen, fidelity) if fidelity else 1.0 # Частка рядків train покоління
         evals = []                                   # Список оцінених рішень
-        for ind in pop:                              # Для кожної особини (маски ознак)
-            mae, rmse, std_mae = evaluate_load_features(X, y, ind,
-                                                        n_splits=cv_splits,
-                                                        max_iter=max_iter)
-            evals.append((mae, rmse, std_mae, ind.sum(), ind)) # Зберігаємо результат: MAE, RMSE, std, кількість ознак, маска
+        masks = unpack_masks(pop, n_features)        # Маски 0/1 поточної популяції
+        try:
+            scores, spent = evaluate_population(evaluate_load_features_fold, aggregate_load_features,
+                                         X, y, [(ind,) for ind in masks], # Генотип — маска ознак
+                                         n_splits=cv_splits, max_iter=max_iter,
+                                         evaluator=evaluator, cache=cache,
+                                         stage=("features" if trainer == "sklearn" else "features/batched")
+                                               + ("/warm" if warm_start else ""), # Теплий старт — окремі записи кешу
+                                         fingerprint=fp, racing=racing, return_budget=True,
+                                         batch_fn=evaluate_load_features_batch if trainer == "batched" else None,
+                                         cancel=cancel, weights=weights, # Генотип батька — (маска,)
+                                         parents=[None if p is None else (p,) for p in parents],
+                                         fidelity=fid, subsample=subsample)
+        except Cancelled:                            # Покоління не завершено — лишаємо результат попереднього
+            break
+        budget = accumulate_budget(budget, spent)    # Обліковуємо фактично витрачені навчання
+        if screen is not None:                       # Реальні оцінки — навчальні дані сурогату (відсіяні racing — ні)
+            real = [i for i, b in enumerate(spent) if not b["pruned"] and scores[i][0] < 1e8]
+            screen.observe([encode_mask(masks[i]) for i in real], [scores[i][0] for i in real],
+                           fidelity=fid, fits=sum(b["fits"] for b in spent))
+        for ind, (mae, rmse, std_mae) in zip(masks, scores): # Для кожної особини (маски ознак)
+            evals.append((mae, rmse, std_mae, int(ind.sum()), ind)) # Зберігаємо результат: MAE, RMSE, std, кількість ознак, маска
+        for i, (ind, (mae, rmse, _), b) in enumerate(zip(masks, scores, spent)):
+            publish(events, "candidate", gen=gen, index=i, mae=float(mae), rmse=float(rmse),
+                    genotype={"mask": ind.tolist()}, budget=b)
 
         evals.sort(key=lambda x: x[0])               # Сортуємо за MAE (мінімізуємо)
         mae, rmse, std_mae, nf, mask = evals[0]      # Беремо найкраще рішення
@@ -49,22 +255,61 @@ def ga_load_feature_selection(X, y, cols,
             "rmse": rmse,
             "std_mae": std_mae,
             "n_features": nf,
-            "features": [cols[i] for i in np.where(mask == 1)[0]], # Список назв вибраних ознак
-            "mask": mask
+            "features": [cols[i] for i in np.flatnonzero(mask)], # Список назв вибраних ознак
+            "mask": mask,
+            "budget": budget,                        # Бюджет навчань (fits, iters, pruned, per_candidate)
+            "fidelity": fid                          # Частка рядків train, на якій отримано оцінку
         }
+        if screen is not None:
+            best["surrogate"] = screen.stats()  # Відсіяні кандидати і фактичні навчання
 
         if progress_cb:                              # Якщо передано callback для прогресу
             progress_cb(gen, mae, rmse, nf)
+        timings, laps = lap(laps)                    # Таймери з попередньої події generation
+        publish(events, "generation", gen=gen, gens=n_gen, mae=float(mae), rmse=float(rmse), extra=int(nf),
+                seconds=time.perf_counter() - t_gen, fits=sum(b["fits"] for b in spent), fidelity=fid,
+                timings=timings)
+
+        with timer("ga.breed"):                      # Відбір, кросовер і мутації
+            # Створюємо нову популяцію: турнір, кросовер і мутації всіх нащадків — операціями над масивами
+            maes = np.array([s[0] for s in scores])  # MAE особин у порядку популяції
+            n_children = screen.n_candidates(pop_size - 1) if screen is not None else pop_size - 1
+            children, i1, i2 = breed_masks(pop, maes, n_children, n_features, stream(root, BREED, gen),
+                                           mutation_rate, tournament, crossover, crossover_points) # І пул сурогату
+            # Батько для теплого старту — той, від кого дитина відрізняється меншою кількістю ознак
+            d1 = _POPCOUNT[children ^ pop[i1]].sum(axis=1, dtype=np.int64)
+            d2 = _POPCOUNT[children ^ pop[i2]].sum(axis=1, dtype=np.int64)
+            source = masks[np.where(d1 <= d2, i1, i2)]
+            new_pop = np.vstack([pop[np.argmin(maes)], children]) # Починаємо з найкращої маски (елітний відбір)
+            parents = [None] + [None if d == 0 else s # Еліта не перенавчається з власних ваг;
+                                for d, s in zip(np.minimum(d1, d2), source)] # копія батька береться з кешу
+        if screen is not None:                       # Сурогат: на реальне навчання — найперспективніші за EI
+            keep = [0] + [1 + i for i in screen.select([encode_mask(c) for c in unpack_masks(new_pop[1:], n_features)],
+                                                       pop_size - 1)]
+            new_pop, parents = new_pop[keep], [parents[i] for i in keep]
+            publish(events, "surrogate", gen=gen, **screen.stats())
+        if migration is not None:                    # Острівна модель: обмін найкращими з сусідніми островами
+            for k, ind in enumerate(migration(gen, [e[4] for e in evals])[:len(new_pop) - 1]):
+                new_pop[-1 - k], parents[-1 - k] = pack_masks([ind])[0], None
+        pop = new_pop                                # Оновлюємо популяцію
+        if checkpoint:                               # Стан перед наступним поколінням
+            save_checkpoint(checkpoint, config, {"gen": gen + 1, "pop": pop,
+                                                 "evals": evals, "best": best, "budget": budget,
+                                                 "parents": parents,
+                                                 "weights": weights.dump() if weights is not None else None,
+                                                 "screen": screen.dump() if screen is not None else None})
 
-        # Створюємо нову популяцію
-        new_pop = [mask]                             # Починаємо з найкращої маски (елітний відбір)
-        while len(new_pop) < pop_size:               # Поки не заповнили популяцію
-            p1, p2 = random.choice(evals)[4], random.choice(evals)[4] # Вибираємо двох батьків (маски)
-            cx = rng.randint(1, n_features - 1)      # Точка кросоверу
-            child = np.concatenate([p1[:cx], p2[cx:]]) # Дитина: частина від p1, частина від p2
-            mut = rng.rand(n_features) < mutation_rate # Випадкові мутації
-            child[mut] = 1 - child[mut]              # Інвертуємо біти у місцях мутації
-            new_pop.append(child)                    # Додаємо дитину у нову популяцію
-        pop = np.array(new_pop)                      # Оновлюємо популяцію
+    if best is not None and best["fidelity"] < 1 and not is_cancelled(cancel):
+        # Еліта оцінювалась на частині рядків — фінальна оцінка на всіх (з іншими точностями не порівнюється)
+        batched = trainer == "batched"               # Тим самим тренером, що й пошук (з нуля, без теплого старту)
+        ((mae, rmse, std_mae),), spent = evaluate_population(evaluate_load_features_fold, aggregate_load_features,
+                                                             X, y, [(best["mask"],)], n_splits=cv_splits,
+                                                             max_iter=max_iter, evaluator=evaluator, cache=cache,
+                                                             stage="features/batched" if batched else "features",
+                                                             batch_fn=evaluate_load_features_batch if batched else None,
+                                                             fingerprint=fp, return_budget=True)
+        best.update(mae=mae, rmse=rmse, std_mae=std_mae, fidelity=1.0,
+                    budget=accumulate_budget(budget, spent))
 
+    clear_checkpoint(checkpoint, cancel)             # Завершений запуск не продовжується
     return best                                      # Повертаємо найкраще знайдене рішення
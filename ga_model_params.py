@@ -3,84 +3,227 @@
 завантаженості енергосистеми.
 """
 
-import numpy as np, random                           # numpy для числових обчислень, random для випадкових виборів
-from sklearn.neural_network import MLPRegressor      # MLPRegressor — багатошаровий персептрон для регресії
-from sklearn.model_selection import TimeSeriesSplit  # TimeSeriesSplit — крос-валідація для часових рядів
-from sklearn.metrics import mean_absolute_error      # mean_absolute_error — метрика MAE
+import time                                         # time — тривалість покоління для подій прогресу
+import numpy as np                                   # numpy для числових обчислень
+from eval_core import fit_fold, WeightStore          # Спільне ядро: навчання на фолді, сховище ваг (теплий старт)
+from fitness_cache import dataset_fingerprint      # Відбиток датасету для ключів кешу
+from evaluators import evaluate_population, accumulate_budget # Оцінювання популяції (кеш + паралельні бекенди)
+from batched_mlp import batched_fold_scores          # Пакетне навчання популяції на NumPy
+from surrogate import SurrogateScreen, SURROGATE_FACTOR # Сурогатне відсіювання нащадків (RF/GP + EI)
+from folds import fidelity_schedule                  # Частка рядків train за поколіннями (multi-fidelity)
+from progress import publish                         # Події прогресу (шина progress.ProgressBus)
+from profiling import timer, mark, lap               # Таймери етапів і їхній приріст за покоління
+from run_control import (Cancelled, is_cancelled,    # Скасування і контрольні точки
+                         save_checkpoint, load_checkpoint, clear_checkpoint,
+                         seed_root, seed_id, stream, choose, INIT, BREED) # Потоки випадковості GA від одного seed
 
 # Діапазони параметрів для оптимізації
 HIDDEN_CHOICES = [16, 32, 64, 128]                   # Можливі кількості нейронів у прихованому шарі
 LR_CHOICES = [0.001, 0.01, 0.05]                     # Можливі швидкості навчання
 ALPHA_CHOICES = [0.0001, 0.001, 0.01]                # Можливі коефіцієнти регуляризації
+DEFAULT_SEED = 42                                    # Фіксований seed етапу (seed=None)
 
-def evaluate_params(X, y, hidden, lr, alpha, n_splits=3, max_iter=200):
+def encode_params(genotype):
+    """Кодування (hidden, lr, alpha) для сурогату: логарифмічні шкали."""
+    hidden, lr, alpha = genotype
+    return np.log2(hidden), np.log10(lr), np.log10(alpha)
+
+def evaluate_params_fold(X, y, hidden, lr, alpha, fold, n_splits=3, max_iter=200, random_state=0,
+                         init=None, return_weights=False, fidelity=1.0, subsample="recent"):
+    """Оцінка набору параметрів на одному фолді TimeSeriesSplit: метрики eval_core.FOLD_FIELDS."""
+    return fit_fold(X, y, fold, n_splits, hidden=(hidden,), # MLP з одним прихованим шаром
+                    lr=lr, alpha=alpha,              # Швидкість навчання і коефіцієнт регуляризації
+                    max_iter=max_iter, random_state=random_state,
+                    init=init, return_weights=return_weights, # Теплий старт з ваг батька (якщо передано)
+                    fidelity=fidelity, subsample=subsample)     # Частка рядків train (багатоточнісна оцінка)
+
+def aggregate_params(scores):
+    """Зводить метрики фолдів у (MAE, RMSE)."""
+    return np.mean([s[0] for s in scores]), np.mean([s[1] for s in scores])
+
+def evaluate_params_batch(X, y, genotypes, fold, n_splits=3, max_iter=200, random_state=0,
+                          fidelity=1.0, subsample="recent"):
+    """Пакетна оцінка наборів (hidden, lr, alpha) на одному фолді: усі моделі навчаються разом."""
+    return batched_fold_scores(X, y, fold, n_splits=n_splits,
+                               hidden=[g[0] for g in genotypes],
+                               lr=[g[1] for g in genotypes],
+                               alpha=[g[2] for g in genotypes],
+                               max_iter=max_iter, random_state=random_state,
+                               fidelity=fidelity, subsample=subsample)
+
+def evaluate_params(X, y, hidden, lr, alpha, n_splits=3, max_iter=200, random_state=0):
     """
     Оцінка конкретного набору параметрів (hidden, lr, alpha).
     Використовує TimeSeriesSplit для крос-валідації.
     """
-    tscv = TimeSeriesSplit(n_splits=n_splits)        # Розбиваємо дані на n_splits для крос-валідації
-    maes, rmses = [], []                             # Списки для збереження похибок
-    for tr, val in tscv.split(X):                    # Для кожного розбиття train/val
-        model = MLPRegressor(hidden_layer_sizes=(hidden,), # Створюємо модель MLP з одним прихованим шаром
-                             learning_rate_init=lr,        # Встановлюємо швидкість навчання
-                             alpha=alpha,                  # Встановлюємо коефіцієнт регуляризації
-                             max_iter=max_iter,            # Максимальна кількість ітерацій
-                             random_state=0)               # Фіксуємо seed для відтворюваності
-        model.fit(X[tr], y[tr])                      # Навчаємо модель на train
-        pred = model.predict(X[val])                 # Прогнозуємо на val
-        maes.append(mean_absolute_error(y[val], pred))   # Обчислюємо MAE
-        rmses.append(np.sqrt(np.mean((y[val] - pred) ** 2))) # Обчислюємо RMSE
-    return np.mean(maes), np.mean(rmses)             # Повертаємо середні значення MAE і RMSE
+    return aggregate_params([
+        evaluate_params_fold(X, y, hidden, lr, alpha, k, n_splits=n_splits,
+                             max_iter=max_iter, random_state=random_state)
+        for k in range(n_splits)                     # Для кожного розбиття train/val
+    ])
 
 def ga_model_param_synthesis(X, y,
                              pop_size=8, n_gen=5, mutation_rate=0.2,
                              max_iter=200, cv_splits=3,
-                             progress_cb=None):
+                             progress_cb=None, cache=None, evaluator=None,
+                             racing=False, trainer="sklearn", events=None,
+                             cancel=None, checkpoint=None, resume=True, warm_start=False,
+                             surrogate=None, surrogate_factor=SURROGATE_FACTOR,
+                             fidelity=None, subsample="recent", seed=None, migration=None):
     """
     Генетичний алгоритм для пошуку оптимальних параметрів моделі прогнозу.
     Оптимізує:
     - hidden (кількість нейронів у прихованому шарі)
     - lr (швидкість навчання)
     - alpha (коефіцієнт регуляризації)
+    cache     – FitnessCache для повторного використання оцінок (None — без кешу)
+    evaluator – бекенд оцінювання з evaluators.make_evaluator (None — послідовно)
+    racing    – відсіювання слабких кандидатів після першого фолду (successive halving);
+                витрачений бюджет повертається у полі "budget"
+    trainer   – "sklearn" (MLPRegressor на кожну особину) або "batched"
+                (уся популяція навчається разом у BatchedMLPRegressor)
+    events    – шина подій progress.ProgressBus (або bind(...)): події candidate і generation
+    cancel    – run_control.CancelToken: перевіряється між оцінюваннями; після скасування
+                повертається найкраще рішення останнього повного покоління
+    checkpoint – шлях до контрольної точки (записується після кожного покоління і видаляється,
+                 коли запуск завершився без скасування); n_gen входить у її параметри
+    warm_start – нащадок починає з ваг батька (нові нейрони прихованого шару — випадкові, зайві відкидаються)
+                 і навчається коротше; лише для trainer="sklearn"
+    surrogate – "rf" або "gp": нащадків генерується у surrogate_factor разів більше, а на
+                реальне навчання йдуть найкращі за expected improvement сурогату
+                (кодування — log hidden, log lr, log alpha); статистика відсіювання і навчань — у полі "surrogate"
+    fidelity  – рівні частки рядків train за поколіннями (наприклад, folds.FIDELITY_LEVELS;
+                None — завжди всі рядки); найкраще рішення наприкінці переоцінюється на всіх рядках.
+                subsample — "recent" (недавнє вікно train) або "stride" (кожен k-й рядок);
+                точність оцінки записується у поле "fidelity"
+    seed      – seed GA: ціле число, np.random.SeedSequence або np.random.Generator
+                (None — фіксований seed етапу); острови islands.py — різні seed.
+                Кожне покоління бере власний потік run_control.stream(корінь, BREED, gen)
+    migration – острівна модель (islands.py): migration(gen, генотипи від найкращого) → іммігранти,
+                які замінюють останніх нащадків нової популяції (еліта лишається)
     """
-    rng = np.random.RandomState(42)                  # Генератор випадкових чисел для відтворюваності
+    root = seed_root(seed, DEFAULT_SEED)             # Корінь випадковості запуску (відтворюваність)
+    fp = dataset_fingerprint(X, y) if cache is not None or checkpoint else None # Відбиток датасету (кеш і контрольні точки)
 
     # Початкова популяція: випадкові комбінації параметрів
-    pop = [(random.choice(HIDDEN_CHOICES),
-            random.choice(LR_CHOICES),
-            random.choice(ALPHA_CHOICES)) for _ in range(pop_size)]
+    rng = stream(root, INIT)
+    pop = list(zip(choose(rng, HIDDEN_CHOICES, pop_size),
+                   choose(rng, LR_CHOICES, pop_size),
+                   choose(rng, ALPHA_CHOICES, pop_size)))
 
+    parents = [None] * pop_size                      # Батько кожної особини (для теплого старту)
+    weights = WeightStore() if warm_start else None  # Ваги навчених моделей за (особина, фолд)
+    screen = SurrogateScreen(surrogate, surrogate_factor) if surrogate else None # Сурогат (None — без відсіювання)
     best = None                                      # Найкраще рішення (буде оновлюватись)
+    budget = None                                    # Сумарний бюджет навчань за запуск
+    config = {"stage": "params", "n_gen": n_gen, "fingerprint": fp, "pop_size": pop_size,
+              "mutation_rate": mutation_rate, "max_iter": max_iter, "cv_splits": cv_splits,
+              "racing": racing, "trainer": trainer,
+              "warm_start": warm_start, "surrogate": surrogate,
+              "surrogate_factor": surrogate_factor,
+              "fidelity": None if fidelity is None else tuple(fidelity),
+              "subsample": subsample,                # З якими параметрами сумісна контрольна точка
+              "seed": seed_id(root)}
+    start, state = 0, None                           # Перше покоління запуску і відновлений стан
+    if checkpoint and resume:
+        state = load_checkpoint(checkpoint, config)
+    if state is not None:                            # Продовжуємо перерваний запуск з того ж місця
+        start, pop, budget = state["gen"], state["pop"], state["budget"]
+        best, parents = state["best"], state["parents"]
+        if weights is not None:
+            weights.load(state["weights"])
+        if screen is not None:
+            screen.load(state["screen"])
 
-    for gen in range(n_gen):                         # Для кожного покоління
+    laps = mark()                                    # Знімок таймерів (приріст — у подію generation)
+    for gen in range(start, n_gen):                  # Для кожного покоління
+        if is_cancelled(cancel):                     # Скасовано між поколіннями
+            break
+        t_gen = time.perf_counter()                  # Початок покоління (для події generation)
+        fid = fidelity_schedule(gen, n_gen, fidelity) if fidelity else 1.0 # Частка рядків train покоління
         evals = []                                   # Список оцінених рішень
-        for hidden, lr, alpha in pop:                # Для кожного набору параметрів
-            mae, rmse = evaluate_params(X, y, hidden, lr, alpha,
-                                        n_splits=cv_splits, max_iter=max_iter)
+        try:
+            scores, spent = evaluate_population(evaluate_params_fold, aggregate_params, X, y, pop,
+                                         n_splits=cv_splits, max_iter=max_iter,
+                                         evaluator=evaluator, cache=cache,
+                                         stage=("params" if trainer == "sklearn" else "params/batched")
+                                               + ("/warm" if warm_start else ""), # Теплий старт — окремі записи кешу
+                                         fingerprint=fp, racing=racing, return_budget=True,
+                                         batch_fn=evaluate_params_batch if trainer == "batched" else None,
+                                         cancel=cancel, parents=parents, weights=weights,
+                                         fidelity=fid, subsample=subsample)
+        except Cancelled:                            # Покоління не завершено — лишаємо результат попереднього
+            break
+        budget = accumulate_budget(budget, spent)    # Обліковуємо фактично витрачені навчання
+        if screen is not None:                       # Реальні оцінки — навчальні дані сурогату (відсіяні racing — ні)
+            real = [i for i, b in enumerate(spent) if not b["pruned"] and scores[i][0] < 1e8]
+            screen.observe([encode_params(pop[i]) for i in real], [scores[i][0] for i in real],
+                           fidelity=fid, fits=sum(b["fits"] for b in spent))
+        for (hidden, lr, alpha), (mae, rmse) in zip(pop, scores): # Для кожного набору параметрів
             evals.append((mae, rmse, hidden, lr, alpha)) # Зберігаємо результат
+        for i, ((hidden, lr, alpha), (mae, rmse), b) in enumerate(zip(pop, scores, spent)):
+            publish(events, "candidate", gen=gen, index=i, mae=float(mae), rmse=float(rmse),
+                    genotype={"hidden": hidden, "lr": lr, "alpha": alpha}, budget=b)
 
         # Сортуємо за MAE (мінімізуємо)
         evals.sort(key=lambda x: x[0])
         mae, rmse, hidden, lr, alpha = evals[0]      # Беремо найкраще рішення
         best = {"mae": mae, "rmse": rmse,
-                "hidden": hidden, "lr": lr, "alpha": alpha}
+                "hidden": hidden, "lr": lr, "alpha": alpha,
+                "budget": budget,                    # Бюджет навчань (fits, iters, pruned, per_candidate)
+                "fidelity": fid}                     # Частка рядків train, на якій отримано оцінку
+        if screen is not None:
+            best["surrogate"] = screen.stats()  # Відсіяні кандидати і фактичні навчання
 
         if progress_cb:                              # Якщо передано callback для прогресу
             progress_cb(gen, mae, rmse, f"h={hidden}, lr={lr}, a={alpha}")
+        timings, laps = lap(laps)                    # Таймери з попередньої події generation
+        publish(events, "generation", gen=gen, gens=n_gen, mae=float(mae), rmse=float(rmse),
+                extra=f"h={hidden}, lr={lr}, a={alpha}",
+                seconds=time.perf_counter() - t_gen, fits=sum(b["fits"] for b in spent), fidelity=fid,
+                timings=timings)
 
-        # Нова популяція (елітний відбір + кросовер + мутації)
-        new_pop = [(hidden, lr, alpha)]              # Починаємо з найкращого (елітний відбір)
-        while len(new_pop) < pop_size:               # Поки не заповнили популяцію
-            p1, p2 = random.choice(evals), random.choice(evals) # Вибираємо двох батьків
-            child = [p1[2], p1[3], p1[4]]            # Дитина успадковує параметри від p1
-            # Мутації: з певною ймовірністю змінюємо параметри
-            if rng.rand() < mutation_rate:
-                child[0] = random.choice(HIDDEN_CHOICES)
-            if rng.rand() < mutation_rate:
-                child[1] = random.choice(LR_CHOICES)
-            if rng.rand() < mutation_rate:
-                child[2] = random.choice(ALPHA_CHOICES)
-            new_pop.append(tuple(child))             # Додаємо дитину у нову популяцію
+        with timer("ga.breed"):                      # Відбір, кросовер і мутації
+            # Нова популяція (елітний відбір + кросовер + мутації)
+            new_pop = [(hidden, lr, alpha)]          # Починаємо з найкращого (елітний відбір)
+            parents = [None]                         # Еліта не перенавчається з власних ваг
+            rng = stream(root, BREED, gen)           # Потік покоління (однаковий і після відновлення з точки)
+            n_children = screen.n_candidates(pop_size - 1) if screen is not None else pop_size - 1
+            pick = rng.integers(len(evals), size=n_children) # Батьки всіх нащадків (пул кандидатів сурогату)
+            mut = rng.random((n_children, 3)) < mutation_rate # Мутації: які параметри змінюються
+            draws = zip(choose(rng, HIDDEN_CHOICES, n_children), # Нові значення мутованих параметрів
+                        choose(rng, LR_CHOICES, n_children),
+                        choose(rng, ALPHA_CHOICES, n_children))
+            for i, m, new in zip(pick, mut, draws):
+                source = tuple(evals[i][2:5])        # Дитина — мутант батька: теплий старт з його ваг
+                child = tuple(v if flip else s for s, v, flip in zip(source, new, m))
+                new_pop.append(child)                # Додаємо дитину у нову популяцію
+                parents.append(None if child == source else source)
+        if screen is not None:                       # Сурогат: на реальне навчання — найперспективніші за EI
+            keep = [0] + [1 + i for i in screen.select([encode_params(c) for c in new_pop[1:]], pop_size - 1)]
+            new_pop, parents = [new_pop[i] for i in keep], [parents[i] for i in keep]
+            publish(events, "surrogate", gen=gen, **screen.stats())
+        if migration is not None:                    # Острівна модель: обмін найкращими з сусідніми островами
+            for k, ind in enumerate(migration(gen, [tuple(e[2:5]) for e in evals])[:len(new_pop) - 1]):
+                new_pop[-1 - k], parents[-1 - k] = tuple(ind), None
         pop = new_pop                                # Оновлюємо популяцію
+        if checkpoint:                               # Стан перед наступним поколінням
+            save_checkpoint(checkpoint, config, {"gen": gen + 1, "pop": pop,
+                                                 "evals": evals, "best": best, "budget": budget,
+                                                 "parents": parents,
+                                                 "weights": weights.dump() if weights is not None else None,
+                                                 "screen": screen.dump() if screen is not None else None})
+
+    if best is not None and best["fidelity"] < 1 and not is_cancelled(cancel):
+        # Еліта оцінювалась на частині рядків — фінальна оцінка на всіх (з іншими точностями не порівнюється)
+        ((mae, rmse),), spent = evaluate_population(evaluate_params_fold, aggregate_params, X, y,
+                                                    [(best["hidden"], best["lr"], best["alpha"])],
+                                                    n_splits=cv_splits, max_iter=max_iter,
+                                                    evaluator=evaluator, cache=cache, # Тим самим тренером, що й пошук
+                                                    stage="params" if trainer == "sklearn" else "params/batched",
+                                                    batch_fn=evaluate_params_batch if trainer == "batched" else None,
+                                                    fingerprint=fp, return_budget=True)
+        best.update(mae=mae, rmse=rmse, fidelity=1.0, budget=accumulate_budget(budget, spent))
 
+    clear_checkpoint(checkpoint, cancel)             # Завершений запуск не продовжується
     return best                                      # Повертаємо найкраще знайдене рішення
@@ -3,80 +3,279 @@
 для прогнозування навантаження енергосистеми.
 """
 
-import numpy as np, random                           # numpy для числових обчислень, random для випадкових виборів
-from sklearn.neural_network import MLPRegressor      # MLPRegressor — багатошаровий персептрон для регресії
-from sklearn.model_selection import TimeSeriesSplit  # TimeSeriesSplit — крос-валідація для часових рядів
-from sklearn.metrics import mean_absolute_error      # mean_absolute_error — метрика MAE
+import time                                         # time — тривалість покоління для подій прогресу
+from functools import partial                        # partial — lr/alpha у функції оцінки фолду
+import numpy as np                                   # numpy для числових обчислень
+from eval_core import fit_fold, aggregate_folds, count_params as _count_params, WeightStore # Спільне ядро оцінювання
+from eval_core import DEFAULT_LR, DEFAULT_ALPHA, hyper_tag # lr/alpha навчання (з етапу params у конвеєрі)
+from fitness_cache import dataset_fingerprint      # Відбиток датасету для ключів кешу
+from evaluators import evaluate_population         # Оцінювання популяції (кеш + паралельні бекенди)
+from surrogate import SurrogateScreen, SURROGATE_FACTOR # Сурогатне відсіювання нащадків (RF/GP + EI)
+from folds import fidelity_schedule                  # Частка рядків train за поколіннями (multi-fidelity)
+from progress import publish                         # Події прогресу (шина progress.ProgressBus)
+from profiling import timer, mark, lap               # Таймери етапів і їхній приріст за покоління
+from run_control import (Cancelled, is_cancelled,    # Скасування і контрольні точки
+                         save_checkpoint, load_checkpoint, clear_checkpoint,
+                         seed_root, seed_id, stream, choose, INIT, BREED) # Потоки випадковості GA від одного seed
+from pareto import ParetoArchive, rank_and_crowding, nsga2_order, tournament # NSGA-II над матрицею цілей
 
 # Можливі варіанти кількості шарів і кількості нейронів у шарі
 LAYER_CHOICES = [1, 2, 3]                            # Кількість прихованих шарів
 NEURON_CHOICES = [16, 32, 64, 128]                   # Кількість нейронів у кожному шарі
 
-def evaluate_architecture(X, y, layers, neurons, n_splits=3, max_iter=200):
-    """Оцінка архітектури за MAE і RMSE."""
-    tscv = TimeSeriesSplit(n_splits=n_splits)        # Розбиваємо дані на n_splits для крос-валідації
-    maes, rmses = [], []                             # Списки для збереження похибок
+# Цілі оптимізації (усі мінімізуються)
+OBJECTIVES = ("mae", "rmse", "params", "fit_time")   # MAE, RMSE, кількість параметрів, час навчання (с)
+DEFAULT_OBJECTIVES = ("mae", "rmse", "params")       # fit_time залежить від навантаження машини — лише на вимогу
+ARCHIVE_SIZE = 32                                    # Максимальний розмір архіву еліти (Парето-фронту)
+DEFAULT_SEED = 21                                    # Фіксований seed етапу (seed=None)
+
+def evaluate_architecture_fold(X, y, layers, neurons, fold, n_splits=3, max_iter=200, random_state=0,
+                               init=None, return_weights=False, fidelity=1.0, subsample="recent",
+                               lr=DEFAULT_LR, alpha=DEFAULT_ALPHA):
+    """Оцінка архітектури на одному фолді TimeSeriesSplit: метрики eval_core.FOLD_FIELDS."""
     hidden = tuple([neurons] * layers)               # Формуємо архітектуру: повторюємо neurons layers разів
-    for tr, val in tscv.split(X):                    # Для кожного розбиття train/val
-        model = MLPRegressor(hidden_layer_sizes=hidden,  # Створюємо модель MLP
-                             max_iter=max_iter,
-                             random_state=0)
-        model.fit(X[tr], y[tr])                      # Навчаємо на train
-        pred = model.predict(X[val])                 # Прогнозуємо на val
-        maes.append(mean_absolute_error(y[val], pred))   # Обчислюємо MAE
-        rmses.append(np.sqrt(np.mean((y[val] - pred) ** 2))) # Обчислюємо RMSE
-    return np.mean(maes), np.mean(rmses)             # Повертаємо середні значення MAE і RMSE
-
-def dominates(a, b):
-    """Перевірка, чи рішення a домінує над b (Парето)."""
-    # a домінує над b, якщо воно не гірше за обома критеріями і краще хоча б за одним
-    return (a["mae"] <= b["mae"] and a["rmse"] <= b["rmse"]) and (a["mae"] < b["mae"] or a["rmse"] < b["rmse"])
+    return fit_fold(X, y, fold, n_splits, hidden=hidden, lr=lr, alpha=alpha,
+                    max_iter=max_iter, random_state=random_state,
+                    init=init, return_weights=return_weights, # Теплий старт з ваг батька (якщо передано)
+                    fidelity=fidelity, subsample=subsample)     # Частка рядків train (багатоточнісна оцінка)
+
+def aggregate_architecture(scores):
+    """Зводить метрики фолдів у (MAE, RMSE, середній час навчання)."""
+    return aggregate_folds(scores)[:3]               # Час навчання — окрема ціль оптимізації
+
+def evaluate_architecture(X, y, layers, neurons, n_splits=3, max_iter=200, random_state=0):
+    """Оцінка архітектури за MAE, RMSE і часом навчання."""
+    return aggregate_architecture([
+        evaluate_architecture_fold(X, y, layers, neurons, k, n_splits=n_splits,
+                                   max_iter=max_iter, random_state=random_state)
+        for k in range(n_splits)                     # Для кожного розбиття train/val
+    ])
+
+def count_params(n_features, layers, neurons):
+    """Кількість ваг і зсувів MLP з layers прихованими шарами по neurons нейронів і одним виходом."""
+    return _count_params(n_features, [neurons] * layers)
+
+def dominates(a, b, objectives=("mae", "rmse")):
+    """Перевірка, чи рішення a домінує над b (Парето) за цілями objectives."""
+    # a домінує над b, якщо воно не гірше за всіма критеріями і краще хоча б за одним
+    return (all(a[o] <= b[o] for o in objectives)) and any(a[o] < b[o] for o in objectives)
+
+def encode_architecture(genotype):
+    """Кодування (layers, neurons) для сурогату: кількість шарів і log2 ширини."""
+    layers, neurons = genotype
+    return float(layers), np.log2(neurons)
+
+def _genotype(cand):
+    """Генотип рішення (ключ архіву)."""
+    return cand["layers"], cand["neurons"]
+
+def _rescore(X, y, groups, fidelity, subsample="recent", lr=DEFAULT_LR, alpha=DEFAULT_ALPHA, **kw):
+    """
+    Переоцінює рішення списків groups з точністю fidelity (кожен генотип — один раз):
+    після зміни точності старі оцінки з новими не порівнюються. kw — параметри evaluate_population.
+    """
+    cands = {}
+    for group in groups:
+        for c in group:
+            cands.setdefault(_genotype(c), c)
+    scores = evaluate_population(partial(evaluate_architecture_fold, lr=lr, alpha=alpha), aggregate_architecture,
+                                 X, y, list(cands), stage="opt/timed" + hyper_tag(lr, alpha),
+                                 fidelity=fidelity, subsample=subsample, **kw)
+    fresh = {g: dict(c, mae=mae, rmse=rmse, fit_time=seconds, fidelity=fidelity)
+             for (g, c), (mae, rmse, seconds) in zip(cands.items(), scores)}
+    return [[fresh[_genotype(c)] for c in group] for group in groups]
 
 def ga_multiobjective_optimization(X, y,
                                    pop_size=10, n_gen=5, mutation_rate=0.2,
                                    max_iter=200, cv_splits=3,
-                                   progress_cb=None):
+                                   progress_cb=None, cache=None, evaluator=None,
+                                   racing=False, events=None,
+                                   cancel=None, checkpoint=None, resume=True,
+                                   objectives=DEFAULT_OBJECTIVES, archive_size=ARCHIVE_SIZE, warm_start=False,
+                                   surrogate=None, surrogate_factor=SURROGATE_FACTOR,
+                                   fidelity=None, subsample="recent", lr=DEFAULT_LR, alpha=DEFAULT_ALPHA,
+                                   seed=None, migration=None):
     """
-    Генетичний алгоритм для багатокритеріальної оптимізації архітектури.
-    Повертає Парето‑фронт (список рішень).
+    Генетичний алгоритм для багатокритеріальної оптимізації архітектури (NSGA-II).
+    Повертає Парето‑фронт (список рішень) — вміст архіву еліти за весь запуск.
+    objectives   – цілі з OBJECTIVES (mae, rmse, params, fit_time), усі мінімізуються
+    archive_size – межа архіву недомінованих рішень; надлишок відкидається за скупченістю
+    warm_start   – нащадок починає з ваг батька тієї ж глибини (нові нейрони — випадкові)
+                   і навчається коротше
+    surrogate    – "rf" або "gp": нащадків генерується у surrogate_factor разів більше, а на
+                   реальне навчання йдуть найкращі за expected improvement сурогату MAE
+                   (решту цілей враховує відбір NSGA-II); статистика — подія "surrogate"
+    fidelity     – рівні частки рядків train за поколіннями (наприклад, folds.FIDELITY_LEVELS;
+                   None — завжди всі рядки; subsample — "recent" або "stride"). Зі зміною точності
+                   архів і батьки переоцінюються, наприкінці фронт переоцінюється на всіх рядках;
+                   точність кожного рішення — у полі "fidelity"
+    lr, alpha    – швидкість навчання і регуляризація кожної моделі (у конвеєрі — найкращі з етапу params)
+    cache     – FitnessCache для повторного використання оцінок (None — без кешу)
+    evaluator – бекенд оцінювання з evaluators.make_evaluator (None — послідовно)
+    racing    – відсіювання слабких кандидатів після першого фолду (successive halving);
+                витрачений бюджет повертається у полі "budget"
+    events    – шина подій progress.ProgressBus (або bind(...)): події candidate і generation
+    cancel    – run_control.CancelToken: перевіряється між оцінюваннями; після скасування
+                повертається Парето-фронт останнього повного покоління
+    checkpoint – шлях до контрольної точки (записується після кожного покоління і видаляється,
+                 коли запуск завершився без скасування); n_gen входить у її параметри
+    resume    – продовжити з checkpoint, якщо файл існує (популяція, найкраще)
+    seed      – seed GA: ціле число, np.random.SeedSequence або np.random.Generator
+                (None — фіксований seed етапу); острови islands.py — різні seed.
+                Кожне покоління бере власний потік run_control.stream(корінь, BREED, gen)
+    migration – острівна модель (islands.py): migration(gen, генотипи від найкращого) → іммігранти,
+                які замінюють останніх нащадків нової популяції (еліта — у батьках і архіві)
     """
-    rng = np.random.RandomState(21)                  # Генератор випадкових чисел для відтворюваності
+    objectives = tuple(objectives)
+    unknown = [o for o in objectives if o not in OBJECTIVES]
+    if unknown or len(objectives) < 2:
+        raise ValueError(f"❌ Потрібно щонайменше дві цілі з {', '.join(OBJECTIVES)}; отримано: {', '.join(objectives)}")
+    root = seed_root(seed, DEFAULT_SEED)             # Корінь випадковості запуску (відтворюваність)
+    fp = dataset_fingerprint(X, y) if cache is not None or checkpoint else None # Відбиток датасету (кеш і контрольні точки)
+    fold_fn = partial(evaluate_architecture_fold, lr=lr, alpha=alpha) # Оцінка фолду з lr/alpha запуску
+    tag = hyper_tag(lr, alpha)                       # Ключі кешу для нетипових lr/alpha
     # Початкова популяція: випадкові архітектури (layers, neurons)
-    pop = [(random.choice(LAYER_CHOICES), random.choice(NEURON_CHOICES)) for _ in range(pop_size)]
+    rng = stream(root, INIT)
+    pop = list(zip(choose(rng, LAYER_CHOICES, pop_size), choose(rng, NEURON_CHOICES, pop_size)))
+    archive = ParetoArchive(archive_size, objectives, key=_genotype) # Еліта за весь запуск
     pareto_front = []                                # Початковий Парето-фронт порожній
+    parents = []                                     # Оцінені батьки, що вижили (елітизм μ+λ)
+    lineage = [None] * pop_size                      # Генотип батька кожної особини (для теплого старту)
+    weights = WeightStore() if warm_start else None  # Ваги навчених моделей за (особина, фолд)
+    screen = SurrogateScreen(surrogate, surrogate_factor) if surrogate else None # Сурогат (None — без відсіювання)
+    config = {"stage": "opt", "n_gen": n_gen, "fingerprint": fp, "pop_size": pop_size,
+              "mutation_rate": mutation_rate, "max_iter": max_iter, "cv_splits": cv_splits,
+              "racing": racing, "objectives": objectives,
+              "archive_size": archive_size,
+              "warm_start": warm_start, "surrogate": surrogate,
+              "surrogate_factor": surrogate_factor,
+              "fidelity": None if fidelity is None else tuple(fidelity),
+              "subsample": subsample,                # З якими параметрами сумісна контрольна точка
+              **({"lr": lr, "alpha": alpha} if tag else {}), # Нетипові lr/alpha (старі точки лишаються сумісними)
+              "seed": seed_id(root)}
+    start, state = 0, None                           # Перше покоління запуску і відновлений стан
+    if checkpoint and resume:
+        state = load_checkpoint(checkpoint, config)
+    if state is not None:                            # Продовжуємо перерваний запуск з того ж місця
+        start, pop = state["gen"], state["pop"]
+        pareto_front = archive.items = state["front"]
+        parents, lineage = state["parents"], state["lineage"]
+        if weights is not None:
+            weights.load(state["weights"])
+        if screen is not None:
+            screen.load(state["screen"])
 
-    for gen in range(n_gen):                         # Для кожного покоління
+    laps = mark()                                    # Знімок таймерів (приріст — у подію generation)
+    for gen in range(start, n_gen):                  # Для кожного покоління
+        if is_cancelled(cancel):                     # Скасовано між поколіннями
+            break
+        t_gen = time.perf_counter()                  # Початок покоління (для події generation)
+        fid = fidelity_schedule(gen, n_gen, fidelity) if fidelity else 1.0 # Частка рядків train покоління
         evals = []                                   # Список оцінених рішень
-        for layers, neurons in pop:                  # Для кожної архітектури у популяції
-            mae, rmse = evaluate_architecture(X, y, layers, neurons,
-                                              n_splits=cv_splits, max_iter=max_iter)
+        rescored = None                              # Архів і батьки, переоцінені з новою точністю
+        try:
+            if archive.items and archive.items[0]["fidelity"] != fid:
+                rescored = _rescore(X, y, [archive.items, parents], fid, subsample, lr, alpha, n_splits=cv_splits,
+                                    max_iter=max_iter, evaluator=evaluator, cache=cache,
+                                    fingerprint=fp, cancel=cancel)
+            scores, spent = evaluate_population(fold_fn, aggregate_architecture, X, y, pop,
+                                         n_splits=cv_splits, max_iter=max_iter,
+                                         evaluator=evaluator, cache=cache,
+                                         stage="opt/timed" + tag + ("/warm" if warm_start else ""), # Кортеж (MAE, RMSE, час)
+                                         fingerprint=fp, racing=racing, return_budget=True, cancel=cancel,
+                                         parents=lineage, weights=weights,
+                                         fidelity=fid, subsample=subsample)
+        except Cancelled:                            # Покоління не завершено — лишаємо фронт попереднього
+            break
+        if rescored is not None:                     # Старі оцінки іншої точності з новими не порівнюються
+            archive.items, parents = [], rescored[1]
+            archive.update(rescored[0])
+        if screen is not None:                       # Реальні оцінки — навчальні дані сурогату (відсіяні racing — ні)
+            real = [i for i, b in enumerate(spent) if not b["pruned"] and scores[i][0] < 1e8]
+            screen.observe([encode_architecture(pop[i]) for i in real], [scores[i][0] for i in real],
+                           fidelity=fid, fits=sum(b["fits"] for b in spent))
+        for (layers, neurons), (mae, rmse, seconds), b in zip(pop, scores, spent): # Для кожної архітектури у популяції
             evals.append({"mae": mae, "rmse": rmse,  # Зберігаємо результат
-                          "layers": layers, "neurons": neurons})
+                          "params": count_params(X.shape[1], layers, neurons),
+                          "fit_time": seconds,       # Середній час навчання на фолді
+                          "fidelity": fid,           # Частка рядків train, на якій отримано оцінку
+                          "layers": layers, "neurons": neurons,
+                          "budget": b})              # Бюджет навчань цієї особини (fits, iters, pruned)
 
-        # Оновлюємо Парето‑фронт
-        new_front = []
-        for cand in evals:                           # Для кожного кандидата
-            if not any(dominates(other, cand) for other in evals):  # Якщо його ніхто не домінує
-                new_front.append(cand)               # Додаємо у новий фронт
-        pareto_front = new_front                     # Оновлюємо фронт
+        # Оновлюємо архів еліти: відсіяні після першого фолду (без повної оцінки) туди не потрапляють
+        pareto_front = list(archive.update([c for c in evals if not c["budget"]["pruned"]]))
+        in_front = {_genotype(c) for c in pareto_front}
+        for i, cand in enumerate(evals):
+            publish(events, "candidate", gen=gen, index=i, mae=float(cand["mae"]), rmse=float(cand["rmse"]),
+                    genotype={"layers": cand["layers"], "neurons": cand["neurons"]},
+                    budget=cand["budget"], front=_genotype(cand) in in_front)
 
         if progress_cb:                              # Якщо передано callback для прогресу
             for cand in pareto_front:
                 progress_cb(gen, cand["mae"], cand["rmse"], f"{cand['layers']}×{cand['neurons']}")
+        if pareto_front:                             # Подія покоління: найкраще за MAE рішення фронту
+            top = min(pareto_front, key=lambda c: c["mae"])
+            timings, laps = lap(laps)                # Таймери з попередньої події generation
+            publish(events, "generation", gen=gen, gens=n_gen, mae=float(top["mae"]), rmse=float(top["rmse"]),
+                    extra=f"{top['layers']}×{top['neurons']}, Парето‑рішень={len(pareto_front)}",
+                    seconds=time.perf_counter() - t_gen, fits=sum(c["budget"]["fits"] for c in evals),
+                    fidelity=fid,
+                    timings=timings)
+
+        with timer("ga.breed"):                      # Відбір, кросовер і мутації
+            # Відбір NSGA-II: батьки + нащадки → pop_size найкращих за (ранг фронту, −скупченість)
+            pool, seen = [], set()
+            for c in parents + evals:                # Дублікати генотипів не займають місць у відборі
+                if _genotype(c) not in seen:
+                    seen.add(_genotype(c))
+                    pool.append(c)
+            ranks, crowd = rank_and_crowding(archive.matrix(pool))
+            keep = nsga2_order(ranks, crowd)[:pop_size]
+            parents = [pool[i] for i in keep]
+            n_children = screen.n_candidates(pop_size) if screen is not None else pop_size
+            rng = stream(root, BREED, gen)           # Потік покоління (однаковий і після відновлення з точки)
+            winners = tournament(ranks[keep], crowd[keep], 2 * n_children, rng) # Пари батьків бінарним турніром
+            # Кросовер (ген від p1 чи p2) і мутації (ген — нове випадкове значення) усіх нащадків разом
+            from_p1 = rng.random((n_children, 2)) > 0.5
+            mut = rng.random((n_children, 2)) < mutation_rate
+            new_layers = choose(rng, LAYER_CHOICES, n_children)
+            new_neurons = choose(rng, NEURON_CHOICES, n_children)
 
-        # Нова популяція
-        new_pop = [(c["layers"], c["neurons"]) for c in pareto_front]  # Починаємо з Парето-рішень
-        while len(new_pop) < pop_size:               # Поки не заповнили популяцію
-            p1, p2 = random.choice(evals), random.choice(evals)  # Вибираємо двох батьків
-            # Кросовер: випадково беремо параметри від p1 або p2
-            child_layers = p1["layers"] if rng.rand() > 0.5 else p2["layers"]
-            child_neurons = p1["neurons"] if rng.rand() > 0.5 else p2["neurons"]
-            # Мутація: з певною ймовірністю змінюємо параметри
-            if rng.rand() < mutation_rate:
-                child_layers = random.choice(LAYER_CHOICES)
-            if rng.rand() < mutation_rate:
-                child_neurons = random.choice(NEURON_CHOICES)
-            new_pop.append((child_layers, child_neurons))  # Додаємо дитину у нову популяцію
+            # Нова популяція: pop_size нащадків (еліта зберігається у parents і архіві)
+            new_pop, lineage = [], []
+            for i in range(n_children):
+                p1, p2 = parents[winners[2 * i]], parents[winners[2 * i + 1]]
+                child_layers = p1["layers"] if from_p1[i, 0] else p2["layers"]
+                child_neurons = p1["neurons"] if from_p1[i, 1] else p2["neurons"]
+                if mut[i, 0]:
+                    child_layers = new_layers[i]
+                if mut[i, 1]:
+                    child_neurons = new_neurons[i]
+                new_pop.append((child_layers, child_neurons))  # Додаємо дитину у нову популяцію
+                # Батько для теплого старту — той, з ким збігається глибина (ваги переносяться пошарово)
+                source = p1 if p1["layers"] == child_layers else p2
+                lineage.append(None if _genotype(source) == new_pop[-1] else _genotype(source))
+        if screen is not None:                       # Сурогат: на реальне навчання — найперспективніші за EI
+            chosen = screen.select([encode_architecture(c) for c in new_pop], pop_size)
+            new_pop, lineage = [new_pop[i] for i in chosen], [lineage[i] for i in chosen]
+            publish(events, "surrogate", gen=gen, **screen.stats())
+        if migration is not None:                    # Острівна модель: обмін найкращими (порядок NSGA-II) з сусідами
+            for k, ind in enumerate(migration(gen, [_genotype(c) for c in parents])[:len(new_pop)]):
+                new_pop[-1 - k], lineage[-1 - k] = tuple(ind), None
         pop = new_pop                                    # Оновлюємо популяцію
+        if checkpoint:                               # Стан перед наступним поколінням
+            save_checkpoint(checkpoint, config, {"gen": gen + 1, "pop": pop,
+                                                 "evals": evals, "front": pareto_front, "parents": parents,
+                                                 "lineage": lineage,
+                                                 "weights": weights.dump() if weights is not None else None,
+                                                 "screen": screen.dump() if screen is not None else None})
+
+    if pareto_front and pareto_front[0]["fidelity"] < 1 and not is_cancelled(cancel):
+        # Фронт оцінювався на частині рядків — фінальна оцінка на всіх
+        (front,) = _rescore(X, y, [archive.items], 1.0, lr=lr, alpha=alpha, n_splits=cv_splits, max_iter=max_iter,
+                            evaluator=evaluator, cache=cache, fingerprint=fp)
+        archive.items = []
+        pareto_front = list(archive.update(front))
 
+    clear_checkpoint(checkpoint, cancel)             # Завершений запуск не продовжується
     return pareto_front                                  # Повертаємо фінальний Парето-фронт
@@ -0,0 +1,278 @@
+"""
+Генетичний алгоритм для структурного синтезу нейромережі
+прогнозу завантаженості енергосистеми: змінна глибина,
+ширина й активація кожного прихованого шару, штраф за розмір і затримку моделі.
+"""
+
+import time                                         # time — тривалість покоління для подій прогресу
+from functools import partial                        # partial — lr/alpha у функції оцінки фолду
+import numpy as np                                   # numpy для числових обчислень
+from eval_core import fit_fold, aggregate_folds, count_params, ACTIVATIONS, WeightStore # Спільне ядро оцінювання
+from eval_core import DEFAULT_LR, DEFAULT_ALPHA, hyper_tag # lr/alpha навчання (з етапу params у конвеєрі)
+from fitness_cache import dataset_fingerprint      # Відбиток датасету для ключів кешу
+from evaluators import evaluate_population, accumulate_budget # Оцінювання популяції (кеш + паралельні бекенди)
+from surrogate import SurrogateScreen, SURROGATE_FACTOR # Сурогатне відсіювання нащадків (RF/GP + EI)
+from folds import fidelity_schedule                  # Частка рядків train за поколіннями (multi-fidelity)
+from progress import publish                         # Події прогресу (шина progress.ProgressBus)
+from profiling import timer, mark, lap               # Таймери етапів і їхній приріст за покоління
+from run_control import (Cancelled, is_cancelled,    # Скасування і контрольні точки
+                         save_checkpoint, load_checkpoint, clear_checkpoint,
+                         seed_root, seed_id, stream, choose, INIT, BREED) # Потоки випадковості GA від одного seed
+
+# Простір пошуку архітектур
+MAX_DEPTH = 4                                        # Максимальна кількість прихованих шарів
+WIDTH_CHOICES = [8, 16, 32, 64, 128]                 # Можливі ширини шару
+ACTIVATION_CHOICES = list(ACTIVATIONS)               # relu, tanh, logistic — окремо для кожного шару
+
+# Штрафи пристосованості (в одиницях MAE)
+SIZE_PENALTY = 0.001                                 # За кожну 1000 параметрів моделі
+LATENCY_PENALTY = 0.0                                # За мс прогнозу на 1000 рядків (залежить від машини — лише на вимогу)
+DEFAULT_SEED = 7                                     # Фіксований seed етапу (seed=None)
+
+def describe_structure(widths, activations):
+    """Архітектура у компактному вигляді: «64 relu → 32 tanh»."""
+    return " → ".join(f"{w} {a}" for w, a in zip(widths, activations))
+
+def encode_structure(genotype):
+    """
+    Кодування архітектури для сурогату фіксованої довжини: глибина, log розміру моделі
+    і для кожного з MAX_DEPTH шарів — log2 ширини та one-hot активації (відсутні шари — нулі).
+    """
+    widths, activations = genotype
+    code = np.zeros(2 + MAX_DEPTH * (1 + len(ACTIVATION_CHOICES)))
+    code[0], code[1] = len(widths), np.log10(count_params(1, widths))
+    for i, (w, a) in enumerate(zip(widths, activations)):
+        base = 2 + i * (1 + len(ACTIVATION_CHOICES))
+        code[base] = np.log2(w)
+        code[base + 1 + ACTIVATION_CHOICES.index(a)] = 1.0
+    return code
+
+def evaluate_structure_fold(X, y, widths, activations, fold, n_splits=3, max_iter=200, random_state=0,
+                            init=None, return_weights=False, fidelity=1.0, subsample="recent",
+                            lr=DEFAULT_LR, alpha=DEFAULT_ALPHA):
+    """Оцінка архітектури на одному фолді TimeSeriesSplit: метрики eval_core.FOLD_FIELDS."""
+    return fit_fold(X, y, fold, n_splits, hidden=widths, activations=activations,
+                    lr=lr, alpha=alpha,                  # Швидкість навчання і регуляризація
+                    max_iter=max_iter, random_state=random_state,
+                    init=init, return_weights=return_weights, # Теплий старт з ваг батька (якщо передано)
+                    fidelity=fidelity, subsample=subsample)     # Частка рядків train (багатоточнісна оцінка)
+
+def aggregate_structure(scores):
+    """Зводить метрики фолдів у (MAE, RMSE, час навчання, затримка прогнозу)."""
+    return aggregate_folds(scores)
+
+def evaluate_structure(X, y, widths, activations, n_splits=3, max_iter=200, random_state=0):
+    """Оцінка архітектури (ширини й активації шарів) крос-валідацією TimeSeriesSplit."""
+    return aggregate_structure([
+        evaluate_structure_fold(X, y, widths, activations, k, n_splits=n_splits,
+                                max_iter=max_iter, random_state=random_state)
+        for k in range(n_splits)                     # Для кожного розбиття train/val
+    ])
+
+def structure_fitness(mae, params, latency_ms, size_penalty=SIZE_PENALTY, latency_penalty=LATENCY_PENALTY):
+    """Пристосованість (мінімізується): MAE + штраф за розмір + штраф за затримку."""
+    return mae + size_penalty * params / 1000 + latency_penalty * latency_ms
+
+def _random_structures(rng, n):
+    """n випадкових архітектур (ширини, активації): глибини й шари всіх — трьома викликами rng."""
+    depths = rng.integers(1, MAX_DEPTH + 1, size=n)
+    widths = choose(rng, WIDTH_CHOICES, int(depths.sum()))
+    acts = choose(rng, ACTIVATION_CHOICES, int(depths.sum()))
+    ends = np.cumsum(depths)
+    return [(tuple(widths[e - d:e]), tuple(acts[e - d:e])) for d, e in zip(depths, ends)]
+
+def _crossover(p1, p2, rng):
+    """Одноточковий кросовер списків шарів: початок p1 + кінець p2 (глибина може змінитись)."""
+    layers1, layers2 = list(zip(*p1)), list(zip(*p2))
+    a = rng.integers(1, len(layers1) + 1)            # Щонайменше один шар від p1
+    b = rng.integers(0, len(layers2) + 1)
+    return (layers1[:a] + layers2[b:])[:MAX_DEPTH]
+
+def _mutate(layers, mutation_rate, rng):
+    """Мутації: ширина й активація кожного шару, додавання або видалення шару."""
+    layers = [list(layer) for layer in layers]
+    flips = rng.random((len(layers), 2)) < mutation_rate # Які ширини й активації змінюються
+    for layer, (w, a), (flip_w, flip_a) in zip(layers, zip(choose(rng, WIDTH_CHOICES, len(layers)),
+                                                           choose(rng, ACTIVATION_CHOICES, len(layers))), flips):
+        if flip_w:
+            layer[0] = w
+        if flip_a:
+            layer[1] = a
+    if rng.random() < mutation_rate:                 # Зміна глибини
+        if len(layers) < MAX_DEPTH and (len(layers) == 1 or rng.random() < 0.5):
+            layers.insert(rng.integers(0, len(layers) + 1),
+                          [choose(rng, WIDTH_CHOICES, 1)[0], choose(rng, ACTIVATION_CHOICES, 1)[0]])
+        elif len(layers) > 1:
+            del layers[rng.integers(0, len(layers))]
+    return tuple(w for w, _ in layers), tuple(a for _, a in layers)
+
+def ga_network_structure_synthesis(X, y,
+                                   pop_size=8, n_gen=5, mutation_rate=0.2,
+                                   max_iter=200, cv_splits=3,
+                                   progress_cb=None, cache=None, evaluator=None,
+                                   racing=False, events=None,
+                                   cancel=None, checkpoint=None, resume=True,
+                                   size_penalty=SIZE_PENALTY, latency_penalty=LATENCY_PENALTY,
+                                   warm_start=False, surrogate=None, surrogate_factor=SURROGATE_FACTOR,
+                                   fidelity=None, subsample="recent", lr=DEFAULT_LR, alpha=DEFAULT_ALPHA,
+                                   seed=None, migration=None):
+    """
+    Генетичний алгоритм для структурного синтезу архітектури нейромережі.
+    Генотип — (ширини шарів, активації шарів) довжиною від 1 до MAX_DEPTH.
+    Пристосованість — MAE + size_penalty·(параметри/1000) + latency_penalty·(мс на 1000 рядків).
+    cache     – FitnessCache для повторного використання оцінок (None — без кешу)
+    evaluator – бекенд оцінювання з evaluators.make_evaluator (None — послідовно)
+    racing    – відсіювання слабких кандидатів після першого фолду (successive halving);
+                витрачений бюджет повертається у полі "budget"
+    events    – шина подій progress.ProgressBus (або bind(...)): події candidate і generation
+    cancel    – run_control.CancelToken: перевіряється між оцінюваннями; після скасування
+                повертається найкраще рішення останнього повного покоління
+    checkpoint – шлях до контрольної точки (записується після кожного покоління і видаляється,
+                 коли запуск завершився без скасування); n_gen входить у її параметри
+    resume    – продовжити з checkpoint, якщо файл існує (популяція, найкраще)
+    warm_start – нащадок починає з ваг батька тієї ж глибини (нові нейрони — випадкові,
+                 зайві відкидаються) і навчається коротше
+    surrogate – "rf" або "gp": нащадків генерується у surrogate_factor разів більше, а на
+                реальне навчання йдуть найкращі за expected improvement сурогату
+                (кодування — encode_structure); статистика відсіювання і навчань — у полі "surrogate"
+    fidelity  – рівні частки рядків train за поколіннями (наприклад, folds.FIDELITY_LEVELS;
+                None — завжди всі рядки); найкраще рішення наприкінці переоцінюється на всіх рядках.
+                subsample — "recent" (недавнє вікно train) або "stride" (кожен k-й рядок);
+                точність оцінки записується у поле "fidelity"
+    lr, alpha – швидкість навчання і регуляризація кожної моделі (у конвеєрі — найкращі з етапу params)
+    seed      – seed GA: ціле число, np.random.SeedSequence або np.random.Generator
+                (None — фіксований seed етапу); острови islands.py — різні seed.
+                Турніри покоління беруть потік run_control.stream(корінь, BREED, gen),
+                кросовер і мутації k-го нащадка — власний stream(корінь, BREED, gen, k)
+    migration – острівна модель (islands.py): migration(gen, генотипи від найкращого) → іммігранти,
+                які замінюють останніх нащадків нової популяції (еліта лишається)
+    """
+    root = seed_root(seed, DEFAULT_SEED)             # Корінь випадковості запуску (відтворюваність)
+    fp = dataset_fingerprint(X, y) if cache is not None or checkpoint else None # Відбиток датасету (кеш і контрольні точки)
+    n_features = X.shape[1]                          # Кількість ознак (для розміру моделі)
+    fold_fn = partial(evaluate_structure_fold, lr=lr, alpha=alpha) # Оцінка фолду з lr/alpha запуску
+    tag = hyper_tag(lr, alpha)                       # Ключі кешу для нетипових lr/alpha
+
+    # Початкова популяція: випадкові архітектури
+    pop = _random_structures(stream(root, INIT), pop_size)
+
+    parents = [None] * pop_size                      # Батько кожної особини (для теплого старту)
+    weights = WeightStore() if warm_start else None  # Ваги навчених моделей за (особина, фолд)
+    screen = SurrogateScreen(surrogate, surrogate_factor) if surrogate else None # Сурогат (None — без відсіювання)
+    best = None                                      # Найкраще рішення (буде оновлюватись)
+    budget = None                                    # Сумарний бюджет навчань за запуск
+    config = {"stage": "structure", "n_gen": n_gen, "fingerprint": fp, "pop_size": pop_size,
+              "mutation_rate": mutation_rate, "max_iter": max_iter, "cv_splits": cv_splits,
+              "racing": racing, "size_penalty": size_penalty,
+              "latency_penalty": latency_penalty,
+              "warm_start": warm_start, "surrogate": surrogate,
+              "surrogate_factor": surrogate_factor,
+              "fidelity": None if fidelity is None else tuple(fidelity),
+              "subsample": subsample,                # З якими параметрами сумісна контрольна точка
+              **({"lr": lr, "alpha": alpha} if tag else {}), # Нетипові lr/alpha (старі точки лишаються сумісними)
+              "seed": seed_id(root)}
+    start, state = 0, None                           # Перше покоління запуску і відновлений стан
+    if checkpoint and resume:
+        state = load_checkpoint(checkpoint, config)
+    if state is not None:                            # Продовжуємо перерваний запуск з того ж місця
+        start, pop, budget = state["gen"], state["pop"], state["budget"]
+        best, parents = state["best"], state["parents"]
+        if weights is not None:
+            weights.load(state["weights"])
+        if screen is not None:
+            screen.load(state["screen"])
+
+    laps = mark()                                    # Знімок таймерів (приріст — у подію generation)
+    for gen in range(start, n_gen):                  # Для кожного покоління
+        if is_cancelled(cancel):                     # Скасовано між поколіннями
+            break
+        t_gen = time.perf_counter()                  # Початок покоління (для події generation)
+        fid = fidelity_schedule(gen, n_gen, fidelity) if fidelity else 1.0 # Частка рядків train покоління
+        try:
+            scores, spent = evaluate_population(fold_fn, aggregate_structure, X, y, pop,
+                                                n_splits=cv_splits, max_iter=max_iter,
+                                                evaluator=evaluator, cache=cache,
+                                                stage="structure" + tag + ("/warm" if warm_start else ""),
+                                                fingerprint=fp, racing=racing, return_budget=True,
+                                                cancel=cancel, parents=parents, weights=weights,
+                                                fidelity=fid, subsample=subsample)
+        except Cancelled:                            # Покоління не завершено — лишаємо результат попереднього
+            break
+        budget = accumulate_budget(budget, spent)    # Обліковуємо фактично витрачені навчання
+        if screen is not None:                       # Реальні оцінки — навчальні дані сурогату (відсіяні racing — ні)
+            real = [i for i, b in enumerate(spent) if not b["pruned"] and scores[i][0] < 1e8]
+            screen.observe([encode_structure(pop[i]) for i in real], [scores[i][0] for i in real],
+                           fidelity=fid, fits=sum(b["fits"] for b in spent))
+        evals = []                                   # (пристосованість, MAE, RMSE, параметри, затримка, генотип)
+        for i, ((widths, acts), (mae, rmse, _, latency), b) in enumerate(zip(pop, scores, spent)):
+            params = count_params(n_features, widths)
+            fitness = structure_fitness(mae, params, latency, size_penalty, latency_penalty)
+            evals.append((fitness, mae, rmse, params, latency, (widths, acts)))
+            publish(events, "candidate", gen=gen, index=i, mae=float(mae), rmse=float(rmse),
+                    genotype={"widths": list(widths), "activations": list(acts)},
+                    fitness=float(fitness), params=params, budget=b)
+
+        # Сортуємо за пристосованістю (мінімізуємо); порядок популяції — за рівних значень
+        order = sorted(range(len(evals)), key=lambda i: evals[i][0])
+        fitness, mae, rmse, params, latency, (widths, acts) = evals[order[0]]
+        # Найкраще за весь запуск; оцінки іншої точності не порівнюються (еліта вже переоцінена в популяції)
+        if best is None or best["fidelity"] != fid or fitness < best["fitness"]:
+            best = {"mae": mae, "rmse": rmse, "fitness": fitness,
+                    "layers": len(widths), "neurons": list(widths), "activations": list(acts),
+                    "params": params, "latency_ms": latency, "fidelity": fid}
+        best["budget"] = budget                      # Бюджет навчань (fits, iters, pruned, per_candidate)
+        if screen is not None:
+            best["surrogate"] = screen.stats()  # Відсіяні кандидати і фактичні навчання
+
+        extra = describe_structure(best["neurons"], best["activations"])
+        if progress_cb:                              # Якщо передано callback для прогресу
+            progress_cb(gen, best["mae"], best["rmse"], extra)
+        timings, laps = lap(laps)                    # Таймери з попередньої події generation
+        publish(events, "generation", gen=gen, gens=n_gen, mae=float(best["mae"]), rmse=float(best["rmse"]),
+                extra=f"{extra}, параметрів={best['params']}",
+                seconds=time.perf_counter() - t_gen, fits=sum(b["fits"] for b in spent), fidelity=fid,
+                timings=timings)
+
+        with timer("ga.breed"):                      # Відбір, кросовер і мутації
+            # Нова популяція: еліта + нащадки (турнір із двох, кросовер, мутації)
+            new_pop = [evals[order[0]][5]]           # Починаємо з найкращого (елітний відбір)
+            parents = [None]                         # Еліта не перенавчається з власних ваг
+            n_children = screen.n_candidates(pop_size - 1) if screen is not None else pop_size - 1
+            fit = np.array([e[0] for e in evals])
+            t = stream(root, BREED, gen).integers(len(evals), size=(4, n_children)) # Турніри всіх нащадків
+            w1 = np.where(fit[t[0]] <= fit[t[2]], t[0], t[2]) # Переможці турнірів (за рівних — перший)
+            w2 = np.where(fit[t[1]] <= fit[t[3]], t[1], t[3])
+            for k, (i1, i2) in enumerate(zip(w1, w2)): # Пул кандидатів сурогату — так само
+                p1, p2 = evals[i1][5], evals[i2][5]
+                rng = stream(root, BREED, gen, k)    # Власний потік нащадка: глибина не зсуває інших
+                new_pop.append(_mutate(_crossover(p1, p2, rng), mutation_rate, rng))
+                # Батько для теплого старту — той, з ким збігається глибина (ваги переносяться пошарово)
+                source = p1 if len(p1[0]) == len(new_pop[-1][0]) else p2
+                parents.append(None if source == new_pop[-1] else source)
+        if screen is not None:                       # Сурогат: на реальне навчання — найперспективніші за EI
+            keep = [0] + [1 + i for i in screen.select([encode_structure(c) for c in new_pop[1:]], pop_size - 1)]
+            new_pop, parents = [new_pop[i] for i in keep], [parents[i] for i in keep]
+            publish(events, "surrogate", gen=gen, **screen.stats())
+        if migration is not None:                    # Острівна модель: обмін найкращими з сусідніми островами
+            for k, ind in enumerate(migration(gen, [evals[i][5] for i in order])[:len(new_pop) - 1]):
+                new_pop[-1 - k], parents[-1 - k] = (tuple(ind[0]), tuple(ind[1])), None
+        pop = new_pop                                # Оновлюємо популяцію
+        if checkpoint:                               # Стан перед наступним поколінням
+            save_checkpoint(checkpoint, config, {"gen": gen + 1, "pop": pop,
+                                                 "evals": evals, "best": best, "budget": budget,
+                                                 "parents": parents,
+                                                 "weights": weights.dump() if weights is not None else None,
+                                                 "screen": screen.dump() if screen is not None else None})
+
+    if best is not None and best["fidelity"] < 1 and not is_cancelled(cancel):
+        # Еліта оцінювалась на частині рядків — фінальна оцінка на всіх (з іншими точностями не порівнюється)
+        ((mae, rmse, _, latency),), spent = evaluate_population(
+            fold_fn, aggregate_structure, X, y,
+            [(tuple(best["neurons"]), tuple(best["activations"]))], n_splits=cv_splits, max_iter=max_iter,
+            evaluator=evaluator, cache=cache, stage="structure" + tag, fingerprint=fp, return_budget=True)
+        best.update(mae=mae, rmse=rmse, latency_ms=latency, fidelity=1.0,
+                    fitness=structure_fitness(mae, best["params"], latency, size_penalty, latency_penalty),
+                    budget=accumulate_budget(budget, spent))
+
+    clear_checkpoint(checkpoint, cancel)             # Завершений запуск не продовжується
+    return best                                      # Повертаємо найкраще знайдене рішення
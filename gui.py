@@ -4,8 +4,10 @@ from static.constants import APP_NAME, VERSION, BG_COLOR, FONT_MAIN  # Конс
 from static.mappings import DATASET_NAMES     # Мапінг назв датасетів (ключі для комбобоксу)
 from gui_handlers import (                    # Імпортуємо функції обробників GUI
     run_algorithm, run_all_modes, log, MODE_NAMES,
-    save_table_to_csv, clear_log_and_table, set_running
+    save_table_to_csv, clear_log_and_table, set_running, start_event_pump,
+    cancel_running, run_sweep
 )
+from static.mappings import DATASET_PATHS     # Усі енергосистеми (для серії)
 
 # --- Головне вікно ---
 root = tk.Tk()                                 # Створюємо головне вікно додатка
@@ -80,6 +82,13 @@ root.btn_run_all = ttk.Button(                                          # Кно
 )
 root.btn_run_all.grid(row=0, column=1, padx=5)
 
+root.btn_sweep = ttk.Button(                                            # Кнопка паралельної серії по всіх енергосистемах
+    frame_buttons, text="🔀 Усі енергосистеми",
+    command=lambda: run_sweep(root, output, sorted(DATASET_PATHS), gen_var),
+    width=btn_width
+)
+root.btn_sweep.grid(row=1, column=1, padx=5, pady=(5, 0))
+
 root.btn_save_csv = ttk.Button(                                         # Кнопка збереження таблиці у CSV
     frame_buttons, text="💾 Зберегти таблицю",
     command=lambda: save_table_to_csv(root, "results/summary.csv"),
@@ -94,6 +103,13 @@ root.btn_clear = ttk.Button(                                            # Кно
 )
 root.btn_clear.grid(row=0, column=3, padx=5)
 
+root.btn_stop = ttk.Button(                                             # Кнопка зупинки поточного етапу
+    frame_buttons, text="⏹ Зупинити",
+    command=lambda: cancel_running(root),
+    width=btn_width
+)
+root.btn_stop.grid(row=0, column=4, padx=5)
+
 # --- Основні фрейми ---
 frame_left = ttk.Frame(root, padding=10)                                # Лівий контейнер (лог + таблиця)
 frame_left.grid(row=2, column=0, sticky="n")                            # Розміщення з прилипанням до верхньої сторони
@@ -138,6 +154,7 @@ scroll_x.grid(row=2, column=0, sticky="ew")                             # Роз
 
 # Робимо таблицю доступною у gui_handlers
 root.results_table = results_table                                      # Зберігаємо посилання у root, щоб обробники могли вставляти рядки
+start_event_pump(root)                                                  # Лог і таблиця оновлюються пакетами з шини подій
 
 # --- Стартове повідомлення ---
 log(root, output,                                                       # Початковий лог, який пояснює користувачу порядок дій
@@ -146,4 +163,10 @@ log(root, output,                                                       # Поч
 )
 set_running(root, False)                                                # Встановлюємо стан "Готово" (кнопки активні)
 
+def on_close():
+    """Закриття вікна: зупиняємо етап (завершені покоління вже у контрольній точці) і виходимо."""
+    cancel_running(root)
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)                             # Обробник закриття вікна
 root.mainloop()                                                         # Запускаємо головний цикл Tkinter (обробка подій, відображення GUI)
@@ -1,51 +1,47 @@
 import tkinter as tk          # Імпортуємо бібліотеку Tkinter для створення GUI, скорочуємо ім'я до tk
 import threading              # Імпортуємо модуль для роботи з потоками (щоб GUI не зависав під час обчислень)
-import csv                    # Модуль для роботи з CSV-файлами (збереження результатів у таблицю)
-import os                     # Модуль для роботи з файловою системою (створення папок, шляхи)
-from datasets import load_dataset          # Імпортуємо функцію load_dataset з твого модуля datasets.py
+import os                     # Модуль для роботи з файловою системою (шляхи контрольних точок)
+import time                   # Загальний час етапу (для частки таймерів)
+import functools              # partial — параметри задачі серії для воркера
+from datasets import load_dataset, dataset_info # Імпортуємо функцію load_dataset з твого модуля datasets.py (dataset_info — розмір для планувальника)
 from static.mode_config import MODE_CONFIG # Імпортуємо словник MODE_CONFIG з static/mode_config.py (налаштування режимів)
+from static.constants import FITNESS_CACHE_DIR, FITNESS_CACHE_SIZE # Налаштування кешу пристосованості
+from static.constants import EVAL_BACKEND, EVAL_JOBS, EVAL_RACING, EVAL_TRAINER, EVAL_WARM_START # Налаштування бекенду оцінювання
+from static.constants import EVAL_SURROGATE, EVAL_FIDELITY, EVAL_SUBSAMPLE # Сурогат і багатоточнісна оцінка
+from fitness_cache import FitnessCache     # LRU-кеш оцінок GA з дисковим рівнем
+from evaluators import make_evaluator      # Бекенди оцінювання популяції (послідовний / пул процесів)
+from results import MODE_NAMES, result_rows, write_summary_csv # Таблиця результатів без Tkinter
+from progress import ProgressBus           # Потокобезпечна шина подій прогресу
+from static.constants import GUI_PUMP_INTERVAL_MS, GUI_PUMP_BATCH # Частота і розмір пакетів оновлення GUI
+from static.constants import CHECKPOINT_DIR # Папка контрольних точок GA
+from run_control import CancelToken, CheckpointMismatch # Кооперативне скасування, точка іншого запуску
+import profiling                           # Таймери етапів і профілювання запуску
+from static.constants import PROFILE_TIMERS, PROFILE_RUN, PROFILE_DIR # Налаштування інструментування
+from static.constants import SWEEP_CORES, SWEEP_CORES_PER_JOB, SWEEP_SEEDS # Паралельна серія запусків
+import scheduler                           # Планувальник матриці датасет × етап × seed
+from static.constants import PIPELINE      # Конвеєр етапів (маска ознак і lr/alpha — вхід наступних)
+from pipeline import Pipeline, PIPELINE_DEPENDS, pipeline_tag # Стан конвеєра і залежності етапів
+from static.constants import MODEL_REGISTER # Збереження найкращих моделей у реєстр
+from static.constants import DERIVED_FEATURES # Похідні ознаки (лаги, ковзні вікна, циклічні кодування)
+from registry import REGISTRY              # Реєстр моделей прогнозу (перенавчання на всьому ряді)
 
-# Словник з "людяними" назвами етапів для відображення у GUI
-MODE_NAMES = {
-    "features": "Відбір ознак",             # Технічний ключ "features" → показуємо користувачу "Відбір ознак"
-    "params": "Параметричний синтез",       # "params" → "Параметричний синтез"
-    "structure": "Структурний синтез",      # "structure" → "Структурний синтез"
-    "opt": "Оптимізація структури"          # "opt" → "Оптимізація структури"
-}
+# Спільний кеш пристосованості: етапи і повторні запуски не перенавчають уже оцінені моделі
+FITNESS_CACHE = FitnessCache(maxsize=FITNESS_CACHE_SIZE, cache_dir=FITNESS_CACHE_DIR)
+# Спільний оцінювач популяції (пул процесів живе між етапами)
+EVALUATOR = make_evaluator(EVAL_BACKEND, EVAL_JOBS)
+# Шина подій: фонові потоки публікують, GUI забирає пакетами за таймером (start_event_pump)
+EVENTS = ProgressBus()
 
 def log(root, output, msg, tag=None):
     """
     Додає повідомлення у логове вікно GUI з потокобезпечним оновленням.
     root  – головне вікно Tkinter
-    output – віджет Text, куди пишемо повідомлення
+    output – віджет Text, куди пишемо повідомлення (root.output)
     msg   – текст повідомлення
     tag   – тег для стилю (наприклад, колір)
+    Повідомлення публікується у шину подій і з'являється при наступному такті start_event_pump.
     """
-    # root.after(0, ...) – виконує дію у головному потоці GUI (через 0 мс), щоб уникнути проблем з потоками
-    # lambda: (...) – анонімна функція, яка виконує одразу кілька дій
-    root.after(0, lambda: (
-        output.insert(tk.END, msg + "\n", tag),  # вставляємо повідомлення у кінець текстового поля
-        output.see(tk.END)                       # прокручуємо лог донизу, щоб було видно останній рядок
-    ))
-
-def format_result_compact(mode, result):
-    """
-    Форматує результат у компактний вигляд для таблиці.
-    mode   – який етап (features, params, structure, opt)
-    result – словник або список з результатами
-    """
-    if isinstance(result, dict):  # Якщо результат – словник
-        if mode == "features":    # Для відбору ознак
-            return f"Ознаки: {', '.join(result.get('features', []))}"
-        elif mode == "params":    # Для параметричного синтезу
-            return f"h={result.get('hidden')}, lr={result.get('lr')}, α={result.get('alpha')}"
-        elif mode == "structure": # Для структурного синтезу
-            return f"{result.get('layers')}×{result.get('neurons')}"
-        else:
-            return ""             # Якщо інший словник – повертаємо порожній рядок
-    elif isinstance(result, list) and mode == "opt":  # Якщо результат – список і режим "opt"
-        return f"Парето‑рішень={len(result)}"         # Показуємо кількість Парето-рішень
-    return ""  # Якщо нічого не підійшло – повертаємо порожній рядок
+    EVENTS.publish("log", msg=msg, tag=tag)
 
 def set_running(root, is_running=True):
     """
@@ -58,61 +54,97 @@ def set_running(root, is_running=True):
             root.btn_run_one.config(state=("disabled" if is_running else "normal"))
         if hasattr(root, "btn_run_all"):   # Якщо є кнопка "Запустити всі етапи"
             root.btn_run_all.config(state=("disabled" if is_running else "normal"))
+        if hasattr(root, "btn_sweep"):     # Якщо є кнопка "Усі енергосистеми"
+            root.btn_sweep.config(state=("disabled" if is_running else "normal"))
         if hasattr(root, "btn_save_csv"):  # Якщо є кнопка "Зберегти таблицю"
             root.btn_save_csv.config(state=("disabled" if is_running else "normal"))
         if hasattr(root, "btn_clear"):     # Якщо є кнопка "Очистити"
             root.btn_clear.config(state=("disabled" if is_running else "normal"))
+        if hasattr(root, "btn_stop"):      # Кнопка "Зупинити" активна лише під час виконання
+            root.btn_stop.config(state=("normal" if is_running else "disabled"))
         if hasattr(root, "status_var"):    # Якщо є змінна статусу
             root.status_var.set("Виконується…" if is_running else "Готово")  # Показуємо стан
     root.after(0, _apply)  # Виконуємо у головному потоці GUI
 
 def insert_table_row(root, dataset, mode_desc, mae, rmse, extra):
-    """Додає рядок у таблицю та оновлює підсвічування найкращого MAE."""
-    def _ins():
-        # Додаємо новий рядок у таблицю (Treeview)
-        item_id = root.results_table.insert(
-            "", "end",  # "" означає корінь, "end" — вставити в кінець
-            values=(dataset, mode_desc, f"{mae:.3f}", f"{rmse:.3f}", extra)  # значення колонок
-        )
-        # Підсвічуємо найкращий MAE (мінімальний)
-        try:
-            # Отримуємо всі рядки таблиці
-            items = root.results_table.get_children()
-            # Створюємо список кортежів (id рядка, значення MAE)
-            maes = [(iid, float(root.results_table.set(iid, "mae"))) for iid in items]
-            if maes:
-                # Знаходимо рядок з мінімальним MAE
-                best_id = min(maes, key=lambda x: x[1])[0]
-                # Скидаємо стиль у всіх рядків
-                for iid in items:
-                    root.results_table.item(iid, tags=())
-                # Призначаємо тег "best" найкращому рядку
-                root.results_table.item(best_id, tags=("best",))
-                # Налаштовуємо стиль для тегу "best" (світло-зелений фон)
-                root.results_table.tag_configure("best", background="#e6ffea")
-        except Exception:
-            pass
-    # Виконуємо вставку у головному потоці Tkinter
-    root.after(0, _ins)
+    """Публікує рядок таблиці; GUI вставить його при наступному такті drain_events."""
+    EVENTS.publish("row", dataset=dataset, desc=mode_desc, mae=float(mae), rmse=float(rmse), extra=extra)
+
+def _insert_row(root, ev):
+    """Вставляє рядок у таблицю (головний потік) і оновлює підсвічування найкращого MAE інкрементно."""
+    # Додаємо новий рядок у таблицю (Treeview)
+    item_id = root.results_table.insert(
+        "", "end",  # "" означає корінь, "end" — вставити в кінець
+        values=(ev["dataset"], ev["desc"], f"{ev['mae']:.3f}", f"{ev['rmse']:.3f}", ev["extra"])  # значення колонок
+    )
+    best = getattr(root, "best_row", None)   # (MAE, id рядка) поточного найкращого
+    if best is None or ev["mae"] < best[0]:  # Порівнюємо лише з попереднім найкращим — без перегляду всієї таблиці
+        if best is not None and root.results_table.exists(best[1]):
+            root.results_table.item(best[1], tags=())   # Знімаємо підсвічування зі старого
+        root.results_table.item(item_id, tags=("best",)) # Призначаємо тег "best" новому найкращому рядку
+        root.best_row = (ev["mae"], item_id)
 
+def _format_event(ev):
+    """Подія шини → (текст, тег) для логу або None, якщо подія не показується."""
+    if ev["kind"] == "log":
+        return ev["msg"], ev.get("tag") or ""
+    if ev["kind"] == "generation":           # Прогрес у людяному форматі
+        return (f"Покоління {ev['gen'] + 1} з {ev['gens']}: середня похибка = {ev['mae']:.3f}, "
+                f"квадратична похибка = {ev['rmse']:.3f}. {ev['extra']}"
+                + (f" (на {ev['fidelity']:.0%} рядків)" if ev.get("fidelity", 1) < 1 else "")), "info"
+    if ev["kind"] == "surrogate":            # Скільки нащадків сурогат не допустив до навчання
+        return (f"🔮 Сурогат ({ev['model']}): відсіяно {ev['skipped']} з {ev['screened']} нащадків, "
+                f"навчань виконано {ev['fits']}"), "info"
+    return None                              # candidate та інші — лише для підписників шини
+
+def drain_events(root, max_items=None):
+    """
+    Забирає події з шини пакетом і застосовує їх у головному потоці:
+    усі рядки логу вставляються одним викликом Text.insert, рядки таблиці — по одному.
+    """
+    events = EVENTS.drain(max_items)
+    if not events:
+        return 0
+    with profiling.timer("gui.log"):
+        _apply_events(root, events)
+    return len(events)
+
+def _apply_events(root, events):
+    """Застосовує пакет подій: рядки таблиці і лог одним викликом insert."""
+    chunks = []                              # Пари (текст, тег) для одного виклику insert
+    for ev in events:
+        if ev["kind"] == "row":
+            _insert_row(root, ev)
+            continue
+        line = _format_event(ev)
+        if line is not None:
+            chunks += [line[0] + "\n", line[1]]
+    if chunks:
+        root.output.insert(tk.END, *chunks)  # вставляємо повідомлення у кінець текстового поля
+        root.output.see(tk.END)              # прокручуємо лог донизу, щоб було видно останній рядок
+
+def start_event_pump(root, interval_ms=GUI_PUMP_INTERVAL_MS, batch=GUI_PUMP_BATCH):
+    """
+    Запускає таймер GUI, що кожні interval_ms мс забирає до batch подій з шини.
+    Скільки б подій не публікували GA, головний потік виконує обмежену роботу за такт.
+    """
+    root.results_table.tag_configure("best", background="#e6ffea") # Стиль для тегу "best" (світло-зелений фон)
+    def _tick():
+        drain_events(root, batch)
+        root.after(interval_ms, _tick)
+    root.after(interval_ms, _tick)
 
 def save_table_to_csv(root, path="results/summary.csv"):
     """Зберігає поточну таблицю результатів у CSV."""
     def _save():
-        # Створюємо папку results, якщо її ще немає
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        # Заголовки колонок
-        cols = ("Енергосистема", "Етап аналізу", "MAE", "RMSE", "Додатково")
+        drain_events(root)                     # Спершу вставляємо рядки, що ще в черзі
         rows = []
         # Проходимо по всіх рядках таблиці
         for iid in root.results_table.get_children():
             vals = root.results_table.item(iid, "values")  # отримуємо значення рядка
             rows.append(vals)
-        # Записуємо у CSV-файл
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(cols)   # записуємо заголовки
-            writer.writerows(rows)  # записуємо всі рядки
+        # Записуємо у CSV-файл (заголовки і формат — з results.py)
+        write_summary_csv(rows, path)
         # Лог повідомлення про успішне збереження
         log(root, root.output, f"💾 Результати збережено у {path}", "ok")
     # Виконуємо у головному потоці Tkinter
@@ -122,6 +154,8 @@ def save_table_to_csv(root, path="results/summary.csv"):
 def clear_log_and_table(root):
     """Очищає лог і таблицю."""
     def _clear():
+        EVENTS.drain()                         # Відкидаємо події, що ще не показані
+        root.best_row = None                   # Найкращого рядка більше немає
         # Очищаємо текстове поле логів
         root.output.delete("1.0", tk.END)
         # Видаляємо всі рядки з таблиці
@@ -135,10 +169,11 @@ def clear_log_and_table(root):
     # Виконуємо у головному потоці Tkinter
     root.after(0, _clear)
 
-def run_algorithm(root, output, dataset_var, mode_var, gen_var, on_finish=None):
+def run_algorithm(root, output, dataset_var, mode_var, gen_var, on_finish=None, pipe=None):
     """
     Запуск одного етапу аналізу для вибраної енергосистеми.
     Після завершення викликає on_finish (для послідовного запуску).
+    pipe – pipeline.Pipeline: вхід етапу — результати попередніх, результат записується для наступних
     """
     dataset = dataset_var.get()   # Отримуємо назву вибраного датасету (наприклад, "s1", "s2")
     mode = mode_var.get()         # Отримуємо вибраний режим (features, params, structure, opt)
@@ -163,13 +198,17 @@ def run_algorithm(root, output, dataset_var, mode_var, gen_var, on_finish=None):
 
     desc = MODE_NAMES.get(mode, mode)   # Людяна назва етапу (наприклад, "Відбір ознак")
     func = MODE_CONFIG[mode]["func"]    # Функція, яка відповідає цьому етапу
-
     set_running(root, True)             # Блокуємо кнопки під час виконання
     log(root, output, f"⚡ Запуск етапу «{desc}» для енергосистеми {dataset}…", "info")
+    token = CancelToken()               # Токен скасування цього запуску (кнопка «Зупинити», закриття вікна)
+    root.cancel_token = token
 
     def task():
+        t_start = time.perf_counter()
+        if PROFILE_TIMERS:             # Лічильники — з нуля для кожного етапу
+            profiling.enable()
         try:
-            X, y, cols = load_dataset(dataset)  # Завантажуємо дані (X – ознаки, y – ціль, cols – назви ознак)
+            X, y, cols = load_dataset(dataset, derived=DERIVED_FEATURES)  # Завантажуємо дані (X – ознаки, y – ціль, cols – назви ознак)
         except Exception as e:
             log(root, output, f"❌ Помилка завантаження даних: {e}", "error")
             set_running(root, False)
@@ -177,35 +216,68 @@ def run_algorithm(root, output, dataset_var, mode_var, gen_var, on_finish=None):
                 root.after(0, on_finish)
             return
 
-        # Прогрес у людяному форматі
-        make_progress = lambda g, mae, rmse, extra: log(
-            root, output,
-            f"Покоління {g+1} з {gens}: середня похибка = {mae:.3f}, квадратична похибка = {rmse:.3f}. {extra}",
-            "info"
-        )
+        X, cols, extra, inputs = pipe.inputs(mode, X, cols) if pipe is not None else (X, cols, {}, {})
+        if inputs:                     # Конвеєр: ознаки і lr/alpha з попередніх етапів
+            log(root, output, f"🔗 Вхід з попередніх етапів: ознак {len(inputs['features']) if 'features' in inputs else 'усі'}"
+                              + (f", lr={inputs['lr']:g}, α={inputs['alpha']:g}" if "lr" in inputs else ""), "info")
+        checkpoint = os.path.join(CHECKPOINT_DIR, f"{dataset}_{mode}{pipeline_tag(inputs)}.pkl") # Контрольна точка етапу
+        if os.path.exists(checkpoint):
+            log(root, output, f"↻ Продовження з контрольної точки {checkpoint}", "info")
+
+        # Прогрес публікується у шину (події generation/candidate з контекстом запуску)
+        events = EVENTS.bind(dataset=dataset, mode=mode)
 
         # Виклик функції GA залежно від етапу
-        try:
+        def call(resume):
             if mode == "features":   # Якщо режим "Відбір ознак"
-                result = func(
+                return func(
                     X, y, cols,      # Передаємо дані та список ознак
                     pop_size=8,      # Розмір популяції
                     n_gen=gens,      # Кількість поколінь
                     mutation_rate=0.2, # Ймовірність мутації
                     max_iter=100,    # Максимальна кількість ітерацій
                     cv_splits=3,     # Кількість фолдів для крос-валідації
-                    progress_cb=make_progress # Callback для логування прогресу
+                    events=events,   # Шина подій прогресу
+                    cache=FITNESS_CACHE, # Спільний кеш пристосованості
+                    evaluator=EVALUATOR, # Бекенд оцінювання популяції
+                    racing=EVAL_RACING,  # Відсіювання слабких кандидатів після першого фолду
+                    trainer=EVAL_TRAINER, # sklearn або пакетне навчання популяції
+                    warm_start=EVAL_WARM_START, # Нащадки стартують з ваг батьків
+                    surrogate=EVAL_SURROGATE,   # Сурогат відсіює нащадків до навчання
+                    fidelity=EVAL_FIDELITY,     # Ранні покоління — на частині рядків train
+                    subsample=EVAL_SUBSAMPLE,
+                    cancel=token,        # Скасування між оцінюваннями
+                    checkpoint=checkpoint, # Стан після кожного покоління
+                    resume=resume        # False — почати заново
                 )
             else:                    # Для інших режимів (params, structure, opt)
-                result = func(
+                return func(
                     X, y,            # Передаємо дані
                     pop_size=8 if mode != "opt" else 10, # Для opt трохи більша популяція
                     n_gen=gens,
                     mutation_rate=0.2,
                     max_iter=100,
                     cv_splits=3,
-                    progress_cb=make_progress
+                    events=events,
+                    cache=FITNESS_CACHE,
+                    evaluator=EVALUATOR,
+                    racing=EVAL_RACING,
+                    warm_start=EVAL_WARM_START,
+                    surrogate=EVAL_SURROGATE,
+                    fidelity=EVAL_FIDELITY,
+                    subsample=EVAL_SUBSAMPLE,
+                    cancel=token,
+                    checkpoint=checkpoint,
+                    resume=resume,
+                    **({"trainer": EVAL_TRAINER} if mode == "params" else {}), # Пакетний тренер є лише для params
+                    **extra          # lr/alpha з етапу params (конвеєр)
                 )
+        try:
+            try:
+                result = call(True)
+            except CheckpointMismatch as e: # Параметри етапу змінились — стару точку не продовжуємо
+                log(root, output, f"⚠️ {str(e).lstrip('❌ ')} — етап запускається заново", "warn")
+                result = call(False)
         except Exception as e:
             log(root, output, f"❌ Помилка виконання етапу «{desc}»: {e}", "error")
             set_running(root, False)
@@ -213,35 +285,81 @@ def run_algorithm(root, output, dataset_var, mode_var, gen_var, on_finish=None):
                 root.after(0, on_finish)
             return
 
+        if token.cancelled:            # Зупинено користувачем: результат неповний, наступні етапи не запускаємо
+            log(root, output, f"⏹ Етап «{desc}» зупинено. Завершені покоління збережено у {checkpoint}; "
+                              f"наступний запуск продовжить з них", "warn")
+            set_running(root, False)
+            return
+
+        if pipe is not None:           # Результат — вхід наступних етапів конвеєра
+            pipe.record(mode, result)
+        if MODEL_REGISTER and result:  # Найкраща модель (фронт opt) — у реєстр для прогнозу без GA
+            try:
+                saved = REGISTRY.register(dataset, mode, result, X, y, cols, max_iter=100, **extra)
+                log(root, output, "📦 У реєстрі: " + ", ".join(f"{n} v{v}" for n, v in saved), "info")
+            except Exception as e:
+                log(root, output, f"⚠️ Модель не збережено у реєстр: {e}", "warn")
+
+        stats = FITNESS_CACHE.stats()  # Статистика кешу (накопичувальна за сесію)
+        log(root, output, f"🗃 Кеш оцінок: влучань {stats['hits'] + stats['disk_hits']} "
+                          f"(з диска {stats['disk_hits']}), промахів {stats['misses']}, "
+                          f"частка {stats['hit_rate']:.0%}", "info")
+
         # Підсумок + вставка в таблицю
         if isinstance(result, dict):   # Якщо результат – словник (одне найкраще рішення)
-            mae = float(result.get("mae", 0.0))   # Дістаємо MAE
-            rmse = float(result.get("rmse", 0.0)) # Дістаємо RMSE
-            extra = format_result_compact(mode, result) # Форматуємо додаткову інформацію
+            (_, _, mae, rmse, extra), = result_rows(dataset, mode, result) # MAE, RMSE і додаткова інформація
             log(root, output, f"✅ Етап «{desc}» завершено. Найкраща модель: MAE={mae:.3f}, RMSE={rmse:.3f}", "ok")
+            budget = result.get("budget")
+            if budget:                 # Фактично витрачений бюджет навчань
+                log(root, output, f"⏱ Бюджет: навчань {budget['fits']}, ітерацій {budget['iters']}, "
+                                  f"відсіяно {budget['pruned']}", "info")
             insert_table_row(root, dataset, desc, mae, rmse, extra) # Додаємо рядок у таблицю
 
         elif isinstance(result, list) and mode == "opt": # Якщо результат – список (Парето-рішення)
             log(root, output, f"✅ Етап «{desc}» завершено. Знайдено Парето‑рішень: {len(result)}", "ok")
             # Додаємо всі Парето‑рішення окремими рядками
-            for p in result:
-                mae = float(p.get("mae", 0.0))
-                rmse = float(p.get("rmse", 0.0))
-                extra = f"{p.get('layers')}×{p.get('neurons')}"
+            for _, _, mae, rmse, extra in result_rows(dataset, mode, result):
                 insert_table_row(root, dataset, desc, mae, rmse, extra)
         else:
             log(root, output, f"ℹ️ Етап «{desc}» повернув нетиповий результат", "warn")
 
+        if PROFILE_TIMERS:             # Де минув час етапу: таблиця в лог і JSON
+            timings = profiling.stats()
+            path = profiling.write_json(timings, os.path.join(PROFILE_DIR, f"{dataset}_{mode}_timings.json"))
+            log(root, output, "⏱ Таймери етапу:\n" + profiling.format_table(timings, time.perf_counter() - t_start)
+                              + f"\n(збережено у {path})", "info")
+
         set_running(root, False)       # Розблоковуємо кнопки
         if on_finish:                  # Якщо передано callback
             root.after(0, on_finish)   # Викликаємо його у головному потоці
 
-    threading.Thread(target=task, daemon=True).start() # Запускаємо task у окремому потоці
+    def profiled_task():
+        """task під профайлером PROFILE_RUN (профіль потоку етапу)."""
+        ext = "prof" if PROFILE_RUN == "cprofile" else "html"
+        with profiling.profile_run(os.path.join(PROFILE_DIR, f"{dataset}_{mode}.{ext}"), PROFILE_RUN):
+            task()
+
+    threading.Thread(target=profiled_task if PROFILE_RUN else task, daemon=True).start() # Запускаємо task у окремому потоці
+
 
+def cancel_running(root):
+    """Просить поточний етап зупинитись (після поточного оцінювання)."""
+    token = getattr(root, "cancel_token", None)
+    if token is not None and not token.cancelled:
+        token.cancel()
+        log(root, root.output, "⏹ Зупинка після поточного оцінювання…", "warn")
 
 def run_all_modes(root, output, dataset_var, gen_var):
-    """Запускає всі етапи послідовно: Відбір ознак → Параметри → Структура → Оптимізація."""
+    """
+    Запускає всі етапи: Відбір ознак → Параметри → Структура → Оптимізація.
+    Якщо задано SWEEP_CORES — паралельною серією (run_sweep), інакше послідовно.
+    З PIPELINE етапи утворюють конвеєр: маска ознак і lr/alpha передаються наступним.
+    """
     modes = list(MODE_CONFIG.keys())   # Отримуємо список усіх режимів
+    if SWEEP_CORES:
+        run_sweep(root, output, [dataset_var.get()], gen_var, modes)
+        return
+    pipe = Pipeline() if PIPELINE else None # Спільний стан конвеєра етапів
 
     def run_next(i=0):
         if i >= len(modes):            # Якщо всі етапи пройдені
@@ -256,8 +374,99 @@ def run_all_modes(root, output, dataset_var, gen_var):
         run_algorithm(
             root, output, dataset_var,
             tk.StringVar(value=mode), gen_var,
-            on_finish=lambda: run_next(i+1)
+            on_finish=lambda: run_next(i+1),
+            pipe=pipe
         )
 
     run_next()  # Стартуємо з першого етапу
 
+def _sweep_job(job, upstream, cancel, progress, gens):
+    """Задача серії у воркері планувальника: етап job.mode для (job.dataset, job.seed)."""
+    X, y, cols = load_dataset(job.dataset, derived=DERIVED_FEATURES)
+    X, cols, extra, inputs = Pipeline(upstream).inputs(job.mode, X, cols) # upstream — лише з PIPELINE
+    checkpoint = os.path.join(CHECKPOINT_DIR, f"{job.dataset}_{job.mode}"
+                              + (f"_seed{job.seed}" if job.seed is not None else "") + pipeline_tag(inputs) + ".pkl")
+    kwargs = dict(pop_size=8 if job.mode != "opt" else 10, n_gen=gens, mutation_rate=0.2,
+                  max_iter=100, cv_splits=3, progress_cb=progress,
+                  cache=FITNESS_CACHE,  # Кеш воркера: пам'ять — своя, дисковий рівень — спільний
+                  racing=EVAL_RACING, warm_start=EVAL_WARM_START, surrogate=EVAL_SURROGATE,
+                  fidelity=EVAL_FIDELITY, subsample=EVAL_SUBSAMPLE, cancel=cancel, checkpoint=checkpoint,
+                  seed=job.seed)
+    if job.mode in ("features", "params"):
+        kwargs["trainer"] = EVAL_TRAINER
+    kwargs.update(extra)               # lr/alpha з етапу params (конвеєр)
+    func = MODE_CONFIG[job.mode]["func"]
+    backend = (EVAL_BACKEND if EVAL_BACKEND != "serial" else "process") if job.cores > 1 else "serial"
+    with make_evaluator(backend, job.cores) as evaluator:
+        kwargs["evaluator"] = evaluator
+        call = (lambda **kw: func(X, y, cols, **kw)) if job.mode == "features" else (lambda **kw: func(X, y, **kw))
+        try:
+            result = call(**kwargs)
+        except CheckpointMismatch:     # Параметри етапу змінились — задача починається заново
+            result = call(**dict(kwargs, resume=False))
+    if MODEL_REGISTER and result and not cancel.cancelled:
+        REGISTRY.register(job.dataset, job.mode, result, X, y, cols, max_iter=100, **extra)
+    return result
+
+def run_sweep(root, output, datasets, gen_var, modes=None):
+    """
+    Паралельна серія: етапи modes (за замовчуванням усі) × datasets × SWEEP_SEEDS
+    у пулі процесів планувальника з бюджетом SWEEP_CORES ядер.
+    Рядки таблиці з'являються по мірі завершення задач; найдорожчі задачі стартують першими.
+    """
+    modes = modes or list(MODE_CONFIG.keys())
+    try:
+        gens = int(gen_var.get())
+        if gens <= 0:
+            raise ValueError("Кількість поколінь має бути > 0")
+    except Exception:
+        log(root, output, "⚠️ Некоректна кількість поколінь. Введіть додатнє ціле число.", "warn")
+        return
+
+    set_running(root, True)
+    token = CancelToken()
+    root.cancel_token = token
+    seeds = list(SWEEP_SEEDS) or [None]
+    log(root, output, f"⏩ Серія: енергосистем {len(datasets)} × етапів {len(modes)} × seed {len(seeds)}, "
+                      f"ядер {SWEEP_CORES or os.cpu_count()}", "info")
+
+    def label(job):                    # Кілька seed — окремі рядки таблиці
+        return job.dataset if len(seeds) == 1 else f"{job.dataset}#{job.seed}"
+
+    def on_event(kind, job, **data):
+        desc = MODE_NAMES.get(job.mode, job.mode)
+        if kind == "start":
+            log(root, output, f"⚡ Запуск етапу «{desc}» для енергосистеми {label(job)}…", "info")
+        elif kind == "progress":
+            log(root, output, f"[{label(job)} · {desc}] Покоління {data['gen'] + 1} з {gens}: "
+                              f"середня похибка = {data['mae']:.3f}, квадратична похибка = {data['rmse']:.3f}. "
+                              f"{data['extra']}", "info")
+        elif kind == "done":
+            rows = result_rows(label(job), job.mode, data["result"])
+            for _, _, mae, rmse, extra in rows:
+                insert_table_row(root, label(job), desc, mae, rmse, extra)
+            log(root, output, f"✅ Етап «{desc}» для {label(job)} завершено", "ok")
+        elif kind == "error":
+            log(root, output, f"❌ Помилка виконання етапу «{desc}» для {label(job)}: {data['message']}", "error")
+        elif kind == "skipped":
+            log(root, output, f"⚠️ Етап «{desc}» для {label(job)} пропущено: попередній етап не виконано", "warn")
+
+    def task():
+        try:
+            def cost(dataset, mode):   # Оцінка вартості із заголовка кешу датасету
+                info = dataset_info(dataset, derived=DERIVED_FEATURES)
+                return scheduler.estimate_cost(info["rows"], len(info["columns"]), mode, gens)
+            jobs = scheduler.plan_jobs(datasets, modes, seeds, depends=PIPELINE_DEPENDS if PIPELINE else None,
+                                       cost=cost, cores_per_job=SWEEP_CORES_PER_JOB)
+            scheduler.run_jobs(jobs, functools.partial(_sweep_job, gens=gens), cores=SWEEP_CORES,
+                               on_event=on_event, cancel=token)
+        except Exception as e:
+            log(root, output, f"❌ Помилка серії запусків: {e}", "error")
+        else:
+            if token.cancelled:
+                log(root, output, "⏹ Серію зупинено; завершені покоління збережено у контрольних точках", "warn")
+            else:
+                log(root, output, "✅ Серію запусків завершено", "ok")
+        set_running(root, False)
+
+    threading.Thread(target=task, daemon=True).start()
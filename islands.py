@@ -0,0 +1,216 @@
+"""
+Острівна модель GA: islands незалежних популяцій етапу в окремих процесах з міграцією.
+- кожен острів — звичайний запуск функції етапу з MODE_CONFIG зі своїм seed
+  (SeedSequence(seed).spawn) і власним оцінювачем популяції
+- кожні every поколінь острів надсилає migrants найкращих генотипів сусідам за топологією
+  (ring — наступному, star — центр 0 ↔ решта, full — усім) і чекає іммігрантів від своїх
+  джерел того ж покоління; обмін синхронний, тож для фіксованого seed результат не залежить
+  від швидкості процесів
+- прогрес островів зводиться у progress_cb(gen, mae, rmse, extra) головного процесу:
+  найкращий результат покоління серед усіх островів, щойно його завершили всі острови
+Результат — як у функції етапу: найкраще рішення островів (для opt — спільний Парето-фронт
+за цілями запуску) з полем "islands" — підсумком кожного острова.
+"""
+
+import queue                                   # queue — очікування іммігрантів і результатів
+from multiprocessing import get_context        # spawn — острови без успадкованих потоків GUI
+import numpy as np                             # numpy — SeedSequence для seed островів
+from evaluators import _share, _attach         # memmap датасету — дескриптором файлу, а не копією
+from run_control import CancelToken            # Скасування островів за спільною подією
+from static.constants import ISLANDS, ISLAND_MIGRATE_EVERY, ISLAND_MIGRANTS, ISLAND_TOPOLOGY # Налаштування
+
+TOPOLOGIES = ("ring", "star", "full")          # Кому острів надсилає емігрантів
+
+def neighbours(topology, n):
+    """Острів → острови, яким він надсилає емігрантів."""
+    if n < 2:
+        return {i: [] for i in range(n)}
+    if topology == "ring":
+        return {i: [(i + 1) % n] for i in range(n)}
+    if topology == "star":
+        return {0: list(range(1, n)), **{i: [0] for i in range(1, n)}}
+    if topology == "full":
+        return {i: [j for j in range(n) if j != i] for i in range(n)}
+    raise ValueError(f"❌ Невідома топологія островів: {topology} (доступні: {', '.join(TOPOLOGIES)})")
+
+def island_seeds(seed, n):
+    """Незалежні seed островів з одного seed запуску (SeedSequence.spawn)."""
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n)]
+
+class _Migration:
+    """
+    Hook migration функції етапу в процесі острова: кожні every поколінь (крім останнього)
+    надсилає migrants найкращих сусідам і повертає іммігрантів від усіх живих джерел
+    того ж покоління (у порядку номера джерела).
+    """
+
+    def __init__(self, index, targets, sources, inboxes, every, migrants, n_gen, cancel):
+        self.index, self.targets, self.inboxes = index, targets, inboxes
+        self.sources = set(sources)
+        self.every, self.migrants, self.n_gen, self.cancel = every, migrants, n_gen, cancel
+        self._pending = {}                     # (покоління, джерело) → генотипи, що прийшли наперед
+
+    def __call__(self, gen, ranked):
+        if self.every <= 0 or (gen + 1) % self.every or gen + 1 >= self.n_gen:
+            return []
+        for t in self.targets:
+            self.inboxes[t].put((gen, self.index, list(ranked[:self.migrants])))
+        got = {}
+        while not self.sources <= set(got) and not self.cancel.cancelled:
+            for s in list(self.sources - set(got)):
+                if (gen, s) in self._pending:
+                    got[s] = self._pending.pop((gen, s))
+            if self.sources <= set(got):
+                break
+            try:
+                msg = self.inboxes[self.index].get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if msg[0] == "closed":             # Джерело завершилось (або впало) — більше не чекаємо
+                self.sources.discard(msg[1])
+            else:
+                self._pending[(msg[0], msg[1])] = msg[2]
+        return [g for s in sorted(got) for g in got[s]]
+
+def _island(index, seed, mode, X, y, cols, kwargs, targets, sources, inboxes, results, progress,
+            cancel_event, cores, cache_dir, every, migrants):
+    """Процес острова: запуск етапу mode зі своїм seed і hook міграції."""
+    cancel = CancelToken(cancel_event)
+    try:
+        from static.mode_config import MODE_CONFIG
+        from evaluators import make_evaluator
+        from fitness_cache import FitnessCache
+        X, y = _attach(X), _attach(y)
+        cache = FitnessCache(cache_dir=cache_dir) if cache_dir else None
+        def progress_cb(gen, mae, rmse, extra):
+            progress.put((index, gen, float(mae), float(rmse), str(extra)))
+        hook = _Migration(index, targets, sources, inboxes, every, migrants, kwargs.get("n_gen", 5), cancel)
+        with make_evaluator("process" if cores > 1 else "serial", cores) as evaluator:
+            func = MODE_CONFIG[mode]["func"]
+            kw = dict(kwargs, progress_cb=progress_cb, cache=cache, evaluator=evaluator, cancel=cancel,
+                      seed=seed, migration=hook)
+            result = func(X, y, cols, **kw) if mode == "features" else func(X, y, **kw)
+        results.put((index, "done", result))
+    except Exception as e:
+        results.put((index, "error", f"{type(e).__name__}: {e}"))
+    finally:
+        for t in targets:                      # Сусіди не чекають іммігрантів від завершеного острова
+            inboxes[t].put(("closed", index))
+
+class _Progress:
+    """Зведений прогрес: покоління g — найкраще серед островів, коли всі живі острови його завершили."""
+
+    def __init__(self, n, progress_cb):
+        self.progress_cb = progress_cb
+        self.alive = set(range(n))
+        self.last = {}                         # Острів → останнє покоління з прогресом
+        self.best = {}                         # Покоління → (mae, rmse, extra, острів)
+        self.next = 0
+
+    def add(self, island, gen, mae, rmse, extra):
+        cur = self.best.get(gen)
+        if cur is None or mae < cur[0]:
+            self.best[gen] = (mae, rmse, extra, island)
+        self.last[island] = gen
+        self.flush()
+
+    def finish(self, island):
+        self.alive.discard(island)
+        self.flush()
+
+    def flush(self):
+        # Покоління завершене островом, коли той звітує про наступне (opt звітує кожне рішення фронту)
+        while self.next in self.best and all(self.last.get(i, -1) > self.next for i in self.alive):
+            mae, rmse, extra, island = self.best.pop(self.next)
+            if self.progress_cb:
+                self.progress_cb(self.next, mae, rmse, f"{extra} [острів {island}]")
+            self.next += 1
+
+def combine(mode, results, objectives=None, archive_size=None):
+    """Результат острівного запуску з результатів островів {острів: результат}."""
+    order = sorted(results)
+    if mode == "opt":
+        from ga_multiobjective_opt import _genotype, DEFAULT_OBJECTIVES, ARCHIVE_SIZE
+        from pareto import ParetoArchive
+        archive = ParetoArchive(archive_size or ARCHIVE_SIZE, objectives or DEFAULT_OBJECTIVES, key=_genotype)
+        return list(archive.update([c for i in order for c in results[i]]))
+    key = "fitness" if mode == "structure" else "mae"
+    live = [i for i in order if results[i]]
+    if not live:
+        return None
+    best = dict(results[min(live, key=lambda i: results[i][key])])
+    best["islands"] = [{"island": i, "mae": results[i]["mae"], "rmse": results[i]["rmse"]} for i in live]
+    budgets = [results[i]["budget"] for i in live if results[i].get("budget")]
+    if budgets:                                # Сумарний бюджет навчань усіх островів
+        best["budget"] = {"fits": sum(b["fits"] for b in budgets), "iters": sum(b["iters"] for b in budgets),
+                          "pruned": sum(b["pruned"] for b in budgets),
+                          "per_candidate": [g for b in budgets for g in b["per_candidate"]]}
+    return best
+
+def run_islands(mode, X, y, cols=None, islands=ISLANDS, every=ISLAND_MIGRATE_EVERY, migrants=ISLAND_MIGRANTS,
+                topology=ISLAND_TOPOLOGY, seed=None, cores_per_island=1, cache_dir=None,
+                progress_cb=None, cancel=None, on_island=None, **stage_kwargs):
+    """
+    Острівний запуск етапу mode: islands процесів, у кожному — функція етапу з MODE_CONFIG.
+    every, migrants   – міграція кожні every поколінь, migrants найкращих генотипів (every=0 — без міграції)
+    topology          – ring, star або full (TOPOLOGIES)
+    seed              – seed запуску (None — фіксований seed етапу); seed островів — SeedSequence(seed).spawn(islands)
+    cores_per_island  – ядер оцінювача популяції кожного острова
+    cache_dir         – дисковий кеш пристосованості, спільний для островів (None — без кешу)
+    progress_cb       – progress_cb(gen, mae, rmse, extra): зведений прогрес островів
+    cancel            – CancelToken: острови зупиняються після поточного оцінювання
+    on_island         – on_island(острів, "done"/"error", результат або повідомлення)
+    stage_kwargs      – параметри функції етапу (pop_size, n_gen, max_iter, …; без cache,
+                        evaluator, events і контрольних точок — вони не передаються між процесами)
+    """
+    topology_map = neighbours(topology, islands)
+    sources = {i: [j for j in range(islands) if i in topology_map[j]] for i in range(islands)}
+    from static.mode_config import MODE_CONFIG
+    seeds = island_seeds(MODE_CONFIG[mode]["seed"] if seed is None else seed, islands)
+    ctx = get_context("spawn")
+    cancel_event, results_q, progress_q = ctx.Event(), ctx.Queue(), ctx.Queue()
+    inboxes = [ctx.Queue() for _ in range(islands)]
+    Xs, ys = _share(X), _share(y)
+    procs = [ctx.Process(target=_island, daemon=True,
+                         args=(i, seeds[i], mode, Xs, ys, cols, stage_kwargs, topology_map[i], sources[i],
+                               inboxes, results_q, progress_q, cancel_event, cores_per_island, cache_dir,
+                               every, migrants))
+             for i in range(islands)]
+    for p in procs:
+        p.start()
+    agg, results, errors = _Progress(islands, progress_cb), {}, {}
+
+    def drain():
+        while True:
+            try:
+                agg.add(*progress_q.get_nowait())
+            except queue.Empty:
+                return
+
+    try:
+        while len(results) + len(errors) < islands:
+            if cancel is not None and cancel.cancelled:
+                cancel_event.set()
+            try:
+                index, kind, payload = results_q.get(timeout=0.1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs) and results_q.empty():
+                    break                      # Процеси завершились аварійно, не повідомивши результат
+                drain()
+                continue
+            drain()
+            (results if kind == "done" else errors)[index] = payload
+            agg.finish(index)
+            if on_island:
+                on_island(index, kind, payload)
+        drain()
+        for i in range(islands):
+            agg.finish(i)
+    finally:
+        if any(p.is_alive() for p in procs):   # Перервано (KeyboardInterrupt) — острови теж зупиняються
+            cancel_event.set()
+        for p in procs:
+            p.join(timeout=5)
+    if not results:
+        raise RuntimeError("❌ Жоден острів не завершився: " + "; ".join(f"{i}: {m}" for i, m in sorted(errors.items())))
+    return combine(mode, results, stage_kwargs.get("objectives"), stage_kwargs.get("archive_size"))
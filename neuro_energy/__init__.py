@@ -0,0 +1,4 @@
+"""
+Консольний запуск етапів аналізу без GUI.
+python -m neuro_energy run --dataset s1 --mode params --gens 20 --pop 32 --jobs 8
+"""
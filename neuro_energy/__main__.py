@@ -0,0 +1,4 @@
+import sys                                     # sys — код виходу
+from neuro_energy.cli import main              # Точка входу консольного запуску
+
+sys.exit(main())
@@ -0,0 +1,464 @@
+"""
+Консольний (headless) запуск етапів GA для серверів без дисплея.
+Функції етапів беруться з MODE_CONFIG і викликаються напряму.
+Прогрес друкується у stdout рядками JSON (одна подія — один рядок), а
+підсумкова таблиця записується у CSV того ж формату, що й «Зберегти таблицю» у GUI.
+Tkinter і matplotlib не імпортуються; модулі GA (scikit-learn) — лише перед запуском.
+З --cores матриця датасет × етап × seed виконується паралельно планувальником
+scheduler.py (великі задачі — першими, рядки таблиці — по мірі завершення).
+З --pipeline етапи датасету утворюють конвеєр (pipeline.py): маска ознак і lr/alpha
+попередніх етапів — вхід наступних.
+З --register найкращі моделі етапів перенавчаються на всьому ряді і зберігаються
+у реєстр (registry.py); команда predict рахує прогноз моделлю з реєстру без GA.
+Команда online донавчає модель з реєстру на нових рядках (хвіст файлу, stdin або
+відтворення датасету), стежить за ковзними MAE/RMSE і після дрейфу перезапускає GA (online.py).
+З --islands кожен етап виконується острівною моделлю (islands.py): кілька популяцій
+у окремих процесах з обміном найкращими генотипами.
+SIGINT/SIGTERM зупиняють запуск після поточного оцінювання; з --checkpoint-dir
+завершені покоління зберігаються, і повторний запуск продовжує з них.
+"""
+
+import argparse, contextlib, json, os, signal, sys, time # argparse — аргументи, json — події прогресу, time — тривалість
+from run_control import CancelToken            # Кооперативне скасування (без scikit-learn)
+import profiling                               # Таймери етапів і профілювання запуску (без scikit-learn)
+from static.mappings import DATASET_PATHS      # Доступні датасети
+from static.constants import FITNESS_CACHE_DIR, FITNESS_CACHE_SIZE, EVAL_BACKEND # Налаштування кешу і бекенду
+from static.constants import MODEL_REGISTRY_DIR # Папка реєстру моделей
+from static.constants import DERIVED_FEATURES  # Похідні ознаки (лаги, ковзні вікна) за замовчуванням
+from static.constants import ISLAND_MIGRATE_EVERY, ISLAND_MIGRANTS, ISLAND_TOPOLOGY # Острівна модель
+from static.constants import (ONLINE_WINDOW, ONLINE_UPDATE_ROWS, ONLINE_EPOCHS, ONLINE_RETRAIN_ROWS,
+                              ONLINE_RETRAIN_GENS, ONLINE_RETRAIN_COOLDOWN, ONLINE_DRIFT_THRESHOLD) # Налаштування онлайн-режиму
+from results import MODE_NAMES, result_rows, write_summary_csv # Таблиця результатів без Tkinter
+
+def _plain(v):
+    """numpy-скаляри → звичайні числа для JSON."""
+    return v.item() if hasattr(v, "item") else str(v)
+
+def emit(stream, event, **fields):
+    """Друкує подію прогресу одним рядком JSON."""
+    stream.write(json.dumps({"event": event, **fields}, ensure_ascii=False, default=_plain) + "\n")
+    stream.flush()
+
+def _stage_kwargs(mode, args, cache, evaluator, progress_cb, cancel=None, checkpoint=None):
+    """Параметри виклику функції етапу (як у GUI, але з аргументів командного рядка)."""
+    kwargs = dict(pop_size=args.pop or (10 if mode == "opt" else 8), # Для opt трохи більша популяція
+                  n_gen=args.gens, mutation_rate=args.mutation_rate,
+                  max_iter=args.max_iter, cv_splits=args.cv_splits,
+                  progress_cb=progress_cb, cache=cache, evaluator=evaluator,
+                  racing=args.racing, warm_start=args.warm_start, cancel=cancel,
+                  surrogate=args.surrogate, surrogate_factor=args.surrogate_factor,
+                  fidelity=args.fidelity, subsample=args.subsample,
+                  checkpoint=checkpoint, resume=not args.fresh)
+    if mode in ("features", "params"):         # Пакетний тренер є лише для цих етапів
+        kwargs["trainer"] = args.trainer
+    if mode == "features":                     # Оператори GA масок ознак
+        kwargs.update(tournament=args.tournament, crossover=args.crossover, crossover_points=args.crossover_points)
+    if mode == "opt" and args.objectives:      # Цілі Парето-оптимізації
+        kwargs["objectives"] = tuple(args.objectives)
+    return kwargs
+
+def _run_stage(func, mode, X, y, cols, kwargs, args, seed=None):
+    """
+    Виклик функції етапу з seed (None — args.seed); з --islands — острівний запуск
+    islands.run_islands (без кешу в пам'яті і контрольних точок).
+    """
+    seed = args.seed if seed is None else seed
+    if not args.islands:
+        kwargs = dict(kwargs, seed=seed)
+        return func(X, y, cols, **kwargs) if mode == "features" else func(X, y, **kwargs)
+    from islands import run_islands
+    kwargs = {k: v for k, v in kwargs.items() if k not in ("cache", "evaluator", "checkpoint", "resume")}
+    return run_islands(mode, X, y, cols, islands=args.islands, every=args.migrate_every, migrants=args.migrants,
+                       topology=args.topology, seed=seed,
+                       cores_per_island=args.cores_per_island,
+                       cache_dir=None if args.no_cache else args.cache_dir, **kwargs)
+
+def run_sweep(datasets, modes, args, stream=sys.stdout, cancel=None):
+    """
+    Запускає етапи modes для кожного датасету datasets в одному процесі.
+    Кожен датасет завантажується один раз; кеш пристосованості і пул процесів спільні.
+    cancel – CancelToken: після скасування поточний етап зупиняється, решта не запускається.
+    Повертає (рядки підсумкової таблиці, кількість помилок).
+    """
+    from datasets import load_dataset, dataset_info # Імпорти з scikit-learn — лише коли справді запускаємо
+    from static.mode_config import MODE_CONFIG
+    from fitness_cache import FitnessCache
+    from evaluators import make_evaluator
+    from pipeline import Pipeline, pipeline_tag
+
+    cache = None if args.no_cache else FitnessCache(maxsize=FITNESS_CACHE_SIZE, cache_dir=args.cache_dir)
+    rows, errors = [], 0
+    with make_evaluator(args.backend, args.jobs) as evaluator:
+        for dataset in datasets:
+            if cancel is not None and cancel.cancelled:
+                break
+            try:
+                X, y, cols = load_dataset(dataset, target=args.target, features=args.features, derived=args.derived)
+                info = dataset_info(dataset, target=args.target, features=args.features, derived=args.derived)
+            except Exception as e:
+                emit(stream, "error", dataset=dataset, message=f"❌ Помилка завантаження даних: {e}")
+                errors += len(modes)
+                continue
+            emit(stream, "dataset", dataset=dataset, rows=int(X.shape[0]), features=list(cols),
+                 target=info["target"], ingest=info["ingest"], # ingest — швидкість побудови кешу (rows_per_s)
+                 derive=info.get("derive"))    # Швидкість генерації похідних ознак (derived)
+            pipe = Pipeline() if args.pipeline else None # Результати етапів датасету — вхід наступних
+
+            for mode in modes:
+                if cancel is not None and cancel.cancelled:
+                    break
+                func = MODE_CONFIG[mode]["func"]
+                if pipe is not None and pipe.missing(mode, modes):
+                    emit(stream, "error", dataset=dataset, mode=mode,
+                         message="❌ Етап пропущено: попередній етап конвеєра не виконано")
+                    errors += 1
+                    continue
+                Xs, cs, extra, inputs = pipe.inputs(mode, X, cols) if pipe is not None else (X, cols, {}, {})
+                laps = {"gen": profiling.mark(), "stage": profiling.mark()} # Знімки таймерів (None — вимкнені)
+                def progress(gen, mae, rmse, extra, dataset=dataset, mode=mode, laps=laps):
+                    timings, laps["gen"] = profiling.lap(laps["gen"]) # Приріст таймерів від попереднього виклику
+                    emit(stream, "progress", dataset=dataset, mode=mode, gen=gen + 1, gens=args.gens,
+                         mae=float(mae), rmse=float(rmse), extra=extra,
+                         **({"timings": timings} if timings else {}))
+
+                checkpoint = None if args.islands else _checkpoint_path(args, dataset, mode, args.seed, pipeline_tag(inputs))
+                emit(stream, "start", dataset=dataset, mode=mode, checkpoint=checkpoint,
+                     resumed=bool(checkpoint and not args.fresh and os.path.exists(checkpoint)),
+                     **({"pipeline": inputs} if inputs else {}))
+                t = time.perf_counter()
+                try:
+                    kwargs = dict(_stage_kwargs(mode, args, cache, evaluator, progress, cancel, checkpoint), **extra)
+                    result = _run_stage(func, mode, Xs, y, cs, kwargs, args)
+                except Exception as e:
+                    emit(stream, "error", dataset=dataset, mode=mode,
+                         message=f"❌ Помилка виконання етапу: {e}")
+                    errors += 1
+                    continue
+                if cancel is not None and cancel.cancelled:
+                    emit(stream, "cancelled", dataset=dataset, mode=mode, checkpoint=checkpoint,
+                         wall_s=time.perf_counter() - t)
+                    break
+                if pipe is not None:
+                    pipe.record(mode, result)
+                registered = _register(args, dataset, mode, result, Xs, y, cs, info["target"], extra)
+                stage_rows = result_rows(dataset, mode, result)
+                rows.extend(stage_rows)
+                best = min(stage_rows, key=lambda r: r[2]) if stage_rows else None
+                emit(stream, "done", dataset=dataset, mode=mode, wall_s=time.perf_counter() - t,
+                     mae=best[2] if best else None, rmse=best[3] if best else None,
+                     extra=best[4] if best else None,
+                     budget=result.get("budget") if isinstance(result, dict) else None,
+                     surrogate=result.get("surrogate") if isinstance(result, dict) else None,
+                     fidelity=result.get("fidelity") if isinstance(result, dict) else None,
+                     registered=registered,
+                     timings=profiling.lap(laps["stage"])[0],
+                     cache=cache.stats() if cache is not None else None)
+    return rows, errors
+
+def _register(args, dataset, mode, result, X, y, cols, target, extra):
+    """З --register: моделі результату етапу — у реєстр; повертає ["назва/vN", …] або None."""
+    if not args.register or not result:
+        return None
+    from registry import ModelRegistry
+    saved = ModelRegistry(args.registry_dir).register(dataset, mode, result, X, y, cols, target=target,
+                                                      max_iter=args.max_iter, **extra)
+    return [f"{name}/v{version}" for name, version in saved]
+
+def _checkpoint_path(args, dataset, mode, seed=None, tag=""):
+    """
+    Контрольна точка задачі (seed None — фіксований seed етапу, той самий файл, що й у GUI).
+    tag – pipeline.pipeline_tag входів конвеєра ("" — етап без попередників)
+    """
+    if not args.checkpoint_dir:
+        return None
+    return os.path.join(args.checkpoint_dir, f"{dataset}_{mode}" + (f"_seed{seed}" if seed is not None else "") + tag + ".pkl")
+
+def _sweep_job(job, upstream, cancel, progress, args):
+    """Задача планувальника у воркері: етап job.mode для (job.dataset, job.seed)."""
+    from datasets import load_dataset, dataset_info
+    from static.mode_config import MODE_CONFIG
+    from fitness_cache import FitnessCache
+    from evaluators import make_evaluator
+    from pipeline import Pipeline, pipeline_tag
+
+    X, y, cols = load_dataset(job.dataset, target=args.target, features=args.features, derived=args.derived)
+    X, cols, extra, inputs = Pipeline(upstream).inputs(job.mode, X, cols) # upstream — лише з --pipeline
+    cache = None if args.no_cache else FitnessCache(maxsize=FITNESS_CACHE_SIZE, cache_dir=args.cache_dir)
+    backend = (args.backend if args.backend != "serial" else "process") if job.cores > 1 else "serial"
+    with make_evaluator(backend, job.cores) as evaluator:
+        kwargs = dict(_stage_kwargs(job.mode, args, cache, evaluator, progress, cancel,
+                                    _checkpoint_path(args, job.dataset, job.mode, job.seed, pipeline_tag(inputs))),
+                      **extra)
+        result = _run_stage(MODE_CONFIG[job.mode]["func"], job.mode, X, y, cols, kwargs, args, job.seed)
+    if not cancel.cancelled:                   # Перерваний етап не реєструється
+        info = dataset_info(job.dataset, target=args.target, features=args.features, derived=args.derived)
+        _register(args, job.dataset, job.mode, result, X, y, cols, info["target"], extra) # Ціль — як у послідовному запуску
+    return result
+
+def run_parallel_sweep(datasets, modes, args, stream=sys.stdout, cancel=None):
+    """
+    Запускає матрицю datasets × modes × seeds планувальником scheduler.run_jobs
+    з бюджетом args.cores ядер (по args.cores_per_job на задачу).
+    Рядки підсумкової таблиці додаються і CSV перезаписується по мірі завершення задач.
+    Повертає (рядки підсумкової таблиці, кількість помилок).
+    """
+    from functools import partial
+    from datasets import dataset_info
+    from scheduler import plan_jobs, run_jobs, estimate_cost
+    from pipeline import PIPELINE_DEPENDS
+
+    seeds = args.seeds or [args.seed]
+    def cost(dataset, mode):                   # Рядки і ознаки — із заголовка кешу датасету
+        info = dataset_info(dataset, target=args.target, features=args.features, derived=args.derived)
+        return estimate_cost(info["rows"], len(info["columns"]), mode, args.gens, args.pop or 8)
+    try:
+        jobs = plan_jobs(datasets, modes, seeds, depends=PIPELINE_DEPENDS if args.pipeline else None,
+                         cost=cost, cores_per_job=args.cores_per_job)
+    except Exception as e:
+        emit(stream, "error", message=f"❌ Помилка завантаження даних: {e}")
+        return [], len(datasets) * len(modes) * len(seeds)
+    rows, errors, started = [], 0, {}
+
+    def label(job):                            # Кілька seed — окремі рядки таблиці
+        return job.dataset if len(seeds) == 1 else f"{job.dataset}#{job.seed}"
+
+    def on_event(kind, job, **data):
+        nonlocal errors
+        ids = {"dataset": job.dataset, "mode": job.mode, "seed": job.seed}
+        if kind == "start":
+            started[job.key] = time.perf_counter()
+            emit(stream, "start", **ids, cost=job.cost, priority=job.priority, deps=[d[1] for d in job.deps])
+        elif kind == "progress":
+            emit(stream, "progress", **ids, gen=data["gen"] + 1, gens=args.gens,
+                 mae=data["mae"], rmse=data["rmse"], extra=data["extra"])
+        elif kind == "done":
+            result = data["result"]
+            stage_rows = result_rows(label(job), job.mode, result)
+            rows.extend(stage_rows)
+            write_summary_csv(rows, args.output) # Проміжна таблиця: завершені задачі не губляться
+            best = min(stage_rows, key=lambda r: r[2]) if stage_rows else None
+            emit(stream, "done", **ids, wall_s=time.perf_counter() - started[job.key],
+                 mae=best[2] if best else None, rmse=best[3] if best else None,
+                 extra=best[4] if best else None,
+                 budget=result.get("budget") if isinstance(result, dict) else None)
+        elif kind == "error":
+            errors += 1
+            emit(stream, "error", **ids, message=f"❌ Помилка виконання етапу: {data['message']}")
+        elif kind == "skipped":
+            errors += 1
+            emit(stream, "error", **ids, message="❌ Етап пропущено: попередній етап не виконано")
+
+    run_jobs(jobs, partial(_sweep_job, args=args), cores=args.cores, on_event=on_event, cancel=cancel)
+    return rows, errors
+
+def build_parser():
+    """Аргументи командного рядка."""
+    parser = argparse.ArgumentParser(prog="python -m neuro_energy",
+                                     description="Запуск етапів аналізу енергосистем без GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="запустити етап(и) GA для датасету(ів)")
+    run.add_argument("--dataset", nargs="+", default=["s1"], choices=sorted(DATASET_PATHS) + ["all"],
+                     help="датасет(и); all — усі")
+    run.add_argument("--mode", nargs="+", default=["features"], choices=list(MODE_NAMES) + ["all"],
+                     help="етап(и); all — усі по черзі")
+    run.add_argument("--target", help="назва колонки цілі (за замовчуванням DATASET_TARGETS датасету — load)")
+    run.add_argument("--features", nargs="+", help="назви колонок ознак (за замовчуванням усі, крім цілі)")
+    run.add_argument("--derived", action=argparse.BooleanOptionalAction, default=DERIVED_FEATURES,
+                     help="похідні ознаки: лаги цілі, ковзні середнє/std, sin/cos години і дня тижня")
+    run.add_argument("--gens", type=int, default=5, help="кількість поколінь")
+    run.add_argument("--pop", type=int, help="розмір популяції (за замовчуванням як у GUI)")
+    run.add_argument("--mutation-rate", type=float, default=0.2)
+    run.add_argument("--max-iter", type=int, default=100)
+    run.add_argument("--cv-splits", type=int, default=3)
+    run.add_argument("--seed", type=int,
+                     help="seed генераторів GA кожного етапу (за замовчуванням — фіксований seed етапу, як у GUI)")
+    run.add_argument("--seeds", nargs="+", type=int,
+                     help="кілька seed паралельної серії (--cores): матриця датасет × етап × seed")
+    run.add_argument("--cores", type=int,
+                     help="паралельна серія: загальний бюджет ядер для задач датасет × етап × seed")
+    run.add_argument("--cores-per-job", type=int, default=1,
+                     help="ядер на одну задачу серії (оцінювач популяції задачі)")
+    run.add_argument("--pipeline", action="store_true",
+                     help="конвеєр: маска ознак і lr/alpha попередніх етапів — вхід наступних")
+    run.add_argument("--islands", type=int,
+                     help="острівна модель: кількість популяцій етапу в окремих процесах")
+    run.add_argument("--migrate-every", type=int, default=ISLAND_MIGRATE_EVERY,
+                     help="міграція між островами кожні N поколінь (0 — без міграції)")
+    run.add_argument("--migrants", type=int, default=ISLAND_MIGRANTS,
+                     help="скільки найкращих генотипів острів надсилає кожному сусіду")
+    run.add_argument("--topology", default=ISLAND_TOPOLOGY, choices=("ring", "star", "full"),
+                     help="кому острів надсилає емігрантів: наступному, центру/від центру, усім")
+    run.add_argument("--cores-per-island", type=int, default=1, help="ядер оцінювача популяції острова")
+    run.add_argument("--jobs", type=int, help="кількість процесів (для --backend process/loky)")
+    run.add_argument("--backend", default=None, help="serial, process або loky")
+    run.add_argument("--racing", action="store_true", help="відсіювання після першого фолду")
+    run.add_argument("--trainer", default="sklearn", choices=("sklearn", "batched"))
+    run.add_argument("--warm-start", action="store_true",
+                     help="нащадки стартують з ваг батьків і навчаються коротше")
+    run.add_argument("--surrogate", choices=("rf", "gp"),
+                     help="сурогат (випадковий ліс / гаусівський процес) відсіює нащадків до навчання")
+    run.add_argument("--surrogate-factor", type=int, default=4,
+                     help="у скільки разів більше нащадків генерувати для відсіювання сурогатом")
+    run.add_argument("--fidelity", nargs="+", type=float,
+                     help="частки рядків train за поколіннями, напр. 0.25 0.5 1 (фінальна оцінка — на всіх)")
+    run.add_argument("--subsample", default="recent", choices=("recent", "stride"),
+                     help="вибірка рядків за неповної точності: недавнє вікно або кожен k-й рядок")
+    run.add_argument("--tournament", type=int, default=2, help="особин у турнірі відбору батьків етапу features")
+    run.add_argument("--crossover", default="point", choices=("point", "uniform"),
+                     help="кросовер масок етапу features: точки розрізу або рівномірний")
+    run.add_argument("--crossover-points", type=int, default=1, help="точок розрізу для --crossover point")
+    run.add_argument("--objectives", nargs="+", choices=("mae", "rmse", "params", "fit_time"),
+                     help="цілі етапу opt (за замовчуванням mae rmse params)")
+    run.add_argument("--cache-dir", default=FITNESS_CACHE_DIR)
+    run.add_argument("--no-cache", action="store_true", help="не використовувати кеш пристосованості")
+    run.add_argument("--output", default="results/summary.csv", help="підсумкова таблиця CSV")
+    run.add_argument("--register", action="store_true",
+                     help="перенавчити найкращі моделі етапів на всьому ряді і зберегти у реєстр")
+    run.add_argument("--registry-dir", default=MODEL_REGISTRY_DIR, help="папка реєстру моделей")
+    run.add_argument("--checkpoint-dir", help="папка контрольних точок (<датасет>_<етап>.pkl після кожного покоління)")
+    run.add_argument("--fresh", action="store_true", help="не продовжувати з наявних контрольних точок")
+    run.add_argument("--timings", action="store_true",
+                     help="таймери етапів: у подіях progress/done і таблиця у stderr наприкінці")
+    run.add_argument("--timings-out", help="записати підсумкові таймери у JSON (вмикає --timings)")
+    run.add_argument("--profile", help="профіль усього запуску у файл (cProfile .prof або pyinstrument .html)")
+    run.add_argument("--profiler", default="cprofile", choices=profiling.PROFILERS)
+
+    pred = sub.add_parser("predict", help="прогноз моделлю з реєстру (без запуску GA)")
+    pred.add_argument("--dataset", required=True, choices=sorted(DATASET_PATHS), help="датасет моделі")
+    pred.add_argument("--model", help="назва моделі (features, params, structure, opt-N; за замовчуванням — найменший MAE)")
+    pred.add_argument("--version", type=int, help="версія моделі (за замовчуванням остання)")
+    pred.add_argument("--input", help="CSV з колонками ознак (за замовчуванням — ряд самого датасету)")
+    pred.add_argument("--output", default="results/predictions.csv", help="CSV з прогнозом")
+    pred.add_argument("--registry-dir", default=MODEL_REGISTRY_DIR)
+
+    onl = sub.add_parser("online", help="донавчання моделі з реєстру на потоці нових рядків")
+    onl.add_argument("--dataset", required=True, choices=sorted(DATASET_PATHS), help="датасет моделі")
+    onl.add_argument("--model", help="назва моделі (за замовчуванням — найменший MAE)")
+    onl.add_argument("--version", type=int, help="версія моделі (за замовчуванням остання)")
+    onl.add_argument("--input", help="CSV нових рядків із заголовком; - — stdin "
+                                     "(за замовчуванням — відтворення датасету після --history рядків)")
+    onl.add_argument("--follow", action="store_true",
+                     help="як tail -f: чекати дописаних у --input рядків (з поточного кінця файлу)")
+    onl.add_argument("--poll", type=float, default=1.0, help="секунд між перевірками файлу з --follow")
+    onl.add_argument("--history", type=int,
+                     help="перших рядків датасету, відомих моделі (за замовчуванням усі)")
+    onl.add_argument("--skip", type=int, default=0, help="пропустити перші рядки даних --input")
+    onl.add_argument("--derived", action=argparse.BooleanOptionalAction, default=DERIVED_FEATURES,
+                     help="похідні ознаки для моделі, синтезованої з нуля")
+    onl.add_argument("--mode", default="features", choices=list(MODE_NAMES),
+                     help="етап для першої моделі, якщо в реєстрі немає моделей датасету")
+    onl.add_argument("--update-rows", type=int, default=ONLINE_UPDATE_ROWS, help="рядків між partial_fit")
+    onl.add_argument("--epochs", type=int, default=ONLINE_EPOCHS, help="епох partial_fit на порцію рядків")
+    onl.add_argument("--window", type=int, default=ONLINE_WINDOW, help="рядків ковзних MAE/RMSE")
+    onl.add_argument("--drift-threshold", type=float, default=ONLINE_DRIFT_THRESHOLD,
+                     help="поріг тесту дрейфу Пейджа–Хінклі (у середніх похибках)")
+    onl.add_argument("--no-retrain", action="store_true", help="після дрейфу лише донавчання, без GA")
+    onl.add_argument("--retrain-rows", type=int, default=ONLINE_RETRAIN_ROWS,
+                     help="останніх рядків для повторного GA")
+    onl.add_argument("--retrain-gens", type=int, default=ONLINE_RETRAIN_GENS, help="поколінь повторного GA")
+    onl.add_argument("--retrain-cooldown", type=int, default=ONLINE_RETRAIN_COOLDOWN,
+                     help="щонайменше рядків між повторними GA (дрейф раніше — лише донавчання)")
+    onl.add_argument("--pop", type=int, default=8, help="розмір популяції повторного GA")
+    onl.add_argument("--max-iter", type=int, default=100)
+    onl.add_argument("--cv-splits", type=int, default=3)
+    onl.add_argument("--seed", type=int, default=0)
+    onl.add_argument("--save-every", type=int, default=0,
+                     help="зберігати донавчену модель кожні N partial_fit (0 — лише наприкінці)")
+    onl.add_argument("--registry-dir", default=MODEL_REGISTRY_DIR)
+    return parser
+
+def run_predict(args, stream=sys.stdout):
+    """Команда predict: прогноз моделлю з реєстру для --input або ряду датасету."""
+    from registry import ModelRegistry
+    import numpy as np
+
+    registry = ModelRegistry(args.registry_dir)
+    model = registry.load(args.dataset, args.model, args.version)
+    y = None
+    if args.input:                             # Лише потрібні колонки, одразу у float32
+        import pandas as pd
+        df = pd.read_csv(args.input, usecols=model.features, dtype=np.float32)
+        X, columns = df.to_numpy(), list(df.columns)
+    else:
+        from datasets import load_dataset, dataset_info
+        base = dataset_info(args.dataset, target=model.meta.get("target"))["columns"]
+        derived = any(f not in base for f in model.features) # Модель навчена на похідних ознаках
+        X, y, columns = load_dataset(args.dataset, target=model.meta.get("target"), derived=derived)
+    t = time.perf_counter()
+    pred = model.predict(X, columns=columns)
+    seconds = time.perf_counter() - t
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    np.savetxt(args.output, pred, fmt="%.6g", header="prediction", comments="")
+    emit(stream, "predict", dataset=args.dataset, model=model.meta["name"], version=model.meta["version"],
+         rows=len(pred), seconds=seconds, rows_per_s=len(pred) / max(seconds, 1e-9), path=args.output,
+         mae=float(np.mean(np.abs(pred - y))) if y is not None else None) # MAE на власному ряді (in-sample)
+    return 0
+
+def run_online(args, stream=sys.stdout, cancel=None):
+    """Команда online: донавчання моделі з реєстру на рядках --input / stdin / відтворення датасету."""
+    from registry import ModelRegistry
+    from online import OnlineLearner, follow_lines, stream_lines
+    import itertools
+
+    t = time.perf_counter()
+    def on_event(kind, **data):
+        emit(stream, kind, dataset=args.dataset, **data)
+    learner = OnlineLearner(args.dataset, ModelRegistry(args.registry_dir), args.model, args.version,
+                            history=args.history, derived=args.derived, mode=args.mode,
+                            update_rows=args.update_rows, epochs=args.epochs, window=args.window,
+                            retrain=not args.no_retrain, retrain_rows=args.retrain_rows,
+                            retrain_gens=args.retrain_gens, retrain_cooldown=args.retrain_cooldown,
+                            pop_size=args.pop, max_iter=args.max_iter,
+                            cv_splits=args.cv_splits, seed=args.seed, drift_threshold=args.drift_threshold,
+                            cancel=cancel, on_event=on_event)
+    if args.input == "-":
+        lines = stream_lines(sys.stdin, cancel)
+    else:
+        skip = args.skip
+        if args.input is None:                 # Відтворення: рядки датасету після історії
+            skip = args.history or 0
+        lines = follow_lines(args.input or DATASET_PATHS[args.dataset], follow=args.follow, poll=args.poll,
+                             cancel=cancel, from_end=args.follow and not skip)
+        header = next(lines, "")
+        lines = itertools.chain([header], itertools.islice(lines, skip, None))
+    skipped = learner.run(lines, save_every=args.save_every)
+    emit(stream, "online_done", dataset=args.dataset, rows=learner.rows, skipped=skipped,
+         updates=learner.updates, retrains=learner.retrains, mae=learner.errors.mae,
+         rmse=learner.errors.rmse, wall_s=time.perf_counter() - t, cancelled=bool(cancel and cancel.cancelled))
+    return 130 if cancel is not None and cancel.cancelled else 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "predict":
+        return run_predict(args)
+    if args.command == "online":
+        cancel = CancelToken()
+        for sig in (signal.SIGINT, signal.SIGTERM):  # Зупинка після поточної порції рядків
+            signal.signal(sig, lambda *_: cancel.cancel())
+        return run_online(args, cancel=cancel)
+    if args.gens <= 0:
+        raise SystemExit("❌ Кількість поколінь має бути > 0")
+    if args.backend is None:                   # Явний --jobs без бекенду — пул процесів
+        args.backend = "process" if args.jobs and args.jobs > 1 else EVAL_BACKEND
+    datasets = sorted(DATASET_PATHS) if "all" in args.dataset else args.dataset
+    modes = list(MODE_NAMES) if "all" in args.mode else args.mode
+
+    cancel = CancelToken()
+    for sig in (signal.SIGINT, signal.SIGTERM):  # Зупинка після поточного оцінювання замість обриву
+        signal.signal(sig, lambda *_: cancel.cancel())
+    if args.timings or args.timings_out:
+        profiling.enable()
+    t = time.perf_counter()
+    with (profiling.profile_run(args.profile, args.profiler) if args.profile else contextlib.nullcontext()):
+        sweep = run_parallel_sweep if args.cores else run_sweep
+        rows, errors = sweep(datasets, modes, args, cancel=cancel)
+    if profiling.is_enabled():                 # Підсумок: подія timings, таблиця у stderr, JSON за потреби
+        timings = profiling.stats()
+        emit(sys.stdout, "timings", wall_s=time.perf_counter() - t, timings=timings,
+             path=profiling.write_json(timings, args.timings_out) if args.timings_out else None)
+        print(profiling.format_table(timings, time.perf_counter() - t), file=sys.stderr)
+    path = write_summary_csv(rows, args.output)
+    emit(sys.stdout, "summary", path=path, rows=len(rows), errors=errors, cancelled=cancel.cancelled)
+    if cancel.cancelled:
+        return 130                             # Як у shell для перерваного процесу
+    return 1 if errors else 0
@@ -0,0 +1,358 @@
+"""
+Онлайн-режим: найкраща модель етапу з реєстру донавчається на нових рядках ряду
+по мірі їх надходження (хвіст CSV-файлу, stdin або відтворення самого датасету).
+- кожен новий рядок спершу прогнозується поточною моделлю (test-then-train), похибки —
+  у ковзні MAE/RMSE (кільцевий буфер, O(1) на рядок)
+- похідні ознаки нових рядків — FeatureEngine.update; кожні update_rows рядків модель
+  донавчається LayeredMLPRegressor.partial_fit лише на них
+- дрейф (тест Пейджа–Хінклі на нормованій абсолютній похибці) запускає обмежений повторний
+  GA етапу моделі на останніх retrain_rows рядках; нова модель перенавчається на них же
+  і зберігається новою версією в реєстрі
+Обчислення на годину пропорційні новим рядкам: історія ряду тримається лише як хвіст
+цілі FeatureEngine і кільцевий буфер retrain_rows рядків для повторного GA.
+"""
+
+import math, time                              # math — RMSE, time — очікування дописування файлу
+import numpy as np                             # numpy — буфери і прогноз
+from eval_core import LayeredMLPRegressor, DEFAULT_LR, DEFAULT_ALPHA # Донавчання partial_fit
+from registry import ModelRegistry, RegisteredModel # Модель етапу з реєстру і нові версії
+from static.constants import (ONLINE_WINDOW, ONLINE_UPDATE_ROWS, ONLINE_EPOCHS, ONLINE_RETRAIN_ROWS,
+                              ONLINE_RETRAIN_GENS, ONLINE_RETRAIN_COOLDOWN, # Налаштування онлайн-режиму
+                              ONLINE_DRIFT_DELTA, ONLINE_DRIFT_THRESHOLD)
+
+class RollingErrors:
+    """Ковзні MAE і RMSE за останні window похибок: кільцевий буфер і суми, O(1) на похибку."""
+
+    def __init__(self, window=ONLINE_WINDOW):
+        self.window = int(window)
+        self._abs = np.zeros(self.window)
+        self._sq = np.zeros(self.window)
+        self._pos = 0
+        self.count = 0                         # Похибок усього (у вікні — min(count, window))
+        self._sum_abs = self._sum_sq = 0.0
+
+    def add(self, err):
+        """Додає похибку прогнозу err = прогноз − факт."""
+        a, s = abs(float(err)), float(err) * float(err)
+        self._sum_abs += a - self._abs[self._pos]
+        self._sum_sq += s - self._sq[self._pos]
+        self._abs[self._pos], self._sq[self._pos] = a, s
+        self._pos = (self._pos + 1) % self.window
+        self.count += 1
+        if self._pos == 0:                     # Раз на вікно — точні суми (без накопичення округлень)
+            self._sum_abs, self._sum_sq = float(self._abs.sum()), float(self._sq.sum())
+
+    @property
+    def mae(self):
+        n = min(self.count, self.window)
+        return self._sum_abs / n if n else float("nan")
+
+    @property
+    def rmse(self):
+        n = min(self.count, self.window)
+        return math.sqrt(max(self._sum_sq, 0.0) / n) if n else float("nan")
+
+class PageHinkley:
+    """
+    Тест Пейджа–Хінклі на зростання середнього потоку (абсолютних похибок), O(1) на значення.
+    Перші warmup значень задають масштаб (середня похибка), далі значення нормуються на нього:
+    delta — допустиме зростання, threshold — поріг накопиченого відхилення (у середніх похибках).
+    """
+
+    def __init__(self, delta=ONLINE_DRIFT_DELTA, threshold=ONLINE_DRIFT_THRESHOLD, warmup=ONLINE_WINDOW):
+        self.delta, self.threshold, self.warmup = delta, threshold, warmup
+        self.reset()
+
+    def reset(self):
+        """Починає тест заново (після заміни моделі)."""
+        self.n, self.scale, self.mean, self.cum, self.low = 0, 0.0, 0.0, 0.0, 0.0
+
+    def add(self, x):
+        """Додає значення; True — виявлено дрейф."""
+        self.n += 1
+        if self.n <= self.warmup:              # Масштаб — середнє перших warmup значень
+            self.scale += (x - self.scale) / self.n
+            return False
+        x = x / self.scale if self.scale > 0 else x
+        k = self.n - self.warmup
+        self.mean += (x - self.mean) / k
+        self.cum += x - self.mean - self.delta
+        self.low = min(self.low, self.cum)
+        return self.cum - self.low > self.threshold
+
+class RecentRows:
+    """Кільцевий буфер останніх capacity рядків (X, y) — дані повторного GA."""
+
+    def __init__(self, capacity, n_cols, dtype=np.float32):
+        self.capacity = int(capacity)
+        self.X = np.empty((self.capacity, n_cols), dtype=dtype)
+        self.y = np.empty(self.capacity, dtype=dtype)
+        self._pos = 0
+        self.size = 0
+
+    def extend(self, X, y):
+        n = len(y)
+        if n >= self.capacity:                 # Старші рядки все одно витіснились би
+            X, y, n = X[n - self.capacity:], y[n - self.capacity:], self.capacity
+        first = min(n, self.capacity - self._pos)
+        self.X[self._pos:self._pos + first], self.y[self._pos:self._pos + first] = X[:first], y[:first]
+        self.X[:n - first], self.y[:n - first] = X[first:], y[first:]
+        self._pos = (self._pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def arrays(self):
+        """Рядки у хронологічному порядку (неперервні копії)."""
+        if self.size < self.capacity:
+            return self.X[:self.size].copy(), self.y[:self.size].copy()
+        return (np.concatenate([self.X[self._pos:], self.X[:self._pos]]),
+                np.concatenate([self.y[self._pos:], self.y[:self._pos]]))
+
+def follow_lines(path, follow=False, poll=1.0, cancel=None, from_end=False):
+    """
+    Рядки текстового файлу path. follow=True — як tail -f: на кінці файлу чекає poll секунд
+    і читає дописане (неповний останній рядок — лише після переводу рядка). Коли нових рядків
+    немає, віддає None — сигнал обробити накопичене. from_end — перший рядок (заголовок),
+    далі лише дописане після відкриття.
+    """
+    with open(path, encoding="utf-8") as f:
+        yield f.readline()
+        if from_end:
+            f.seek(0, 2)
+        part = ""
+        while cancel is None or not cancel.cancelled:
+            line = f.readline()
+            if line.endswith("\n"):
+                yield part + line
+                part = ""
+                continue
+            part += line
+            if not follow:
+                if part.strip():
+                    yield part
+                return
+            yield None
+            time.sleep(poll)
+
+def stream_lines(stream, cancel=None):
+    """Рядки потоку (stdin): кожен рядок — одразу в обробку (None після нього)."""
+    for line in iter(stream.readline, ""):
+        if cancel is not None and cancel.cancelled:
+            return
+        yield line
+        yield None
+
+class OnlineLearner:
+    """
+    Онлайн-донавчання моделі датасету dataset з реєстру registry.
+    name, version – модель (None — остання версія з найменшим MAE; якщо моделей немає —
+                    вона синтезується етапом mode на останніх retrain_rows рядках історії)
+    history       – скільки перших рядків датасету вважати вже відомою історією (None — усі)
+    update_rows   – рядків між викликами partial_fit; epochs — епох на кожен виклик
+    retrain       – дозволити повторний GA після дрейфу (retrain_gens поколінь, популяція pop_size);
+                    між повторними GA — щонайменше retrain_cooldown рядків, кожен GA — свій потік seed
+    on_event      – on_event(kind, **дані): події online, update, drift, retrain, saved
+    """
+
+    def __init__(self, dataset, registry=None, name=None, version=None, history=None, derived=True,
+                 mode="features", update_rows=ONLINE_UPDATE_ROWS, epochs=ONLINE_EPOCHS,
+                 window=ONLINE_WINDOW, retrain=True, retrain_rows=ONLINE_RETRAIN_ROWS,
+                 retrain_gens=ONLINE_RETRAIN_GENS, retrain_cooldown=ONLINE_RETRAIN_COOLDOWN,
+                 pop_size=8, max_iter=100, cv_splits=3, seed=0,
+                 drift_delta=ONLINE_DRIFT_DELTA, drift_threshold=ONLINE_DRIFT_THRESHOLD,
+                 evaluator=None, cancel=None, on_event=None):
+        from datasets import load_dataset, dataset_info, feature_engine
+        self.dataset = dataset
+        self.registry = registry or ModelRegistry()
+        self.update_rows, self.epochs = int(update_rows), int(epochs)
+        self.retrain, self.retrain_gens, self.retrain_cooldown = retrain, retrain_gens, int(retrain_cooldown)
+        self.ga = {"pop_size": pop_size, "max_iter": max_iter, "cv_splits": cv_splits}
+        self.seed, self.evaluator, self.cancel = seed, evaluator, cancel
+        self.on_event = on_event or (lambda kind, **data: None)
+        self.errors = RollingErrors(window)
+        self.detector = PageHinkley(drift_delta, drift_threshold, window)
+
+        model = self._find(name, version)
+        X, y, cols = load_dataset(dataset, target=model.meta.get("target") if model else None)
+        self.target = dataset_info(dataset, target=model.meta.get("target") if model else None)["target"]
+        self.base_cols = list(cols)
+        h = len(y) if history is None else min(int(history), len(y))
+        self.engine = feature_engine(dataset, self.target) if derived or (
+            model is not None and any(f not in cols for f in model.features)) else None
+        if self.engine is not None:            # Історія: хвіст цілі для лагів/вікон і останні рядки для GA
+            self.engine.prime(y[:h])
+            Xd, yd, self.columns = load_dataset(dataset, target=self.target, derived=True)
+            end = max(h - self.engine.history, 0)
+        else:
+            Xd, yd, self.columns, end = X, y, self.base_cols, h
+        self.recent = RecentRows(retrain_rows, len(self.columns))
+        self.recent.extend(Xd[max(end - retrain_rows, 0):end], yd[max(end - retrain_rows, 0):end])
+        self.rows = self.updates = self.retrains = 0
+        self._pending = []                     # Рядки (X, y) до наступного partial_fit
+        self._pending_rows = 0
+        self._retrained_at = None              # Рядок потоку останнього повторного GA
+        if model is None:
+            model = self._synthesize(mode)
+        self._use(model)
+
+    def _find(self, name, version):
+        try:
+            return self.registry.load(self.dataset, name, version)
+        except ValueError:
+            if name is not None:               # Названої моделі немає — це помилка, а не порожній реєстр
+                raise
+            return None
+
+    def _use(self, model):
+        """Робоча модель: прогноз — RegisteredModel, донавчання — LayeredMLPRegressor з її ваг."""
+        missing = [f for f in model.features if f not in self.columns]
+        if missing:
+            raise ValueError(f"❌ У потоці немає ознак моделі: {', '.join(missing)}")
+        meta = model.meta
+        self.model = model
+        self.net = LayeredMLPRegressor(meta["hidden"], meta["activations"], lr=meta.get("lr", DEFAULT_LR),
+                                       alpha=meta.get("alpha", DEFAULT_ALPHA), random_state=self.seed,
+                                       init=(model.coefs, model.intercepts))
+        self._idx = [self.columns.index(f) for f in model.features]
+        # Недонавчені рядки зрізані колонками попередньої моделі; нова вже навчалась на них (буфер recent)
+        self._pending, self._pending_rows = [], 0
+        self.detector.reset()
+        self.on_event("online", model=meta["name"], version=meta["version"], stage=meta["stage"],
+                      features=list(model.features), history_rows=self.recent.size)
+
+    def _synthesize(self, mode, reason="bootstrap"):
+        """Обмежений запуск GA етапу mode на останніх рядках і нова версія моделі в реєстрі."""
+        from static.mode_config import MODE_CONFIG
+        from registry import model_specs
+        X, y = self.recent.arrays()
+        cols = list(self.columns)
+        extra = {}
+        if mode != "features" and getattr(self, "model", None) is not None:
+            idx = [cols.index(f) for f in self.model.features]
+            X, cols = np.ascontiguousarray(X[:, idx]), list(self.model.features)
+        if mode in ("structure", "opt") and getattr(self, "model", None) is not None:
+            extra = {"lr": self.model.meta.get("lr", DEFAULT_LR), "alpha": self.model.meta.get("alpha", DEFAULT_ALPHA)}
+        t = time.perf_counter()
+        seed = np.random.SeedSequence(self.seed, spawn_key=(self.retrains,)) # Кожен повторний GA — новий потік
+        kwargs = dict(self.ga, n_gen=self.retrain_gens, evaluator=self.evaluator, cancel=self.cancel, seed=seed,
+                      pop_size=self.ga["pop_size"] + (2 if mode == "opt" else 0), **extra)
+        func = MODE_CONFIG[mode]["func"]
+        result = func(X, y, cols, **kwargs) if mode == "features" else func(X, y, **kwargs)
+        saved = self.registry.register(self.dataset, mode, result, X, y, cols, target=self.target,
+                                       max_iter=self.ga["max_iter"], random_state=self.seed, **extra)
+        maes = {name: m["mae"] for name, _, m in model_specs(mode, result, cols, **extra)}
+        name, version = min(saved, key=lambda s: maes[s[0]])
+        self.retrains += 1
+        self.on_event("retrain", reason=reason, mode=mode, rows=len(y), model=name, version=version,
+                      mae=maes[name], seconds=time.perf_counter() - t)
+        return self.registry.load(self.dataset, name, version)
+
+    def feed(self, X_new, y_new):
+        """
+        Нові рядки ряду (базові колонки датасету і ціль): прогноз, похибки, донавчання кожні
+        update_rows рядків і повторний GA після дрейфу. Межі викликів partial_fit не залежать
+        від того, якими порціями приходять рядки.
+        """
+        X, y = (self.engine.update(X_new, y_new) if self.engine is not None
+                else (np.asarray(X_new, np.float32), np.asarray(y_new, np.float32)))
+        i, drift = 0, None
+        while i < len(y):
+            j = min(len(y), i + self.update_rows - self._pending_rows)
+            Xs, ys = X[i:j], y[i:j]
+            err = self.predict(Xs) - ys
+            for k, e in enumerate(err):
+                self.errors.add(e)
+                if self.detector.add(abs(float(e))) and drift is None:
+                    drift = self.rows + i + k
+            self.recent.extend(Xs, ys)
+            self._pending.append((Xs[:, self._idx], ys))
+            self._pending_rows += j - i
+            if self._pending_rows >= self.update_rows:
+                self._update(self.rows + j)
+            i = j
+        self.rows += len(y)
+        if drift is not None:
+            cooling = self._retrained_at is not None and drift - self._retrained_at < self.retrain_cooldown
+            self.on_event("drift", row=drift, mae=self.errors.mae, rmse=self.errors.rmse,
+                          retrain=self.retrain and not cooling)
+            if self.retrain and not cooling:
+                self._use(self._synthesize(self.model.meta["stage"], reason="drift"))
+                self._retrained_at = self.rows
+            else:                              # Без GA: модель донавчається далі, тест — з нового розігріву
+                self.detector.reset()
+        return len(y)
+
+    def predict(self, X):
+        """Прогноз поточною (донавченою) моделлю для рядків з колонками self.columns."""
+        return self.model.predict(X, columns=self.columns)
+
+    def _update(self, rows):
+        """partial_fit на накопичених рядках (rows — оброблено рядків потоку); прогноз далі — з оновлених ваг."""
+        X = np.concatenate([p[0] for p in self._pending])
+        y = np.concatenate([p[1] for p in self._pending])
+        t = time.perf_counter()
+        self.net.partial_fit(X, y, epochs=self.epochs)
+        self.model = RegisteredModel(self.net.coefs_, self.net.intercepts_, self.model.meta)
+        self.updates += 1
+        self._pending, self._pending_rows = [], 0
+        self.on_event("update", rows=rows, batch=len(y), mae=self.errors.mae,
+                      rmse=self.errors.rmse, seconds=time.perf_counter() - t)
+
+    def save(self):
+        """Донавчена модель — новою версією в реєстрі (метрики — ковзні MAE/RMSE потоку)."""
+        if not self.updates:
+            return None
+        meta = {k: v for k, v in self.model.meta.items()
+                if k not in ("format", "dataset", "name", "version", "layers")}
+        meta.update(metrics={"mae": self.errors.mae, "rmse": self.errors.rmse},
+                    online={"rows": self.rows, "updates": self.updates, "retrains": self.retrains,
+                            "window": self.errors.window}, created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        name = self.model.meta["name"]
+        version = self.registry.save(self.dataset, name, self.model.coefs, self.model.intercepts, meta)
+        self.on_event("saved", model=name, version=version, mae=self.errors.mae, rmse=self.errors.rmse)
+        return name, version
+
+    def run(self, lines, chunk_rows=1024, save_every=0):
+        """
+        Обробляє рядки CSV з lines (перший — заголовок; None — обробити накопичене).
+        Потрібні базові колонки датасету і колонка цілі; рядки, що не розбираються, пропускаються.
+        save_every – зберігати донавчену модель кожні save_every викликів partial_fit (0 — лише наприкінці).
+        Повертає кількість пропущених рядків.
+        """
+        lines = iter(lines)
+        header = next(lines, None)
+        if not header:
+            return 0
+        names = [c.strip() for c in header.strip().split(",")]
+        missing = [c for c in self.base_cols + [self.target] if c not in names]
+        if missing:
+            raise ValueError(f"❌ У потоці немає колонок: {', '.join(missing)}")
+        idx = [names.index(c) for c in self.base_cols]
+        t_idx = names.index(self.target)
+        buf, skipped, saved_at = [], 0, 0
+        def flush():
+            nonlocal buf, saved_at
+            if buf:
+                rows = np.asarray(buf, dtype=np.float32)
+                buf = []
+                self.feed(rows[:, idx], rows[:, t_idx])
+            if save_every and self.updates - saved_at >= save_every:
+                saved_at = self.updates
+                self.save()
+        for line in lines:
+            if self.cancel is not None and self.cancel.cancelled:
+                break
+            if line is None or len(buf) >= chunk_rows:
+                flush()
+            if line is None or not line.strip():
+                continue
+            try:
+                values = [float(v) for v in line.split(",")]
+            except ValueError:
+                values = None
+            if values is None or len(values) != len(names):
+                skipped += 1
+                continue
+            buf.append(values)
+        flush()
+        self.save()
+        return skipped
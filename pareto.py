@@ -0,0 +1,126 @@
+"""
+Векторизовані операції NSGA-II над матрицею цілей F (n рішень × m цілей, усі мінімізуються):
+- non_dominated_sort — швидке сортування за фронтами (ранг 0 — недоміновані)
+- crowding_distance  — відстань скупченості всередині фронту
+- nsga2_order / select_survivors — відбір за (ранг, −скупченість)
+- ParetoArchive      — обмежений архів еліти, що зберігається між поколіннями
+Кількість цілей довільна (MAE, RMSE, кількість параметрів, час навчання…).
+"""
+
+import numpy as np                             # numpy — матриця цілей і векторизовані порівняння
+
+def dominance_matrix(F):
+    """D[i, j] = True, якщо рішення i домінує над j (не гірше за всіма цілями і краще хоча б за однією)."""
+    F = np.asarray(F, dtype=float)
+    le = (F[:, None, :] <= F[None, :, :]).all(axis=2)
+    lt = (F[:, None, :] < F[None, :, :]).any(axis=2)
+    return le & lt
+
+def non_dominated_sort(F):
+    """
+    Швидке недоміноване сортування (Deb et al., 2002) без циклів по парах:
+    фронти «знімаються» шарами за лічильником домінуючих рішень.
+    Повертає масив рангів (0 — перший Парето-фронт).
+    """
+    F = np.asarray(F, dtype=float)
+    n = F.shape[0]
+    ranks = np.full(n, -1, dtype=int)
+    if n == 0:
+        return ranks
+    D = dominance_matrix(F)
+    counts = D.sum(axis=0)                     # Скільки рішень домінує над кожним
+    rank = 0
+    front = np.flatnonzero(counts == 0)
+    while front.size:
+        ranks[front] = rank
+        counts = counts - D[front].sum(axis=0) # Знімаємо домінування поточного фронту
+        counts[ranks >= 0] = -1                # Уже розподілені не потрапляють у наступний фронт
+        front = np.flatnonzero(counts == 0)
+        rank += 1
+    return ranks
+
+def crowding_distance(F):
+    """
+    Відстань скупченості для рішень одного фронту: сума нормованих відстаней
+    між сусідами за кожною ціллю; крайні рішення отримують inf.
+    """
+    F = np.asarray(F, dtype=float)
+    n, m = F.shape
+    if n <= 2:
+        return np.full(n, np.inf)
+    order = np.argsort(F, axis=0, kind="stable")   # Порядок рішень за кожною ціллю
+    Fs = np.take_along_axis(F, order, axis=0)
+    span = Fs[-1] - Fs[0]
+    span[span == 0] = np.inf                   # Ціль без розкиду не впливає на відстань
+    dist = np.zeros((n, m))
+    np.put_along_axis(dist, order[1:-1], (Fs[2:] - Fs[:-2]) / span, axis=0)
+    np.put_along_axis(dist, order[[0, -1]], np.inf, axis=0)
+    return dist.sum(axis=1)
+
+def rank_and_crowding(F):
+    """Ранги фронтів і відстань скупченості кожного рішення (у межах свого фронту)."""
+    F = np.asarray(F, dtype=float)
+    ranks = non_dominated_sort(F)
+    crowd = np.zeros(len(ranks))
+    for r in np.unique(ranks):
+        idx = np.flatnonzero(ranks == r)
+        crowd[idx] = crowding_distance(F[idx])
+    return ranks, crowd
+
+def nsga2_order(ranks, crowd):
+    """Індекси від найкращого до найгіршого: менший ранг, потім більша скупченість."""
+    return np.lexsort((-crowd, ranks))
+
+def select_survivors(F, k):
+    """Індекси k рішень, що переходять у наступне покоління (елітизм NSGA-II)."""
+    ranks, crowd = rank_and_crowding(F)
+    return nsga2_order(ranks, crowd)[:k]
+
+def tournament(ranks, crowd, n, rng):
+    """Бінарний турнір за (ранг, −скупченість): n індексів переможців (rng — np.random.Generator)."""
+    a, b = rng.integers(len(ranks), size=(2, n))
+    a_wins = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (crowd[a] >= crowd[b]))
+    return np.where(a_wins, a, b)
+
+class ParetoArchive:
+    """
+    Обмежений архів недомінованих рішень за весь запуск.
+    maxsize    – максимальний розмір; надлишок відкидається за найменшою скупченістю
+                 (по одному, з перерахунком), щоб зберегти розкид фронту
+    objectives – назви цілей (ключі словників рішень)
+    key        – функція рішення → генотип (дублікати генотипів не зберігаються)
+    """
+
+    def __init__(self, maxsize, objectives, key):
+        self.maxsize = maxsize
+        self.objectives = tuple(objectives)
+        self.key = key
+        self.items = []                        # Рішення архіву (словники)
+
+    def matrix(self, items=None):
+        """Матриця цілей рішень items (за замовчуванням — архіву)."""
+        items = self.items if items is None else items
+        return np.array([[float(c[o]) for o in self.objectives] for c in items]).reshape(len(items), -1)
+
+    def update(self, candidates):
+        """Додає кандидатів і лишає недоміновані; повертає поточний вміст архіву."""
+        merged, seen = [], set()
+        for c in self.items + list(candidates):
+            k = self.key(c)
+            if k not in seen:
+                seen.add(k)
+                merged.append(c)
+        if not merged:
+            return self.items
+        F = self.matrix(merged)
+        keep = np.flatnonzero(~dominance_matrix(F).any(axis=0))  # Недоміновані в об'єднанні
+        while len(keep) > self.maxsize:        # Прибираємо найбільш скупчене рішення
+            keep = np.delete(keep, int(np.argmin(crowding_distance(F[keep]))))
+        self.items = [merged[i] for i in keep]
+        return self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
@@ -0,0 +1,72 @@
+"""
+Конвеєр етапів синтезу: результат попереднього етапу — вхід наступного для того самого датасету.
+- features → маска ознак: params, structure і opt навчаються на зменшеній матриці X
+  (зрізається один раз у неперервний масив і спільна для всіх наступних етапів)
+- params → lr і alpha: structure і opt навчають кожну модель з ними
+Послідовно (run_all_modes, консольний --pipeline) стан тримає Pipeline; у паралельній
+серії залежності PIPELINE_DEPENDS передаються у scheduler.plan_jobs, а результати
+попередників приходять у задачу як upstream.
+"""
+
+import hashlib                                 # hashlib — суфікс контрольної точки за входами конвеєра
+import numpy as np                             # numpy — маска і зріз матриці ознак
+
+# Етап → етапи, результати яких він споживає
+PIPELINE_DEPENDS = {"params": ("features",),
+                    "structure": ("features", "params"),
+                    "opt": ("features", "params")}
+
+def reduce_features(X, cols, mask):
+    """
+    Стовпці X за маскою ознак → (неперервна копія X, назви вибраних ознак).
+    Порожня або повна маска — X без змін.
+    """
+    idx = np.flatnonzero(np.asarray(mask) == 1)
+    if idx.size == 0 or idx.size == X.shape[1]:
+        return X, list(cols)
+    return np.ascontiguousarray(X[:, idx]), [cols[i] for i in idx]
+
+def pipeline_tag(info):
+    """Суфікс файлу контрольної точки: запуски з різними входами конвеєра не змішуються."""
+    if not info:
+        return ""
+    return "_p" + hashlib.sha1(repr(sorted(info.items())).encode()).hexdigest()[:8]
+
+class Pipeline:
+    """
+    Стан конвеєра одного датасету: результати завершених етапів і зменшена матриця X.
+    upstream – {етап: результат} уже виконаних етапів (наприклад, від планувальника)
+    """
+
+    def __init__(self, upstream=None):
+        self.upstream = dict(upstream or {})
+        self._reduced = None                   # (ключ маски, X, cols): зріз спільний для наступних етапів
+
+    def record(self, mode, result):
+        """Запам'ятовує результат завершеного етапу."""
+        self.upstream[mode] = result
+
+    def missing(self, mode, modes):
+        """Попередники mode з modes, результатів яких немає (етап не виконано)."""
+        return [d for d in PIPELINE_DEPENDS.get(mode, ()) if d in modes and d not in self.upstream]
+
+    def inputs(self, mode, X, cols):
+        """
+        Вхід етапу mode: (X, cols, додаткові kwargs функції етапу, опис входу).
+        Опис — {"features": [...], "lr": …, "alpha": …} для логу, подій і pipeline_tag;
+        відсутні попередники не застосовуються.
+        """
+        kwargs, info = {}, {}
+        features = self.upstream.get("features") if mode != "features" else None
+        if isinstance(features, dict) and "mask" in features:
+            mask = np.asarray(features["mask"], dtype=np.int8)
+            key = (id(X), mask.tobytes())
+            if self._reduced is None or self._reduced[0] != key:
+                self._reduced = (key, *reduce_features(X, cols, mask))
+            X, cols = self._reduced[1], self._reduced[2]
+            info["features"] = list(cols)
+        params = self.upstream.get("params") if mode in ("structure", "opt") else None
+        if isinstance(params, dict) and "lr" in params:
+            kwargs.update(lr=float(params["lr"]), alpha=float(params["alpha"]))
+            info.update(kwargs)
+        return X, cols, kwargs, info
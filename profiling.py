@@ -0,0 +1,191 @@
+"""
+Інструментування часу етапів GA: реєстр таймерів і профілювання запуску.
+- timer(name) — контекстний менеджер, timed(name) — декоратор: додають час
+  до іменованого лічильника реєстру TIMERS (кількість викликів і сума секунд)
+- вимкнений реєстр (за замовчуванням) не міряє нічого: timer повертає спільний
+  порожній контекст, timed — одразу викликає функцію
+- mark()/lap() дають приріст лічильників між двома моментами (наприклад, за покоління)
+- profile_run — cProfile або pyinstrument (якщо встановлено) для всього запуску
+
+Назви лічильників: data.load, data.ingest, fold.slice, model.fit, model.predict,
+model.metrics, ga.evaluate, ga.breed, ga.checkpoint, surrogate.select, gui.log,
+registry.fit, registry.load, registry.predict.
+Лічильники вкладені (ga.evaluate містить model.* і fold.slice послідовного
+оцінювача), тож частки рахуються від загального часу запуску, а не від їхньої суми.
+Час, виміряний у воркерах пулу процесів, повертається разом з результатом
+задачі (evaluators.py).
+"""
+
+import functools, json, os, threading, time    # functools — декоратор, json — вивантаження, threading — блокування
+from contextlib import contextmanager, nullcontext # nullcontext — таймер вимкненого реєстру
+
+PROFILERS = ("cprofile", "pyinstrument")       # Доступні профайлери запуску
+
+_NULL = nullcontext()                          # Спільний порожній контекст: без виділень при вимкненому реєстрі
+
+class _Span:
+    """Вимірювання одного блоку коду (контекст timer)."""
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry, self.name = registry, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.add(self.name, time.perf_counter() - self.start)
+
+class TimerRegistry:
+    """
+    Потокобезпечний реєстр таймерів: назва → [кількість, сума секунд].
+    enabled=False — таймери нічого не вимірюють.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, count=1):
+        """Додає виміряний час до лічильника name."""
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                self._stats[name] = [count, seconds]
+            else:
+                entry[0] += count
+                entry[1] += seconds
+
+    def timer(self, name):
+        """Контекстний менеджер, що додає час блоку до лічильника name."""
+        return _Span(self, name) if self.enabled else _NULL
+
+    def merge(self, stats):
+        """Додає лічильники у форматі stats() (наприклад, виміряні у воркері)."""
+        for name, s in (stats or {}).items():
+            self.add(name, s["total_s"], s["count"])
+
+    def stats(self):
+        """Копія лічильників: {назва: {"count", "total_s", "mean_s"}}."""
+        with self._lock:
+            return {name: {"count": n, "total_s": t, "mean_s": t / n if n else 0.0}
+                    for name, (n, t) in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+TIMERS = TimerRegistry()                       # Реєстр процесу (вмикається enable())
+
+def enable(on=True, reset=True):
+    """Вмикає (або вимикає) таймери; reset=True — лічильники обнуляються."""
+    if reset:
+        TIMERS.reset()
+    TIMERS.enabled = on
+
+def is_enabled():
+    return TIMERS.enabled
+
+def timer(name):
+    """Контекстний менеджер таймера name у реєстрі TIMERS."""
+    return TIMERS.timer(name)
+
+def timed(name):
+    """Декоратор: час кожного виклику функції додається до лічильника name."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TIMERS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                TIMERS.add(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def stats():
+    """Поточні лічильники реєстру TIMERS."""
+    return TIMERS.stats()
+
+def mark():
+    """Знімок лічильників для lap() (None, якщо таймери вимкнені)."""
+    return TIMERS.stats() if TIMERS.enabled else None
+
+def since(before):
+    """Приріст лічильників від знімка before (лише ті, що змінились)."""
+    delta = {}
+    for name, s in TIMERS.stats().items():
+        prev = (before or {}).get(name, {"count": 0, "total_s": 0.0})
+        n, t = s["count"] - prev["count"], s["total_s"] - prev["total_s"]
+        if n:
+            delta[name] = {"count": n, "total_s": t, "mean_s": t / n}
+    return delta
+
+def lap(before):
+    """
+    Приріст від знімка before і новий знімок: timings, before = lap(before).
+    Якщо таймери вимкнені — (None, None).
+    """
+    if not TIMERS.enabled:
+        return None, None
+    after = TIMERS.stats()
+    return since(before), after
+
+def format_table(timings, wall_s=None):
+    """
+    Таблиця лічильників (від найдовших) для логу або консолі.
+    wall_s – загальний час запуску: додає колонку частки від нього
+    """
+    if not timings:
+        return "(таймери вимкнені або нічого не виміряно)"
+    head = f"{'етап':16s} {'викликів':>9s} {'сума, с':>10s} {'середнє, мс':>12s}"
+    lines = [head + (f" {'частка':>7s}" if wall_s else "")]
+    for name, s in sorted(timings.items(), key=lambda kv: -kv[1]["total_s"]):
+        line = f"{name:16s} {s['count']:9d} {s['total_s']:10.3f} {s['mean_s'] * 1e3:12.3f}"
+        lines.append(line + (f" {s['total_s'] / wall_s:7.1%}" if wall_s else ""))
+    return "\n".join(lines)
+
+def write_json(timings, path):
+    """Записує лічильники у JSON і повертає шлях."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(timings, f, ensure_ascii=False, indent=1)
+    return path
+
+@contextmanager
+def profile_run(path, profiler="cprofile"):
+    """
+    Профілює блок коду і записує результат у path:
+    cprofile — файл pstats (python -m pstats path, snakeviz);
+    pyinstrument — HTML (path *.html) або текстовий звіт.
+    Профілюється лише поточний потік (воркери пулу процесів — ні).
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"❌ Невідомий профайлер: {profiler} (доступні: {', '.join(PROFILERS)})")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if profiler == "cprofile":
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield prof
+        finally:
+            prof.disable()
+            prof.dump_stats(path)
+        return
+    try:
+        from pyinstrument import Profiler        # Необов'язкова залежність
+    except ImportError:
+        raise ImportError("❌ pyinstrument не встановлено (pip install pyinstrument)") from None
+    prof = Profiler()
+    prof.start()
+    try:
+        yield prof
+    finally:
+        prof.stop()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(prof.output_html() if path.endswith(".html") else prof.output_text())
@@ -0,0 +1,64 @@
+"""
+Шина подій прогресу GA: потокобезпечна черга структурованих подій.
+GA (у фоновому потоці) публікує події, а споживач (GUI за таймером,
+консоль, тести) забирає їх пакетами через drain(). Публікація не блокує
+обчислення і не залежить від Tkinter.
+
+Події — словники з полями "kind", "t" (time.time()) і даними події:
+- generation — кінець покоління: gen, gens, mae, rmse, extra, seconds, fits, fidelity,
+  timings (приріст таймерів profiling від попередньої події generation; None — вимкнені)
+- candidate  — оцінена особина: gen, index, mae, rmse, genotype, budget
+- surrogate  — відсіювання нащадків сурогатом: gen, model, screened, selected, skipped, fits
+- log, row   — повідомлення і рядки таблиці GUI
+"""
+
+import threading, time                         # threading — блокування, time — мітки часу
+from collections import deque                  # deque — черга з O(1) додаванням і вийманням
+
+class ProgressBus:
+    """
+    Потокобезпечна черга подій прогресу.
+    maxlen – максимальна довжина черги (None — без обмеження); при переповненні
+             найстаріші події відкидаються, щоб повільний споживач не накопичував пам'ять
+    """
+
+    def __init__(self, maxlen=None):
+        self._queue = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.published = 0                     # Скільки подій опубліковано за весь час
+
+    def publish(self, kind, **fields):
+        """Додає подію у чергу (викликається з будь-якого потоку)."""
+        event = {"kind": kind, "t": time.time(), **fields}
+        with self._lock:
+            self._queue.append(event)
+            self.published += 1
+        return event
+
+    def drain(self, max_items=None):
+        """Забирає до max_items подій (None — усі) у порядку публікації."""
+        with self._lock:
+            n = len(self._queue) if max_items is None else min(max_items, len(self._queue))
+            return [self._queue.popleft() for _ in range(n)]
+
+    def __len__(self):
+        return len(self._queue)
+
+    def bind(self, **context):
+        """Публікатор, що додає до кожної події поля context (наприклад, dataset і mode)."""
+        return BoundPublisher(self, context)
+
+class BoundPublisher:
+    """Обгортка шини з фіксованим контекстом подій."""
+
+    def __init__(self, bus, context):
+        self.bus = bus
+        self.context = context
+
+    def publish(self, kind, **fields):
+        return self.bus.publish(kind, **{**self.context, **fields})
+
+def publish(events, kind, **fields):
+    """Публікує подію, якщо шину передано (events=None — GA працює без шини)."""
+    if events is not None:
+        events.publish(kind, **fields)
@@ -0,0 +1,222 @@
+"""
+Локальний реєстр навчених моделей прогнозу і пакетний прогноз без повторного запуску GA.
+- register — найкраща модель етапу (для opt — кожна модель Парето-фронту) перенавчається
+  на всьому ряді і зберігається новою версією: <root>/<датасет>/<назва>/v0001.npz + .json
+- у .npz — ваги і зсуви шарів (float32), у .json — метадані: відбиток датасету, ознаки,
+  ціль, архітектура, lr/alpha, масштабування ознак (None — моделі навчаються на сирих
+  значеннях), метрики крос-валідації етапу
+- predict(dataset_key, X) — моделі завантажуються ліниво, гарячі тримаються в пам'яті (LRU),
+  прогноз рахується блоками рядків матричними множеннями NumPy у передвиділені буфери
+Назва моделі — етап (features, params, structure) або opt-<номер> для моделей фронту;
+без явної назви береться остання версія з найменшим MAE.
+"""
+
+import json, os, threading, time              # json — метадані, threading — блокування гарячих моделей
+from collections import OrderedDict            # OrderedDict — LRU гарячих моделей
+import numpy as np                             # numpy — ваги і прогноз
+from eval_core import make_model, _activate, DEFAULT_LR, DEFAULT_ALPHA # Модель етапу і активації шарів
+from fitness_cache import dataset_fingerprint  # Відбиток датасету для метаданих
+from profiling import timer                    # Таймери registry.fit, registry.load, registry.predict
+from static.constants import MODEL_REGISTRY_DIR, MODEL_HOT_SIZE, PREDICT_BATCH_ROWS # Налаштування реєстру
+
+REGISTRY_FORMAT = 1                            # Версія формату записів реєстру
+
+def model_specs(mode, result, cols, lr=DEFAULT_LR, alpha=DEFAULT_ALPHA):
+    """
+    Моделі результату етапу: список (назва, архітектура, метрики).
+    Архітектура — {"features", "hidden", "activations", "lr", "alpha"}, як її навчав етап;
+    lr, alpha — для structure і opt (у конвеєрі — з етапу params).
+    """
+    if mode == "features":
+        features = [c for c, m in zip(cols, result["mask"]) if m == 1]
+        return [("features", {"features": features, "hidden": [32], "activations": ["relu"],
+                              "lr": DEFAULT_LR, "alpha": DEFAULT_ALPHA},
+                 {"mae": result["mae"], "rmse": result["rmse"]})]
+    if mode == "params":
+        return [("params", {"features": list(cols), "hidden": [int(result["hidden"])], "activations": ["relu"],
+                            "lr": float(result["lr"]), "alpha": float(result["alpha"])},
+                 {"mae": result["mae"], "rmse": result["rmse"]})]
+    if mode == "structure":
+        return [("structure", {"features": list(cols), "hidden": [int(w) for w in result["neurons"]],
+                               "activations": list(result["activations"]), "lr": lr, "alpha": alpha},
+                 {"mae": result["mae"], "rmse": result["rmse"], "params": result["params"],
+                  "latency_ms": result["latency_ms"]})]
+    if mode == "opt":
+        return [(f"opt-{i}", {"features": list(cols), "hidden": [int(c["neurons"])] * int(c["layers"]),
+                              "activations": ["relu"] * int(c["layers"]), "lr": lr, "alpha": alpha},
+                 {k: c[k] for k in ("mae", "rmse", "params", "fit_time") if k in c})
+                for i, c in enumerate(result)]
+    raise ValueError(f"❌ Невідомий етап: {mode}")
+
+def refit(X, y, cols, spec, max_iter=200, random_state=0):
+    """Перенавчає модель архітектури spec на всьому ряді; повертає (coefs, intercepts, секунди)."""
+    idx = [list(cols).index(f) for f in spec["features"]]
+    X_fit = X if len(idx) == X.shape[1] else np.ascontiguousarray(X[:, idx])
+    model = make_model(spec["hidden"], spec["activations"], lr=spec["lr"], alpha=spec["alpha"],
+                       max_iter=max_iter, random_state=random_state)
+    with timer("registry.fit"):
+        t = time.perf_counter()
+        model.fit(X_fit, y)
+        seconds = time.perf_counter() - t
+    return list(model.coefs_), list(model.intercepts_), seconds
+
+class RegisteredModel:
+    """Модель з реєстру: ваги шарів, активації і метадані; прогноз — чистий NumPy."""
+
+    def __init__(self, coefs, intercepts, meta):
+        self.coefs, self.intercepts, self.meta = coefs, intercepts, meta
+        self.activations = list(meta["activations"])
+        self.features = list(meta["features"])
+        self.dtype = coefs[0].dtype
+
+    def predict(self, X, columns=None, batch_rows=PREDICT_BATCH_ROWS):
+        """
+        Прогноз для рядків X (форма (n,)).
+        X       – ознаки моделі у порядку meta["features"] або ширша матриця з назвами колонок columns
+        columns – назви колонок X (потрібні, якщо X має інші колонки, ніж модель)
+        """
+        X = np.asarray(X)
+        idx = None
+        if X.shape[1] != len(self.features) or (columns is not None and list(columns) != self.features):
+            if columns is None:
+                raise ValueError(f"❌ Модель очікує {len(self.features)} ознак ({', '.join(self.features)}), "
+                                 f"отримано {X.shape[1]} колонок без назв")
+            missing = [f for f in self.features if f not in columns]
+            if missing:
+                raise ValueError(f"❌ У даних немає ознак моделі: {', '.join(missing)}")
+            idx = [list(columns).index(f) for f in self.features]
+        n = X.shape[0]
+        out = np.empty(n, dtype=self.dtype)
+        rows = max(1, min(batch_rows, n))
+        bufs = [np.empty((rows, W.shape[1]), dtype=self.dtype) for W in self.coefs] # Буфери шарів на блок
+        last = len(self.coefs) - 1
+        with timer("registry.predict"):
+            for start in range(0, n, rows):
+                A = X[start:start + rows]
+                if idx is not None:
+                    A = A[:, idx]
+                A = A.astype(self.dtype, copy=False)
+                m = A.shape[0]
+                for i, (W, b) in enumerate(zip(self.coefs, self.intercepts)):
+                    Z = np.matmul(A, W, out=bufs[i][:m])
+                    Z += b
+                    if i < last:               # Вихідний шар — тотожний
+                        _activate(self.activations[i], Z)
+                    A = Z
+                out[start:start + m] = A[:, 0]
+        return out
+
+class ModelRegistry:
+    """
+    Версійований реєстр моделей у папці root.
+    hot_size – скільки завантажених моделей тримати в пам'яті (LRU)
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR, hot_size=MODEL_HOT_SIZE):
+        self.root = root
+        self.hot_size = hot_size
+        self._hot = OrderedDict()              # (датасет, назва, версія) → RegisteredModel
+        self._lock = threading.Lock()
+
+    def _dir(self, dataset, name):
+        return os.path.join(self.root, dataset, name)
+
+    def versions(self, dataset, name):
+        """Номери збережених версій моделі (за зростанням)."""
+        path = self._dir(dataset, name)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(f[1:-5]) for f in os.listdir(path) if f.startswith("v") and f.endswith(".json"))
+
+    def save(self, dataset, name, coefs, intercepts, meta):
+        """Записує нову версію моделі (ваги — float32) і повертає її номер."""
+        path = self._dir(dataset, name)
+        os.makedirs(path, exist_ok=True)
+        version = (self.versions(dataset, name) or [0])[-1] + 1
+        base = os.path.join(path, f"v{version:04d}")
+        arrays = {f"W{i}": np.asarray(W, dtype=np.float32) for i, W in enumerate(coefs)}
+        arrays.update({f"b{i}": np.asarray(b, dtype=np.float32) for i, b in enumerate(intercepts)})
+        meta = dict(meta, format=REGISTRY_FORMAT, dataset=dataset, name=name, version=version,
+                    layers=len(coefs))
+        tmp = f"{base}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, base + ".npz")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1, default=float)
+        os.replace(tmp, base + ".json")        # Метадані — останніми: версія без ваг не видима
+        return version
+
+    def register(self, dataset, mode, result, X, y, cols, target=None, max_iter=200, random_state=0,
+                 lr=DEFAULT_LR, alpha=DEFAULT_ALPHA):
+        """
+        Перенавчає моделі результату етапу mode на всьому ряді (X, y) і зберігає їх.
+        X, cols – матриця й назви ознак, на яких працював етап (у конвеєрі — зменшені)
+        Повертає список (назва, версія).
+        """
+        fp = dataset_fingerprint(X, y)
+        saved = []
+        for name, spec, metrics in model_specs(mode, result, cols, lr, alpha):
+            coefs, intercepts, seconds = refit(X, y, cols, spec, max_iter, random_state)
+            meta = dict(spec, stage=mode, fingerprint=fp, target=target, rows=int(X.shape[0]),
+                        scaler=None, metrics=metrics, refit_s=seconds, max_iter=max_iter,
+                        random_state=random_state, created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            saved.append((name, self.save(dataset, name, coefs, intercepts, meta)))
+        return saved
+
+    def entries(self, dataset):
+        """Метадані останніх версій усіх моделей датасету."""
+        path = os.path.join(self.root, dataset)
+        out = []
+        for name in sorted(os.listdir(path)) if os.path.isdir(path) else []:
+            versions = self.versions(dataset, name)
+            if versions:
+                with open(os.path.join(path, name, f"v{versions[-1]:04d}.json"), encoding="utf-8") as f:
+                    out.append(json.load(f))
+        return out
+
+    def resolve(self, dataset, name=None, version=None):
+        """(назва, версія) моделі: без назви — остання версія з найменшим MAE."""
+        if name is None:
+            entries = self.entries(dataset)
+            if not entries:
+                raise ValueError(f"❌ У реєстрі немає моделей для датасету {dataset}")
+            name = min(entries, key=lambda m: m["metrics"]["mae"])["name"]
+        versions = self.versions(dataset, name)
+        if not versions or (version is not None and version not in versions):
+            raise ValueError(f"❌ У реєстрі немає моделі {dataset}/{name}" + (f" v{version}" if version else ""))
+        return name, version if version is not None else versions[-1]
+
+    def load(self, dataset, name=None, version=None):
+        """Модель з реєстру (з пам'яті, якщо вже завантажена)."""
+        key = (dataset, *self.resolve(dataset, name, version))
+        with self._lock:
+            model = self._hot.get(key)
+            if model is not None:
+                self._hot.move_to_end(key)
+                return model
+        base = os.path.join(self._dir(dataset, key[1]), f"v{key[2]:04d}")
+        with timer("registry.load"):
+            with open(base + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("format") != REGISTRY_FORMAT:
+                raise ValueError(f"❌ Непідтримуваний формат запису реєстру: {base}.json")
+            with np.load(base + ".npz") as data:
+                coefs = [data[f"W{i}"] for i in range(meta["layers"])]
+                intercepts = [data[f"b{i}"] for i in range(meta["layers"])]
+        model = RegisteredModel(coefs, intercepts, meta)
+        with self._lock:
+            self._hot[key] = model
+            while len(self._hot) > self.hot_size:
+                self._hot.popitem(last=False)  # Найдавніше використана модель
+        return model
+
+    def predict(self, dataset, X, name=None, version=None, columns=None, batch_rows=PREDICT_BATCH_ROWS):
+        """Прогноз моделлю датасету dataset (див. RegisteredModel.predict)."""
+        return self.load(dataset, name, version).predict(X, columns=columns, batch_rows=batch_rows)
+
+REGISTRY = ModelRegistry()                     # Реєстр процесу (папка MODEL_REGISTRY_DIR)
+
+def predict(dataset_key, X, name=None, version=None, columns=None):
+    """Прогноз найкращою (або названою) моделлю датасету з реєстру REGISTRY."""
+    return REGISTRY.predict(dataset_key, X, name, version, columns)
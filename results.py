@@ -0,0 +1,66 @@
+"""
+Форматування результатів етапів і запис підсумкової таблиці у CSV.
+Модуль не залежить від Tkinter: ним користуються і GUI, і консольний запуск (neuro_energy).
+"""
+
+import csv                    # Модуль для роботи з CSV-файлами (збереження результатів у таблицю)
+import os                     # Модуль для роботи з файловою системою (створення папок, шляхи)
+
+# Словник з "людяними" назвами етапів для відображення у GUI і таблиці
+MODE_NAMES = {
+    "features": "Відбір ознак",             # Технічний ключ "features" → показуємо користувачу "Відбір ознак"
+    "params": "Параметричний синтез",       # "params" → "Параметричний синтез"
+    "structure": "Структурний синтез",      # "structure" → "Структурний синтез"
+    "opt": "Оптимізація структури"          # "opt" → "Оптимізація структури"
+}
+
+# Заголовки колонок підсумкової таблиці
+SUMMARY_COLUMNS = ("Енергосистема", "Етап аналізу", "MAE", "RMSE", "Додатково")
+
+def format_result_compact(mode, result):
+    """
+    Форматує результат у компактний вигляд для таблиці.
+    mode   – який етап (features, params, structure, opt)
+    result – словник або список з результатами
+    """
+    if isinstance(result, dict):  # Якщо результат – словник
+        if mode == "features":    # Для відбору ознак
+            return f"Ознаки: {', '.join(result.get('features', []))}"
+        elif mode == "params":    # Для параметричного синтезу
+            return f"h={result.get('hidden')}, lr={result.get('lr')}, α={result.get('alpha')}"
+        elif mode == "structure": # Для структурного синтезу: ширина й активація кожного шару
+            return " → ".join(f"{w} {a}" for w, a in zip(result.get("neurons", []), result.get("activations", [])))
+        else:
+            return ""             # Якщо інший словник – повертаємо порожній рядок
+    elif isinstance(result, list) and mode == "opt":  # Якщо результат – список і режим "opt"
+        return f"Парето‑рішень={len(result)}"         # Показуємо кількість Парето-рішень
+    return ""  # Якщо нічого не підійшло – повертаємо порожній рядок
+
+def result_rows(dataset, mode, result):
+    """
+    Рядки таблиці для результату етапу: (енергосистема, етап, MAE, RMSE, додатково).
+    Словник дає один рядок, Парето-фронт (opt) — по рядку на рішення.
+    """
+    desc = MODE_NAMES.get(mode, mode)
+    if isinstance(result, dict):
+        return [(dataset, desc, float(result.get("mae", 0.0)), float(result.get("rmse", 0.0)),
+                 format_result_compact(mode, result))]
+    if isinstance(result, list) and mode == "opt":
+        return [(dataset, desc, float(p.get("mae", 0.0)), float(p.get("rmse", 0.0)),
+                 f"{p.get('layers')}×{p.get('neurons')}") for p in result]
+    return []
+
+def write_summary_csv(rows, path="results/summary.csv"):
+    """
+    Записує підсумкову таблицю у CSV (той самий формат, що й кнопка «Зберегти таблицю»).
+    rows – рядки (енергосистема, етап, MAE, RMSE, додатково); числа форматуються як у таблиці GUI
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)   # Створюємо папку results, якщо її ще немає
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)                      # записуємо заголовки
+        for dataset, desc, mae, rmse, extra in rows:          # записуємо всі рядки
+            writer.writerow((dataset, desc,
+                             mae if isinstance(mae, str) else f"{mae:.3f}",
+                             rmse if isinstance(rmse, str) else f"{rmse:.3f}", extra))
+    return path
@@ -0,0 +1,118 @@
+"""
+Керування довгими запусками GA:
+- CancelToken — кооперативне скасування: GA перевіряє його між оцінюваннями
+  і завершується з найкращим результатом останнього повного покоління
+- контрольні точки — після кожного покоління зберігаються популяція, оцінки
+  та найкраще рішення / Парето-фронт, тож перерваний запуск продовжується з того
+  ж місця і дає той самий результат, що й безперервний
+- випадковість GA — генератори np.random.Generator, похідні від одного seed запуску
+  (SeedSequence): потік кожного покоління залежить лише від seed і номера покоління,
+  тож стан генераторів не зберігається, а запуски в різних потоках не ділять
+  глобального стану (модульний random і np.random не використовуються)
+"""
+
+import os, pickle, threading                  # pickle — формат контрольної точки, threading — подія скасування
+import numpy as np                             # numpy — SeedSequence і Generator
+from profiling import timed                    # Таймер ga.checkpoint
+
+CHECKPOINT_FORMAT = 2                          # Версія формату контрольних точок (2 — без станів RNG)
+
+INIT, BREED = 0, 1                             # Потоки GA: початкова популяція, відбір/кросовер/мутації покоління
+
+class CheckpointMismatch(ValueError):
+    """Контрольна точка записана запуском з іншими параметрами."""
+
+class Cancelled(Exception):
+    """Оцінювання перервано через CancelToken."""
+
+class CancelToken:
+    """
+    Потокобезпечний прапорець скасування (встановлюється з GUI, сигналу або іншого потоку).
+    event – спільна подія (наприклад, multiprocessing.Event — скасування з іншого процесу)
+    """
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Піднімає Cancelled, якщо запуск скасовано."""
+        if self._event.is_set():
+            raise Cancelled()
+
+def is_cancelled(cancel):
+    """True, якщо токен передано і його скасовано."""
+    return cancel is not None and cancel.cancelled
+
+def seed_root(seed, default):
+    """
+    Корінь випадковості запуску GA.
+    seed    – ціле число, np.random.SeedSequence або np.random.Generator
+              (з нього береться нова послідовність); None — default
+    default – фіксований seed етапу
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(int(seed.integers(2 ** 63)))
+    return np.random.SeedSequence(default if seed is None else int(seed))
+
+def seed_id(root):
+    """Порівнюване подання кореня (для конфігурації контрольної точки)."""
+    return np.asarray(root.entropy).tolist(), tuple(root.spawn_key)
+
+def stream(root, *key):
+    """
+    Незалежний генератор потоку key кореня root, наприклад stream(root, BREED, gen).
+    Залежить лише від root і key — не від того, скільки чисел узяли інші потоки.
+    """
+    return np.random.default_rng(np.random.SeedSequence(root.entropy, spawn_key=tuple(root.spawn_key) + key))
+
+def choose(rng, choices, size):
+    """size випадкових елементів choices одним викликом rng (значення — як у choices, не скаляри numpy)."""
+    return [choices[i] for i in rng.integers(len(choices), size=size)]
+
+@timed("ga.checkpoint")
+def save_checkpoint(path, config, state):
+    """
+    Атомарно записує контрольну точку.
+    config – параметри запуску, з якими точка сумісна (етап, відбиток датасету, GA-параметри)
+    state  – стан після покоління: gen (наступне покоління), pop, evals, best/front, budget
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({"format": CHECKPOINT_FORMAT, "config": config, "state": state}, f)
+    os.replace(tmp, path)                      # Обрив під час запису не псує попередню точку
+
+def load_checkpoint(path, config):
+    """
+    Повертає збережений стан або None, якщо файлу немає.
+    Точка з іншими параметрами запуску (датасет, розмір популяції, max_iter…) не відновлюється.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if data.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"❌ Непідтримуваний формат контрольної точки: {path}")
+    if data["config"] != config:
+        diff = sorted(k for k in set(data["config"]) | set(config)
+                      if data["config"].get(k) != config.get(k))
+        raise CheckpointMismatch(f"❌ Контрольна точка {path} належить іншому запуску (відрізняються: {', '.join(diff)})")
+    return data["state"]
+
+def clear_checkpoint(path, cancel=None):
+    """Видаляє контрольну точку завершеного запуску; скасованого — лишає для продовження."""
+    if not path or is_cancelled(cancel):
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,184 @@
+"""
+Планувальник серій запусків GA: матриця датасет × етап × seed виконується
+паралельно у пулі процесів із загальним бюджетом ядер.
+- plan_jobs — задачі матриці із залежностями між етапами (depends: етап → етапи,
+  результати яких він споживає, для того самого датасету і seed)
+- run_jobs — виконує задачі: у роботі одночасно не більше cores // cores_per_job
+  задач, кожна отримує cores_per_job ядер для власного оцінювача популяції.
+  Готові задачі запускаються за спаданням оцінки вартості разом із залежними
+  (найдовший ланцюжок — першим), що скорочує загальний час серії
+- прогрес поколінь і скасування передаються між процесами через
+  multiprocessing.Queue / Event; результати повертаються по мірі завершення
+Модуль не залежить від Tkinter і scikit-learn: функцію задачі передає викликач
+(консоль — neuro_energy.cli, GUI — gui_handlers).
+"""
+
+import heapq, os, queue                        # heapq — черга готових задач за пріоритетом
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import get_context        # spawn — воркери без успадкованих потоків GUI
+from run_control import CancelToken            # Скасування у воркері за спільною подією
+
+# Відносна вартість одного навчання етапу (глибші й ширші мережі opt/structure — дорожчі)
+MODE_COST = {"features": 1.0, "params": 1.5, "structure": 2.0, "opt": 2.0}
+
+_WORKER = {}                                   # У воркері: спільні подія скасування і черга прогресу
+
+class Job:
+    """
+    Задача серії: етап mode для датасету dataset з seed (None — фіксований seed етапу).
+    deps  – ключі задач, результати яких потрібні цій (upstream)
+    cores – ядер для оцінювача популяції задачі
+    cost  – оцінка вартості (для порядку запуску)
+    """
+    __slots__ = ("dataset", "mode", "seed", "deps", "cores", "cost", "priority")
+
+    def __init__(self, dataset, mode, seed=None, deps=(), cores=1, cost=1.0):
+        self.dataset, self.mode, self.seed = dataset, mode, seed
+        self.deps, self.cores, self.cost = tuple(deps), cores, cost
+        self.priority = cost                   # Вартість разом з найдорожчим ланцюжком залежних (plan_jobs)
+
+    @property
+    def key(self):
+        return (self.dataset, self.mode, self.seed)
+
+    def __repr__(self):
+        return f"Job({self.dataset}, {self.mode}, seed={self.seed})"
+
+def estimate_cost(rows, n_features, mode, gens=5, pop=8):
+    """Оцінка вартості етапу: рядки × ознаки × кількість навчань × MODE_COST."""
+    return rows * (n_features + 1) * gens * pop * MODE_COST.get(mode, 1.0)
+
+def plan_jobs(datasets, modes, seeds=(None,), depends=None, cost=None, cores_per_job=1):
+    """
+    Задачі матриці datasets × modes × seeds.
+    depends – {етап: (етапи-попередники)}; залежність додається, лише якщо попередник теж у modes
+    cost    – cost(dataset, mode) → оцінка вартості (None — однакова для всіх)
+    Пріоритет задачі — її вартість плюс найдорожчий ланцюжок задач, що від неї залежать.
+    """
+    depends = depends or {}
+    jobs = []
+    for dataset in datasets:
+        for seed in seeds:
+            for mode in modes:
+                deps = [(dataset, up, seed) for up in depends.get(mode, ()) if up in modes]
+                jobs.append(Job(dataset, mode, seed, deps, cores_per_job,
+                                cost(dataset, mode) if cost is not None else 1.0))
+    by_key = {job.key: job for job in jobs}
+    children = _children(jobs)
+    for job in _topological(jobs)[::-1]:       # Від кінців ланцюжків до початків
+        job.priority = job.cost + max((by_key[c].priority for c in children[job.key]), default=0.0)
+    return jobs
+
+def _children(jobs):
+    """Ключ задачі → ключі задач, що від неї залежать."""
+    children = {job.key: [] for job in jobs}
+    for job in jobs:
+        for dep in job.deps:
+            children[dep].append(job.key)
+    return children
+
+def _topological(jobs):
+    """Задачі в порядку, де кожна йде після своїх залежностей (ValueError для циклу)."""
+    by_key = {job.key: job for job in jobs}
+    state, order = {}, []
+    def visit(job):
+        if state.get(job.key) == "done":
+            return
+        if state.get(job.key) == "visiting":
+            raise ValueError(f"❌ Циклічна залежність етапів: {job}")
+        state[job.key] = "visiting"
+        for dep in job.deps:
+            visit(by_key[dep])
+        state[job.key] = "done"
+        order.append(job)
+    for job in jobs:
+        visit(job)
+    return order
+
+def _init_worker(cancel_event, progress_queue):
+    """Ініціалізація воркера: спільні подія скасування і черга прогресу."""
+    _WORKER["cancel"], _WORKER["progress"] = CancelToken(cancel_event), progress_queue
+
+def _run_job(run_fn, job, upstream):
+    """Виконує задачу у воркері: run_fn(job, upstream, cancel, progress)."""
+    progress_queue = _WORKER["progress"]
+    def progress(gen, mae, rmse, extra):
+        progress_queue.put((job.key, gen, float(mae), float(rmse), str(extra)))
+    return run_fn(job, upstream, _WORKER["cancel"], progress)
+
+def run_jobs(jobs, run_fn, cores=None, on_event=None, cancel=None):
+    """
+    Виконує задачі jobs у пулі процесів.
+    run_fn   – run_fn(job, upstream, cancel, progress) → результат етапу; функція верхнього
+               рівня модуля (передається у воркер); upstream — {етап: результат} залежностей,
+               progress(gen, mae, rmse, extra) — прогрес покоління
+    cores    – загальний бюджет ядер (None — усі); одночасно виконується cores // job.cores задач
+    on_event – on_event(kind, job, **дані) у потоці виклику: start, progress (gen, mae, rmse, extra),
+               done (result), error (message), skipped (залежність не виконана)
+    cancel   – CancelToken: нові задачі не запускаються, а запущені зупиняються після
+               поточного оцінювання (повертають результат останнього повного покоління)
+    Повертає {ключ задачі: результат} для завершених задач.
+    """
+    emit = on_event or (lambda kind, job, **data: None)
+    cores = cores or os.cpu_count() or 1
+    slots = max(1, cores // max(1, max((job.cores for job in jobs), default=1)))
+    by_key = {job.key: job for job in jobs}
+    children = _children(jobs)
+    _topological(jobs)                         # Перевірка на цикли до запуску
+    waiting = {job.key: len(job.deps) for job in jobs}
+    ready = [(-job.priority, i, job.key) for i, job in enumerate(jobs) if not job.deps]
+    heapq.heapify(ready)
+    results, running = {}, {}
+
+    def skip(key):                             # Залежні від невиконаної задачі не запускаються
+        for child in children[key]:
+            if child in waiting:
+                del waiting[child]
+                emit("skipped", by_key[child])
+                skip(child)
+
+    ctx = get_context("spawn")
+    cancel_event, progress_queue = ctx.Event(), ctx.Queue()
+    with ProcessPoolExecutor(max_workers=min(slots, len(jobs)) or 1, mp_context=ctx,
+                             initializer=_init_worker, initargs=(cancel_event, progress_queue)) as ex:
+        while ready or running:
+            cancelled = cancel is not None and cancel.cancelled
+            if cancelled:
+                cancel_event.set()
+            while ready and len(running) < slots and not cancelled:
+                _, _, key = heapq.heappop(ready)
+                job = by_key[key]
+                del waiting[key]
+                upstream = {by_key[d].mode: results[d] for d in job.deps}
+                running[ex.submit(_run_job, run_fn, job, upstream)] = job
+                emit("start", job)
+            if not running:                    # Скасовано до запуску решти задач
+                break
+            done, _ = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+            _drain(progress_queue, by_key, emit, results)
+            for future in done:
+                job = running.pop(future)
+                try:
+                    results[job.key] = future.result()
+                except Exception as e:
+                    emit("error", job, message=str(e))
+                    skip(job.key)
+                    continue
+                emit("done", job, result=results[job.key])
+                for child in children[job.key]:
+                    if child in waiting:
+                        waiting[child] -= 1
+                        if waiting[child] == 0:
+                            heapq.heappush(ready, (-by_key[child].priority, len(results), child))
+        _drain(progress_queue, by_key, emit, results)
+    return results
+
+def _drain(progress_queue, by_key, emit, finished):
+    """Передає накопичені події прогресу з воркерів у on_event (крім запізнілих — від завершених задач)."""
+    while True:
+        try:
+            key, gen, mae, rmse, extra = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        if key not in finished:
+            emit("progress", by_key[key], gen=gen, mae=mae, rmse=rmse, extra=extra)
@@ -5,4 +5,61 @@ VERSION = "v1.0"
 
 # Базові стилі інтерфейсу
 BG_COLOR = "#f0f0f0"
-FONT_MAIN = ("Arial", 10)
\ No newline at end of file
+FONT_MAIN = ("Arial", 10)
+
+# Кеш пристосованості GA (пам'ять + диск)
+FITNESS_CACHE_DIR = "cache/fitness"   # Папка дискового рівня кешу
+FITNESS_CACHE_SIZE = 4096             # Максимум записів у пам'яті (LRU)
+
+# Бекенд оцінювання популяції (serial / process / loky)
+EVAL_BACKEND = "serial"   # У GUI за замовчуванням послідовно; для серверних запусків — "process" або "loky"
+EVAL_JOBS = None          # Кількість процесів (None — усі ядра)
+EVAL_RACING = False       # Відсіювання слабких кандидатів після першого фолду (successive halving)
+EVAL_TRAINER = "sklearn"  # Навчання MLP: "sklearn" або "batched" (уся популяція разом, features/params)
+EVAL_WARM_START = False   # Теплий старт: нащадок починає з ваг батька і навчається 30% max_iter
+EVAL_SURROGATE = None     # Сурогатне відсіювання нащадків: None, "rf" або "gp"
+EVAL_FIDELITY = None      # Частки рядків train за поколіннями, напр. (0.25, 0.5, 1.0); None — усі рядки
+EVAL_SUBSAMPLE = "recent" # Вибірка рядків за неповної точності: "recent" (недавнє вікно) або "stride"
+
+# Інструментування часу етапів (profiling.py)
+PROFILE_TIMERS = False    # Таймери етапів: таблиця в лог і JSON <датасет>_<етап>_timings.json у PROFILE_DIR
+PROFILE_RUN = None        # Профіль усього етапу: None, "cprofile" (.prof) або "pyinstrument" (.html)
+PROFILE_DIR = "results/profiles"
+
+# Паралельна серія датасет × етап × seed (scheduler.py)
+SWEEP_CORES = None        # Бюджет ядер серії (None — усі); «Запустити всі етапи» використовує серію, якщо задано
+SWEEP_CORES_PER_JOB = 1   # Ядер на одну задачу (оцінювач популяції задачі)
+SWEEP_SEEDS = (None,)     # Seed кожної пари датасет × етап (None — фіксований seed етапу, як в одиночному запуску)
+PIPELINE = False          # Конвеєр у «Запустити всі етапи» і серії: маска ознак і lr/alpha — вхід наступних етапів
+
+# Острівна модель GA (islands.py, консольний --islands)
+ISLANDS = 4               # Кількість островів (процесів) за замовчуванням
+ISLAND_MIGRATE_EVERY = 2  # Міграція кожні N поколінь (0 — незалежні острови)
+ISLAND_MIGRANTS = 1       # Скільки найкращих генотипів острів надсилає кожному сусіду
+ISLAND_TOPOLOGY = "ring"  # ring (наступному), star (центр 0 ↔ решта) або full (усім)
+
+# Похідні ознаки навантаження (feature_engine.py, налаштування — static/mappings.py DATASET_FEATURES)
+DERIVED_FEATURES = False  # Лаги цілі, ковзні середнє/std і sin/cos календаря — серед ознак для відбору
+
+# Реєстр моделей прогнозу (registry.py)
+MODEL_REGISTRY_DIR = "models"  # Папка версій: <датасет>/<модель>/v0001.npz + .json
+MODEL_REGISTER = True     # Після етапу GUI перенавчає найкращу модель (і фронт opt) на всьому ряді і зберігає
+MODEL_HOT_SIZE = 8        # Скільки завантажених моделей тримати в пам'яті
+PREDICT_BATCH_ROWS = 4096 # Рядків в одному блоці пакетного прогнозу (буфери шарів лишаються в кеші процесора)
+
+# Онлайн-донавчання на потоці нових рядків (online.py, консольна команда online)
+ONLINE_WINDOW = 168        # Рядків ковзних MAE/RMSE і розігріву тесту дрейфу (тиждень погодинних даних)
+ONLINE_UPDATE_ROWS = 24    # partial_fit кожні N нових рядків
+ONLINE_EPOCHS = 5          # Епох partial_fit на кожну порцію нових рядків
+ONLINE_RETRAIN_ROWS = 2000 # Останніх рядків у буфері повторного GA після дрейфу
+ONLINE_RETRAIN_GENS = 3    # Поколінь повторного GA
+ONLINE_RETRAIN_COOLDOWN = 720 # Щонайменше рядків між повторними GA (дрейф раніше — лише новий розігрів тесту)
+ONLINE_DRIFT_DELTA = 0.05  # Тест Пейджа–Хінклі: допустиме зростання похибки (частка середньої)
+ONLINE_DRIFT_THRESHOLD = 50.0 # Поріг накопиченого зростання похибки (у середніх похибках)
+
+# Контрольні точки GA (продовження перерваних запусків)
+CHECKPOINT_DIR = "cache/checkpoints"  # Файл <датасет>_<етап>.pkl записується після кожного покоління
+
+# Оновлення GUI з шини подій прогресу
+GUI_PUMP_INTERVAL_MS = 100  # Період, з яким GUI забирає події з черги
+GUI_PUMP_BATCH = 2000       # Максимум подій за один такт (решта — на наступному)
@@ -8,6 +8,29 @@ DATASET_PATHS = {
     "s4": "data/s4_shift.csv"          # Датасет S4: зміщене навантаження
 }
 
+# Колонка цілі (навантаження) кожного датасету; решта колонок — ознаки
+DATASET_TARGETS = {
+    "s1": "load",
+    "s2": "load",
+    "s3": "load",
+    "s4": "load"
+}
+
+# Похідні ознаки (feature_engine.py): лаги цілі, ковзні вікна (середнє і стандартне відхилення)
+# і sin/cos-кодування календарних колонок; рядки і вікна — у кроках ряду датасету
+DATASET_FEATURES = {
+    "s1": {"lags": (1, 2, 3, 24, 168), "windows": (24, 168), "cyclic": ("hour", "dow")},
+    "s2": {"lags": (1, 2, 7), "windows": (7, 28), "cyclic": ("month",)},
+    "s3": {"lags": (1, 2, 3, 24, 168), "windows": (24, 168), "cyclic": ("hour", "dow")},
+    "s4": {"lags": (1, 2, 3, 24, 168), "windows": (24, 168), "cyclic": ("hour", "dow")}
+}
+
+# Період календарних колонок для циклічного кодування
+CYCLIC_PERIODS = {"hour": 24, "dow": 7, "month": 12}
+
+# Папка бінарного кешу датасетів (X.npy, y.npy, заголовок JSON) для швидкого відкриття через memmap
+DATASET_CACHE_DIR = "data/.cache"
+
 # Назви для GUI
 DATASET_NAMES = {
     "s1": "Енергосистема S1 (погодинне навантаження)",   # Відображається у комбобоксі GUI
@@ -20,6 +43,6 @@ DATASET_NAMES = {
 MODE_NAMES = {
     "features": "Відбір ознак навантаження",             # Генетичний алгоритм для вибору інформативних ознак
     "params": "Параметричний синтез моделі прогнозу",    # Оптимізація параметрів (hidden, lr, alpha)
-    "structure": "Структурний синтез архітектури",       # Оптимізація кількості шарів і нейронів
-    "opt": "Оптимізація структури (Парето-фронт)"        # Багатокритеріальна оптимізація (MAE, RMSE)
+    "structure": "Структурний синтез архітектури",       # Глибина, ширини й активації шарів (штраф за розмір)
+    "opt": "Оптимізація структури (Парето-фронт)"        # Багатокритеріальна оптимізація (MAE, RMSE, кількість параметрів)
 }
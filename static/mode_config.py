@@ -8,23 +8,28 @@ from ga_load_features import ga_load_feature_selection          # Відбір 
 from ga_model_params import ga_model_param_synthesis            # Параметричний синтез
 from ga_network_structure import ga_network_structure_synthesis # Структурний синтез
 from ga_multiobjective_opt import ga_multiobjective_optimization # Багатокритеріальна оптимізація
+import ga_load_features, ga_model_params, ga_network_structure, ga_multiobjective_opt # DEFAULT_SEED етапів
 
 # Словник конфігурації режимів
 MODE_CONFIG = {
     "features": {  # Режим відбору ознак
         "func": ga_load_feature_selection,                     # Функція, яка реалізує GA для відбору ознак
-        "desc": "Відбір інформативних ознак навантаження"      # Людяний опис для GUI
+        "desc": "Відбір інформативних ознак навантаження",     # Людяний опис для GUI
+        "seed": ga_load_features.DEFAULT_SEED                  # Фіксований seed етапу (seed=None)
     },
     "params": {   # Режим параметричного синтезу
         "func": ga_model_param_synthesis,                      # Функція GA для оптимізації параметрів (hidden, lr, alpha)
-        "desc": "Параметричний синтез моделі прогнозу"
+        "desc": "Параметричний синтез моделі прогнозу",
+        "seed": ga_model_params.DEFAULT_SEED
     },
     "structure": { # Режим структурного синтезу
-        "func": ga_network_structure_synthesis,                # Функція GA для оптимізації архітектури (шари × нейрони)
-        "desc": "Структурний синтез архітектури нейромережі"
+        "func": ga_network_structure_synthesis,                # Функція GA для синтезу архітектури (глибина, ширини й активації шарів)
+        "desc": "Структурний синтез архітектури нейромережі",
+        "seed": ga_network_structure.DEFAULT_SEED
     },
     "opt": {      # Режим багатокритеріальної оптимізації
-        "func": ga_multiobjective_optimization,                # Функція GA для Парето-оптимізації (MAE, RMSE)
-        "desc": "Багатокритеріальна оптимізація (Парето‑фронт)"
+        "func": ga_multiobjective_optimization,                # Функція GA для Парето-оптимізації (NSGA-II: MAE, RMSE, параметри…)
+        "desc": "Багатокритеріальна оптимізація (Парето‑фронт)",
+        "seed": ga_multiobjective_opt.DEFAULT_SEED
     }
 }
@@ -0,0 +1,141 @@
+"""
+Сурогатне попереднє відсіювання нащадків GA.
+Сурогат (випадковий ліс або гаусівський процес) навчається на всіх реальних
+оцінках запуску: кодування генотипу → MAE. GA генерує у factor разів більше
+нащадків, ніж потрібно, а на реальне навчання йдуть лише найперспективніші
+за очікуваним покращенням (expected improvement). Кодування генотипів задають
+модулі GA (бітова маска ознак, логарифми параметрів, шари архітектури).
+"""
+
+import numpy as np                             # numpy — матриці кодувань і EI
+from scipy.stats import norm                   # norm — cdf/pdf для expected improvement
+from profiling import timed                    # Таймер surrogate.select
+
+SURROGATES = ("rf", "gp")                      # Доступні сурогати
+SURROGATE_FACTOR = 4                           # У скільки разів більше нащадків генерується для відбору
+SURROGATE_MIN_SAMPLES = 8                      # Мінімум реальних оцінок до першого навчання сурогату
+
+def expected_improvement(mu, sigma, best, xi=0.01):
+    """
+    Очікуване покращення для мінімізації: E[max(best − f − xi, 0)], f ~ N(mu, sigma²).
+    За sigma = 0 — детерміноване покращення max(best − mu − xi, 0).
+    """
+    mu, sigma = np.asarray(mu, dtype=float), np.asarray(sigma, dtype=float)
+    imp = best - mu - xi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(sigma > 0, imp / sigma, 0.0)
+    return np.where(sigma > 0, imp * norm.cdf(z) + sigma * norm.pdf(z), np.maximum(imp, 0.0))
+
+def _make_model(kind, random_state):
+    """Регресор сурогату за назвою."""
+    if kind == "rf":
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_estimators=50, min_samples_leaf=1, random_state=random_state)
+    if kind == "gp":
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+        kernel = ConstantKernel(1.0) * Matern(length_scale=1.0, nu=2.5) + WhiteKernel(1e-3)
+        return GaussianProcessRegressor(kernel=kernel, normalize_y=True, random_state=random_state)
+    raise ValueError(f"❌ Невідомий сурогат: {kind} (доступні: {', '.join(SURROGATES)})")
+
+class SurrogateScreen:
+    """
+    Відсіювання нащадків сурогатом.
+    kind        – "rf" (RandomForestRegressor; невизначеність — розкид дерев) або
+                  "gp" (GaussianProcessRegressor з ядром Matern)
+    factor      – у скільки разів більше кандидатів генерує GA
+    min_samples – скільки реальних оцінок потрібно до першого навчання
+    Лічильники: screened — згенеровано кандидатів, selected — відправлено на реальне навчання,
+    fits — фактично виконано навчань (фолдів) на оцінюванні популяцій з увімкненим сурогатом.
+    Оцінки різної точності (частки рядків train) не змішуються: зі зміною точності
+    історія починається заново.
+    """
+
+    def __init__(self, kind="rf", factor=SURROGATE_FACTOR, min_samples=SURROGATE_MIN_SAMPLES,
+                 xi=0.01, random_state=0):
+        _make_model(kind, random_state)        # Перевірка назви до запуску GA
+        self.kind = kind
+        self.factor = max(1, int(factor))
+        self.min_samples = min_samples
+        self.xi = xi
+        self.random_state = random_state
+        self.codes, self.values = [], []       # Історія реальних оцінок (без повторів генотипів)
+        self._seen = set()
+        self.fidelity = None                   # Точність оцінок в історії
+        self.screened = 0
+        self.selected = 0
+        self.fits = 0
+
+    def observe(self, codes, values, fidelity=1.0, fits=0):
+        """
+        Додає реальні оцінки (кодування генотипів і їхні MAE, отримані з точністю fidelity).
+        fits – скільки навчань фактично витрачено на покоління (з бюджету evaluate_population)
+        """
+        self.fits += int(fits)
+        if fidelity != self.fidelity:          # Нова точність: попередні оцінки з нею не порівнюються
+            self.codes, self.values, self._seen = [], [], set()
+            self.fidelity = fidelity
+        for code, value in zip(codes, values):
+            code = np.asarray(code, dtype=float)
+            if code.tobytes() in self._seen:   # Оцінка генотипу детермінована — повтор нічого не додає
+                continue
+            self._seen.add(code.tobytes())
+            self.codes.append(code)
+            self.values.append(float(value))
+
+    @property
+    def ready(self):
+        """Чи достатньо оцінок для навчання сурогату."""
+        return len(self.values) >= self.min_samples
+
+    def n_candidates(self, k):
+        """Скільки нащадків генерувати, щоб відібрати k."""
+        return k * self.factor if self.ready else k
+
+    @timed("surrogate.select")
+    def select(self, codes, k):
+        """
+        Індекси k кандидатів для реального навчання (за спаданням EI).
+        Дублікати кодувань відсіюються першими; поки сурогат не готовий — перші k.
+        """
+        codes = np.asarray(codes, dtype=float).reshape(len(codes), -1)
+        self.screened += len(codes)
+        if not self.ready or len(codes) <= k:
+            chosen = list(range(min(k, len(codes))))
+        else:
+            _, first = np.unique(codes, axis=0, return_index=True)
+            unique = np.sort(first)                # Порядок генерації — за рівних EI
+            mu, sigma = self.predict(codes[unique])
+            ei = expected_improvement(mu, sigma, min(self.values), self.xi)
+            order = unique[np.argsort(-ei, kind="stable")]
+            rest = np.setdiff1d(np.arange(len(codes)), unique)  # Дублікати — лише якщо не вистачає унікальних
+            chosen = [int(i) for i in np.concatenate([order, rest])[:k]]
+        self.selected += len(chosen)
+        return chosen
+
+    def predict(self, codes):
+        """Прогноз сурогату: (середнє, стандартне відхилення) для кожного кодування."""
+        model = _make_model(self.kind, self.random_state)
+        model.fit(np.vstack(self.codes), np.asarray(self.values))
+        if self.kind == "gp":
+            return model.predict(codes, return_std=True)
+        per_tree = np.stack([t.predict(codes) for t in model.estimators_])
+        return per_tree.mean(axis=0), per_tree.std(axis=0)
+
+    def stats(self):
+        """Скільки кандидатів згенеровано, відібрано і відсіяно та скільки навчань виконано насправді."""
+        return {"model": self.kind, "screened": self.screened, "selected": self.selected,
+                "skipped": self.screened - self.selected, "fits": self.fits}
+
+    def dump(self):
+        """Стан для контрольної точки."""
+        return {"codes": self.codes, "values": self.values, "fidelity": self.fidelity,
+                "screened": self.screened, "selected": self.selected, "fits": self.fits}
+
+    def load(self, state):
+        """Відновлює стан, збережений dump()."""
+        self.codes, self.values = list(state["codes"]), list(state["values"])
+        self._seen = {c.tobytes() for c in self.codes}
+        self.fidelity = state["fidelity"]
+        self.screened, self.selected = state["screened"], state["selected"]
+        self.fits = state.get("fits", 0)
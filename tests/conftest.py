@@ -0,0 +1,26 @@
+"""
+Спільні фікстури тестів: невеликий синтетичний ряд навантаження
+(тести не залежать від CSV у data/ і виконуються за секунди).
+Модулі проєкту лежать у корені репозиторію, тож корінь додається до sys.path.
+"""
+
+import os, sys, warnings                       # warnings — ConvergenceWarning коротких навчань MLP
+import numpy as np                             # numpy — синтетичні X і y
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    """Короткі навчання (max_iter ≈ 10–30) не збігаються — попередження sklearn не потрібні."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+@pytest.fixture(scope="session")
+def series():
+    """Ряд 240 × 6: ціль — лінійна комбінація ознак із шумом (float32, як у кеші датасетів)."""
+    rs = np.random.RandomState(0)
+    X = rs.rand(240, 6).astype(np.float32)
+    y = (X @ rs.rand(6) + 0.1 * rs.rand(240)).astype(np.float32)
+    return X, y, [f"x{i}" for i in range(6)]
@@ -0,0 +1,33 @@
+"""
+Пакетний тренер (trainer="batched") відтворює MLPRegressor: оцінки збігаються
+з точністю до округлення float, тож GA ранжує кандидатів однаково.
+"""
+
+import numpy as np
+import pytest
+from ga_load_features import evaluate_load_features_fold, evaluate_load_features_batch
+from ga_model_params import evaluate_params_fold, evaluate_params_batch
+
+def _ranking(scores):
+    return np.argsort([s[0] for s in scores], kind="stable").tolist()
+
+@pytest.mark.parametrize("fold", range(3))
+def test_feature_masks_rank_like_sklearn(series, fold):
+    X, y, cols = series
+    masks = np.random.default_rng(fold).integers(0, 2, size=(8, len(cols))).astype(np.int8)
+    masks[0] = 0                               # Порожня маска — без навчання в обох тренерах
+    reference = [evaluate_load_features_fold(X, y, m, fold, n_splits=3, max_iter=30) for m in masks]
+    batched = evaluate_load_features_batch(X, y, [(m,) for m in masks], fold, n_splits=3, max_iter=30)
+    assert [s is None for s in batched] == [s is None for s in reference]
+    reference, batched = [s for s in reference if s is not None], [s for s in batched if s is not None]
+    assert _ranking(batched) == _ranking(reference)
+    np.testing.assert_allclose(batched, [s[:2] for s in reference], rtol=1e-5)
+
+@pytest.mark.parametrize("fidelity", [1.0, 0.5])
+def test_params_rank_like_sklearn(series, fidelity):
+    X, y, _ = series
+    genotypes = [(16, 0.01, 0.001), (32, 0.001, 0.0001), (64, 0.05, 0.01), (128, 0.01, 0.0001), (32, 0.05, 0.001)]
+    reference = [evaluate_params_fold(X, y, *g, 1, n_splits=3, max_iter=30, fidelity=fidelity) for g in genotypes]
+    batched = evaluate_params_batch(X, y, genotypes, 1, n_splits=3, max_iter=30, fidelity=fidelity)
+    assert _ranking(batched) == _ranking(reference)
+    np.testing.assert_allclose(batched, [s[:2] for s in reference], rtol=1e-5)
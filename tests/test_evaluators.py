@@ -0,0 +1,50 @@
+"""Паралельні бекенди оцінювання (process, loky) дають побітово ті самі оцінки, що й послідовний."""
+
+import numpy as np
+import pytest
+from evaluators import evaluate_population, make_evaluator
+from ga_load_features import (evaluate_load_features_fold, evaluate_load_features_batch,
+                              aggregate_load_features, ga_load_feature_selection)
+from ga_model_params import evaluate_params_fold, aggregate_params
+
+def _masks(n_features):
+    rng = np.random.default_rng(0)
+    return [(m,) for m in rng.integers(0, 2, size=(6, n_features)).astype(np.int8)]
+
+@pytest.fixture(scope="module", params=["process", "loky"])
+def pool(request):
+    evaluator = make_evaluator(request.param, n_jobs=2)
+    yield evaluator
+    evaluator.close()
+
+@pytest.mark.parametrize("granularity", ["fold", "individual"])
+def test_features_match_serial(pool, series, granularity):
+    X, y, cols = series
+    kw = dict(n_splits=3, max_iter=15, granularity=granularity, return_budget=True)
+    serial = evaluate_population(evaluate_load_features_fold, aggregate_load_features, X, y, _masks(len(cols)), **kw)
+    parallel = evaluate_population(evaluate_load_features_fold, aggregate_load_features, X, y, _masks(len(cols)),
+                                   evaluator=pool, **kw)
+    assert parallel == serial
+
+def test_batched_and_racing_match_serial(pool, series):
+    X, y, cols = series
+    kw = dict(n_splits=3, max_iter=15, racing=True, return_budget=True, batch_fn=evaluate_load_features_batch)
+    serial = evaluate_population(evaluate_load_features_fold, aggregate_load_features, X, y, _masks(len(cols)), **kw)
+    parallel = evaluate_population(evaluate_load_features_fold, aggregate_load_features, X, y, _masks(len(cols)),
+                                   evaluator=pool, **kw)
+    assert parallel == serial
+
+def test_params_match_serial(pool, series):
+    X, y, _ = series
+    genotypes = [(16, 0.01, 0.001), (32, 0.001, 0.0001), (64, 0.05, 0.01), (16, 0.01, 0.001)] # З дублікатом
+    serial = evaluate_population(evaluate_params_fold, aggregate_params, X, y, genotypes, n_splits=2, max_iter=15)
+    assert evaluate_population(evaluate_params_fold, aggregate_params, X, y, genotypes, n_splits=2, max_iter=15,
+                               evaluator=pool) == serial
+
+def test_ga_run_matches_serial(pool, series):
+    X, y, cols = series
+    kw = dict(pop_size=4, n_gen=2, max_iter=10, cv_splits=2, seed=5)
+    serial = ga_load_feature_selection(X, y, cols, **kw)
+    parallel = ga_load_feature_selection(X, y, cols, evaluator=pool, **kw)
+    assert parallel["mae"] == serial["mae"] and parallel["rmse"] == serial["rmse"]
+    assert parallel["features"] == serial["features"] and parallel["budget"] == serial["budget"]
@@ -0,0 +1,40 @@
+"""FeatureEngine.update — інкрементні ознаки дорівнюють ознакам усього ряду (transform)."""
+
+import numpy as np
+import pytest
+from feature_engine import FeatureEngine
+
+@pytest.fixture
+def hourly():
+    """Погодинний ряд: температура, година доби і ціль з добовим циклом."""
+    rs = np.random.RandomState(1)
+    hour = np.arange(500) % 24
+    X = np.column_stack([rs.rand(500) * 30, hour]).astype(np.float32)
+    y = 100 + 20 * np.sin(hour * 2 * np.pi / 24) + rs.rand(500)
+    return X, y
+
+def _engine():
+    return FeatureEngine(["temp", "hour"], "load", lags=(1, 2, 24), windows=(3, 24, 48), cyclic=("hour",))
+
+@pytest.mark.parametrize("chunks", [[500], [60, 1, 139, 300], [48, 1, 1, 24, 426]])
+def test_update_matches_transform(hourly, chunks):
+    X, y = hourly
+    X_ref, y_ref = _engine().transform(X, y)
+    engine, parts, start = _engine(), [], 0
+    for i, n in enumerate(chunks):
+        step = engine.transform if i == 0 else engine.update
+        parts.append(step(X[start:start + n], y[start:start + n]))
+        start += n
+    X_inc = np.vstack([p[0] for p in parts])
+    y_inc = np.concatenate([p[1] for p in parts])
+    assert X_inc.shape == X_ref.shape == (500 - engine.history, len(engine.columns))
+    np.testing.assert_array_equal(y_inc, y_ref)
+    np.testing.assert_allclose(X_inc, X_ref, rtol=1e-5, atol=1e-4)
+
+def test_prime_then_update(hourly):
+    X, y = hourly
+    X_ref, _ = _engine().transform(X, y)
+    engine = _engine().prime(y[:200])
+    X_new, y_new = engine.update(X[200:], y[200:])
+    np.testing.assert_array_equal(y_new, y[200:].astype(np.float32))
+    np.testing.assert_allclose(X_new, X_ref[200 - engine.history:], rtol=1e-5, atol=1e-4)
@@ -0,0 +1,23 @@
+"""fold_plan — ті самі індекси train/val, що й sklearn TimeSeriesSplit."""
+
+import numpy as np
+import pytest
+from sklearn.model_selection import TimeSeriesSplit
+from folds import fold_plan
+
+@pytest.mark.parametrize("n_samples", [4, 10, 97, 240, 1001])
+@pytest.mark.parametrize("n_splits", [2, 3, 5])
+def test_fold_plan_matches_time_series_split(n_samples, n_splits):
+    if n_splits + 1 > n_samples:
+        pytest.skip("замало рядків")
+    idx = np.arange(n_samples)
+    plan = fold_plan(n_samples, n_splits)
+    expected = list(TimeSeriesSplit(n_splits=n_splits).split(idx))
+    assert len(plan) == len(expected)
+    for (tr, val), (tr_ref, val_ref) in zip(plan, expected):
+        np.testing.assert_array_equal(idx[tr], tr_ref)
+        np.testing.assert_array_equal(idx[val], val_ref)
+
+def test_fold_plan_rejects_too_few_rows():
+    with pytest.raises(ValueError):
+        fold_plan(3, 3)
@@ -0,0 +1,91 @@
+"""
+Оператори GA над упакованою бітовою матрицею масок — проти еталонів на списках бітів.
+Еталон бере ті самі випадкові числа (генератор з тим самим seed) і застосовує їх побітово.
+"""
+
+import numpy as np
+import pytest
+from ga_load_features import (pack_masks, unpack_masks, mask_hashes, breed_masks,
+                              _tournament, _crossover, _flip_bits)
+
+N_FEATURES = (1, 7, 8, 13, 64, 70)             # Межі байтів і слів хешу
+
+def _masks(rng, n, n_features):
+    return rng.integers(0, 2, size=(n, n_features)).tolist()
+
+@pytest.mark.parametrize("n_features", N_FEATURES)
+def test_pack_unpack_roundtrip(n_features):
+    masks = _masks(np.random.default_rng(0), 9, n_features)
+    packed = pack_masks(masks)
+    assert packed.shape == (9, -(-n_features // 8))
+    assert unpack_masks(packed, n_features).tolist() == masks
+
+@pytest.mark.parametrize("n_features", N_FEATURES)
+def test_mask_hashes_follow_row_equality(n_features):
+    masks = _masks(np.random.default_rng(1), 40, n_features)
+    masks += masks[:5]                         # Гарантовані повтори
+    hashes = mask_hashes(pack_masks(masks)).tolist()
+    for i, a in enumerate(masks):
+        for j, b in enumerate(masks):
+            assert (hashes[i] == hashes[j]) == (a == b)
+
+@pytest.mark.parametrize("size", [1, 2, 4])
+def test_tournament_matches_loop(size):
+    maes = np.random.default_rng(2).integers(0, 5, size=10).astype(float) # Рівні MAE — перемагає перший
+    win = _tournament(maes, 30, size, np.random.default_rng(3))
+    idx = np.random.default_rng(3).integers(len(maes), size=(size, 30)).tolist()
+    expected = []
+    for k in range(30):
+        best = idx[0][k]
+        for rival in (row[k] for row in idx[1:]):
+            if maes[rival] < maes[best]:
+                best = rival
+        expected.append(best)
+    assert win.tolist() == expected
+
+@pytest.mark.parametrize("n_features", N_FEATURES)
+@pytest.mark.parametrize("points", [1, 2, 3])
+def test_point_crossover_matches_list(n_features, points):
+    rng = np.random.default_rng(4)
+    p1, p2 = _masks(rng, 12, n_features), _masks(rng, 12, n_features)
+    child = _crossover(pack_masks(p1), pack_masks(p2), n_features, "point", points, np.random.default_rng(5))
+    cuts = np.random.default_rng(5).integers(1, max(n_features, 2), size=(points, 12)).T.tolist()
+    # Біт j — від p1, якщо парність кількості розрізів після j збігається з парністю points
+    expected = [[a[j] if sum(c > j for c in cuts[i]) % 2 == points % 2 else b[j] for j in range(n_features)]
+                for i, (a, b) in enumerate(zip(p1, p2))]
+    assert unpack_masks(child, n_features).tolist() == expected
+
+@pytest.mark.parametrize("n_features", N_FEATURES)
+def test_uniform_crossover_matches_list(n_features):
+    rng = np.random.default_rng(6)
+    p1, p2 = _masks(rng, 12, n_features), _masks(rng, 12, n_features)
+    n_bytes = -(-n_features // 8)
+    child = _crossover(pack_masks(p1), pack_masks(p2), n_features, "uniform", 1, np.random.default_rng(7))
+    take = np.unpackbits(np.random.default_rng(7).integers(0, 256, size=(12, n_bytes), dtype=np.uint8),
+                         axis=1)[:, :n_features].tolist()
+    expected = [[a[j] if t[j] else b[j] for j in range(n_features)] for a, b, t in zip(p1, p2, take)]
+    assert unpack_masks(child, n_features).tolist() == expected
+
+@pytest.mark.parametrize("n_features", N_FEATURES)
+@pytest.mark.parametrize("rate", [0.0, 0.1, 0.5])
+def test_flip_bits_matches_list(n_features, rate):
+    flips = unpack_masks(_flip_bits(np.random.default_rng(8), 11, n_features, rate), n_features).tolist()
+    raw = np.random.default_rng(8).bit_generator.random_raw(-(-11 * n_features // 4))
+    words = [(int(r) >> (16 * k)) & 0xFFFF for r in raw for k in range(4)] # 16-бітні частини, молодші — першими
+    expected = [[int(words[i * n_features + j] < round(rate * 65536)) for j in range(n_features)]
+                for i in range(11)]
+    assert flips == expected
+
+def test_flip_bits_rate():
+    flips = unpack_masks(_flip_bits(np.random.default_rng(9), 200, 50, 0.2), 50)
+    assert abs(flips.mean() - 0.2) < 0.01
+
+def test_breed_masks_prefers_new_unique_children():
+    rng = np.random.default_rng(10)
+    pop = pack_masks(_masks(rng, 8, 40))
+    maes = rng.random(8)
+    children, i1, i2 = breed_masks(pop, maes, 7, 40, np.random.default_rng(11), 0.05)
+    rows = [tuple(r) for r in unpack_masks(children, 40).tolist()]
+    assert len(rows) == len(set(rows)) == 7
+    assert not set(rows) & {tuple(r) for r in unpack_masks(pop, 40).tolist()}
+    assert len(i1) == len(i2) == 7 and max(i1.max(), i2.max()) < 8
@@ -0,0 +1,30 @@
+"""non_dominated_sort — ті самі ранги, що й пряме O(n²) знімання фронтів."""
+
+import numpy as np
+import pytest
+from pareto import non_dominated_sort
+
+def _dominates(a, b):
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+def _brute_force_ranks(F):
+    """Еталон: фронт — рішення, над якими не домінує жодне з ще не розподілених."""
+    F = [tuple(row) for row in F]
+    ranks, left, rank = [-1] * len(F), set(range(len(F))), 0
+    while left:
+        front = {i for i in left if not any(_dominates(F[j], F[i]) for j in left if j != i)}
+        for i in front:
+            ranks[i] = rank
+        left -= front
+        rank += 1
+    return ranks
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, m", [(1, 2), (12, 2), (40, 3), (60, 4)])
+def test_non_dominated_sort_matches_brute_force(seed, n, m):
+    rng = np.random.default_rng(seed)
+    F = rng.integers(0, 6, size=(n, m)).astype(float) # Малий діапазон — багато рівних і дублікатів
+    assert non_dominated_sort(F).tolist() == _brute_force_ranks(F)
+
+def test_non_dominated_sort_empty():
+    assert non_dominated_sort(np.empty((0, 2))).tolist() == []
@@ -0,0 +1,53 @@
+"""
+Контрольні точки: запуск, перерваний після покоління і продовжений з точки,
+дає той самий результат, що й безперервний (випадковість — потоки від seed і номера покоління).
+"""
+
+import os, pickle
+import numpy as np
+import pytest
+from static.mode_config import MODE_CONFIG
+from run_control import CancelToken, CheckpointMismatch
+
+GA = dict(pop_size=4, n_gen=3, max_iter=10, cv_splits=2)
+TIMING = ("fit_time", "latency_ms")            # Залежать від навантаження машини
+
+def _run(mode, series, **kwargs):
+    X, y, cols = series
+    func = MODE_CONFIG[mode]["func"]
+    kwargs = {**GA, **kwargs}
+    return func(X, y, cols, **kwargs) if mode == "features" else func(X, y, **kwargs)
+
+def _interrupt(mode, series, path):
+    """Запуск, скасований під час оцінювання другого покоління (точка — після першого)."""
+    token = CancelToken()
+
+    def stop_after_first(gen, *_):
+        if gen == 0:
+            token.cancel()
+
+    _run(mode, series, checkpoint=path, cancel=token, progress_cb=stop_after_first)
+    with open(path, "rb") as f:
+        assert pickle.load(f)["state"]["gen"] == 1
+
+def _plain(result):
+    """Результат без вимірів часу, масиви — списками (для порівняння ==)."""
+    if isinstance(result, list):
+        return [_plain(r) for r in result]
+    return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in result.items() if k not in TIMING}
+
+@pytest.mark.parametrize("mode", list(MODE_CONFIG))
+def test_resume_equals_uninterrupted(mode, series, tmp_path):
+    path = str(tmp_path / f"{mode}.pkl")
+    _interrupt(mode, series, path)
+    resumed = _run(mode, series, checkpoint=path, resume=True)
+    assert not os.path.exists(path)            # Завершений запуск прибирає свою точку
+    assert _plain(resumed) == _plain(_run(mode, series))
+
+@pytest.mark.parametrize("mode", list(MODE_CONFIG))
+def test_resume_rejects_other_run(mode, series, tmp_path):
+    path = str(tmp_path / f"{mode}.pkl")
+    _interrupt(mode, series, path)
+    with pytest.raises(CheckpointMismatch):
+        _run(mode, series, checkpoint=path, resume=True, n_gen=4)
+    assert os.path.exists(path)